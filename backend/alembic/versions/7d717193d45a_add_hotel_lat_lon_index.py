@@ -0,0 +1,27 @@
+"""Add latitude/longitude index to hotels
+
+Revision ID: 7d717193d45a
+Revises: 8c3078fcdd2d
+Create Date: 2026-10-18 19:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d717193d45a'
+down_revision: Union[str, None] = '8c3078fcdd2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_hotels_lat_lon', 'hotels', ['latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hotels_lat_lon', table_name='hotels')
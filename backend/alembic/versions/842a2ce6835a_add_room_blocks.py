@@ -0,0 +1,108 @@
+"""Add room_blocks for interval-based availability
+
+Revision ID: 842a2ce6835a
+Revises: 7d717193d45a
+Create Date: 2026-10-18 20:30:00.000000
+
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '842a2ce6835a'
+down_revision: Union[str, None] = '7d717193d45a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INSERT_BATCH = 5000
+
+room_availability = sa.table(
+    'room_availability',
+    sa.column('room_id', sa.Integer),
+    sa.column('date', sa.Date),
+    sa.column('is_available', sa.Boolean),
+)
+
+bookings = sa.table(
+    'bookings',
+    sa.column('id', sa.Integer),
+    sa.column('room_id', sa.Integer),
+    sa.column('check_in_date', sa.Date),
+    sa.column('check_out_date', sa.Date),
+    sa.column('status', sa.String),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    room_blocks = op.create_table('room_blocks',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=True),
+    sa.CheckConstraint('start_date < end_date', name='ck_room_blocks_range'),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_room_blocks_id'), 'room_blocks', ['id'], unique=False)
+    op.create_index('ix_room_blocks_room_start_end', 'room_blocks', ['room_id', 'start_date', 'end_date'], unique=False)
+
+    # Convert blocked day rows: each run of consecutive nights of a room and booking becomes
+    # one block, so cancelling a booking later frees its own nights and not its neighbours'
+    nights = op.get_bind().execute(
+        sa.select(room_availability.c.room_id, room_availability.c.date, bookings.c.id)
+        .select_from(room_availability.outerjoin(bookings, sa.and_(
+            bookings.c.room_id == room_availability.c.room_id,
+            bookings.c.check_in_date <= room_availability.c.date,
+            bookings.c.check_out_date > room_availability.c.date,
+            bookings.c.status != 'cancelled',
+        )))
+        .where(room_availability.c.is_available == sa.false())
+        .order_by(room_availability.c.room_id, room_availability.c.date, bookings.c.id)
+    )
+    blocks = []
+    for room_id, day, booking_id in nights:
+        last = blocks[-1] if blocks else None
+        if last and last['room_id'] == room_id and last['end_date'] > day:
+            continue  # Night already covered (overlapping bookings): keep the first
+        if last and last['room_id'] == room_id and last['end_date'] == day and last['booking_id'] == booking_id:
+            last['end_date'] = day + timedelta(days=1)
+        else:
+            blocks.append({'room_id': room_id, 'start_date': day, 'end_date': day + timedelta(days=1), 'booking_id': booking_id})
+    for i in range(0, len(blocks), INSERT_BATCH):
+        op.bulk_insert(room_blocks, blocks[i:i + INSERT_BATCH])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Write back nights that only exist as blocks (bookings made in interval storage)
+    bind = op.get_bind()
+    room_blocks = sa.table(
+        'room_blocks',
+        sa.column('room_id', sa.Integer),
+        sa.column('start_date', sa.Date),
+        sa.column('end_date', sa.Date),
+    )
+    existing = set(bind.execute(
+        sa.select(room_availability.c.room_id, room_availability.c.date)
+        .where(room_availability.c.is_available == sa.false())
+    ).all())
+    nights = []
+    for room_id, start_date, end_date in bind.execute(sa.select(room_blocks)):
+        day = start_date
+        while day < end_date:
+            if (room_id, day) not in existing:
+                nights.append({'room_id': room_id, 'date': day, 'is_available': False})
+            day += timedelta(days=1)
+    for i in range(0, len(nights), INSERT_BATCH):
+        op.bulk_insert(room_availability, nights[i:i + INSERT_BATCH])
+
+    op.drop_index('ix_room_blocks_room_start_end', table_name='room_blocks')
+    op.drop_index(op.f('ix_room_blocks_id'), table_name='room_blocks')
+    op.drop_table('room_blocks')
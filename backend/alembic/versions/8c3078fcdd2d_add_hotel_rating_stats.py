@@ -0,0 +1,51 @@
+"""Add hotel_rating_stats table
+
+Revision ID: 8c3078fcdd2d
+Revises: a1dd1841f516
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3078fcdd2d'
+down_revision: Union[str, None] = 'a1dd1841f516'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('hotel_rating_stats',
+    sa.Column('hotel_id', sa.Integer(), nullable=False),
+    sa.Column('review_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_1_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_2_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_3_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_4_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_5_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('hotel_id')
+    )
+
+    # Backfill from existing reviews (scripts/backfill_rating_stats.py does the same on demand)
+    histogram = ", ".join(f"SUM(CASE WHEN r.rating = {value} THEN 1 ELSE 0 END)" for value in range(1, 6))
+    op.execute(
+        "INSERT INTO hotel_rating_stats (hotel_id, review_count, rating_sum, "
+        "rating_1_count, rating_2_count, rating_3_count, rating_4_count, rating_5_count) "
+        f"SELECT rm.hotel_id, COUNT(r.id), SUM(r.rating), {histogram} "
+        "FROM reviews r "
+        "JOIN bookings b ON r.booking_id = b.id "
+        "JOIN rooms rm ON b.room_id = rm.id "
+        "GROUP BY rm.hotel_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('hotel_rating_stats')
@@ -0,0 +1,49 @@
+"""Add packed amenity mask to rooms
+
+Revision ID: a1dd1841f516
+Revises: c90ea6244162
+Create Date: 2026-10-18 18:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1dd1841f516'
+down_revision: Union[str, None] = 'c90ea6244162'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.models.room.AMENITY_BITS
+AMENITY_BITS = {
+    "has_wifi": 1 << 0,
+    "allows_pets": 1 << 1,
+    "has_air_conditioning": 1 << 2,
+    "has_tv": 1 << 3,
+    "has_minibar": 1 << 4,
+    "has_balcony": 1 << 5,
+    "has_kitchen": 1 << 6,
+    "has_safe": 1 << 7,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rooms', sa.Column('amenity_mask', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing boolean columns
+    mask_expr = " + ".join(
+        f"(CASE WHEN {column} THEN {bit} ELSE 0 END)" for column, bit in AMENITY_BITS.items()
+    )
+    op.execute(f"UPDATE rooms SET amenity_mask = {mask_expr}")
+
+    op.create_index('ix_rooms_hotel_capacity_amenity', 'rooms', ['hotel_id', 'capacity', 'amenity_mask'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rooms_hotel_capacity_amenity', table_name='rooms')
+    op.drop_column('rooms', 'amenity_mask')
@@ -0,0 +1,57 @@
+"""Unique room_availability row per room and night
+
+Revision ID: b5e1f0c3d2a7
+Revises: 842a2ce6835a
+Create Date: 2026-10-18 22:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1f0c3d2a7'
+down_revision: Union[str, None] = '842a2ce6835a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DELETE_BATCH = 5000
+
+room_availability = sa.table(
+    'room_availability',
+    sa.column('id', sa.Integer),
+    sa.column('room_id', sa.Integer),
+    sa.column('date', sa.Date),
+    sa.column('is_available', sa.Boolean),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drop duplicate nights left by the old SELECT-then-insert race, keeping the blocked row
+    # (or the oldest one if none is blocked)
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(room_availability.c.id, room_availability.c.room_id, room_availability.c.date)
+        .order_by(
+            room_availability.c.room_id, room_availability.c.date,
+            room_availability.c.is_available, room_availability.c.id,
+        )
+    )
+    duplicates = []
+    last_key = None
+    for row_id, room_id, day in rows:
+        if (room_id, day) == last_key:
+            duplicates.append(row_id)
+        last_key = (room_id, day)
+    for i in range(0, len(duplicates), DELETE_BATCH):
+        bind.execute(room_availability.delete().where(room_availability.c.id.in_(duplicates[i:i + DELETE_BATCH])))
+
+    op.create_unique_constraint('uq_room_availability_room_date', 'room_availability', ['room_id', 'date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_room_availability_room_date', 'room_availability', type_='unique')
@@ -0,0 +1,31 @@
+"""Add hold_expires_at to bookings
+
+Revision ID: e4c7a9b2f153
+Revises: b5e1f0c3d2a7
+Create Date: 2026-10-18 23:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c7a9b2f153'
+down_revision: Union[str, None] = 'b5e1f0c3d2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing pending bookings keep NULL: they are not holds and are left to the daily cleanup
+    op.add_column('bookings', sa.Column('hold_expires_at', sa.DateTime(), nullable=True))
+    op.create_index(op.f('ix_bookings_hold_expires_at'), 'bookings', ['hold_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bookings_hold_expires_at'), table_name='bookings')
+    op.drop_column('bookings', 'hold_expires_at')
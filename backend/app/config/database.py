@@ -1,10 +1,35 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+from typing import Callable
+from contextlib import contextmanager
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from app.config.settings import settings
+from app.services.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, pool_metrics
+
+SQL_ECHO_LEVELS = {"off": False, "statements": True, "debug": "debug"}
+
+def engine_options(pool_name: str) -> dict:
+    """
+    Pool and logging options shared by the sync and async engines, from Settings.
+    """
+    return {
+        "echo": SQL_ECHO_LEVELS[settings.SQL_ECHO],
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": pool_name,
+    }
 
 # Create DB Engine
-engine = create_engine(settings.DATABASE_URL, echo=True)  # echo=True for debugging SQL queries
+engine = create_engine(settings.DATABASE_URL, poolclass=InstrumentedQueuePool, **engine_options("primary"))
+pool_metrics.attach(engine)
 
 # Create a session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
@@ -19,3 +44,171 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async drivers for the sync DATABASE_URL drivers
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """
+    Same database as `url`, through its asyncio driver (mysql+pymysql://... -> mysql+aiomysql://...).
+    """
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)).render_as_string(hide_password=False)
+
+# Async engine and session factory, for the read-heavy routers
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL),
+    poolclass=InstrumentedAsyncQueuePool,
+    **engine_options("async")
+)
+pool_metrics.attach(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# Dependency to get an async database session
+# Nothing may be lazy-loaded from it: load every relationship the response needs up front
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Session.info flag set while a unit_of_work() block is open
+UNIT_OF_WORK_KEY = "unit_of_work"
+
+@contextmanager
+def unit_of_work(db: Session):
+    """
+    Run several CRUD calls as one transaction: inside the block they only flush (see commit()),
+    and the block commits once on exit or rolls back if it raises.
+    A nested block joins the outermost one.
+    """
+    if db.info.get(UNIT_OF_WORK_KEY):
+        yield db
+        return
+
+    db.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
+
+def commit(db: Session) -> None:
+    """
+    What CRUD functions call instead of db.commit(): commits, or only flushes inside a unit_of_work().
+    """
+    if db.info.get(UNIT_OF_WORK_KEY):
+        db.flush()
+    else:
+        db.commit()
+
+def rollback(db: Session) -> None:
+    """
+    What CRUD functions call instead of db.rollback() when they give up: rolls back, or inside
+    a unit_of_work() does nothing, so the caller's earlier work and after_commit() callbacks
+    survive. The CRUD function then returns None/False and the caller raises to roll the unit back.
+    """
+    if not db.info.get(UNIT_OF_WORK_KEY):
+        db.rollback()
+
+# Callbacks queued by after_commit(), run once the session's transaction commits
+AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """
+    Run `callback` once the session's transaction commits, and drop it if it rolls back.
+    For cache invalidation: inside a unit_of_work() commit() only flushes, and invalidating
+    then would let a concurrent read refill the cache with data that is not committed yet.
+    """
+    db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT_KEY, None)
+
+def is_deadlock(exc: DBAPIError) -> bool:
+    """
+    True if the database aborted the transaction to break a deadlock (MySQL 1213, PostgreSQL 40P01).
+    """
+    orig = getattr(exc, "orig", None)
+    return getattr(orig, "pgcode", None) == "40P01" or (bool(getattr(orig, "args", ())) and orig.args[0] == 1213)
+
+# Read replicas: the GET side of the catalog, search, review and location routers
+# reads from them, round-robin; everything else stays on the primary.
+REPLICA_URLS = [url.strip() for url in settings.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+replica_engines = [
+    create_engine(url, poolclass=InstrumentedQueuePool, **engine_options(f"replica-{i}"))
+    for i, url in enumerate(REPLICA_URLS)
+]
+async_replica_engines = [
+    create_async_engine(async_database_url(url), poolclass=InstrumentedAsyncQueuePool, **engine_options(f"async-replica-{i}"))
+    for i, url in enumerate(REPLICA_URLS)
+]
+for replica_engine in replica_engines + [e.sync_engine for e in async_replica_engines]:
+    pool_metrics.attach(replica_engine)
+
+ReplicaSessions = [
+    sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=replica_engine)
+    for replica_engine in replica_engines
+]
+AsyncReplicaSessions = [
+    async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+    for replica_engine in async_replica_engines
+]
+_next_replica = itertools.count()
+
+# Read-your-writes: set on the response of every successful write (see app.main);
+# a client can also send the header to read from the primary
+READ_PRIMARY_COOKIE = "read_primary"
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+def reads_from_primary(request: Request) -> bool:
+    return (
+        not REPLICA_URLS
+        or request.cookies.get(READ_PRIMARY_COOKIE) == "1"
+        or request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true")
+    )
+
+def is_replica_session(db: Session) -> bool:
+    """
+    True if `db` reads from a replica, which may not have the latest commits yet.
+    """
+    return db.get_bind() in replica_engines
+
+def read_session_factory(request: Request) -> sessionmaker:
+    """
+    Session factory for a read-only request: the next replica, or the primary for a client that just wrote.
+    """
+    request.state.read_only = True  # Not a write, even if it is a POST (see app.main)
+    if reads_from_primary(request):
+        return SessionLocal
+    return ReplicaSessions[next(_next_replica) % len(ReplicaSessions)]
+
+def async_read_session_factory(request: Request) -> async_sessionmaker:
+    request.state.read_only = True
+    if reads_from_primary(request):
+        return AsyncSessionLocal
+    return AsyncReplicaSessions[next(_next_replica) % len(AsyncReplicaSessions)]
+
+# Dependency to get a read-only session (see read_session_factory)
+def get_read_db(request: Request):
+    db = read_session_factory(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Async variant of get_read_db
+async def get_async_read_db(request: Request):
+    async with async_read_session_factory(request)() as db:
+        yield db
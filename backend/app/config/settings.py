@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings  # Updated import for Pydantic 2.x
-from typing import Optional
+from typing import Literal, Optional
 
 class Settings(BaseSettings):
     # Database config
@@ -9,6 +9,32 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # defaults to DATABASE_URL through its asyncio driver (aiomysql, aiosqlite)
+
+    # Connection pool (per engine: sync and async each get their own)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20  # extra connections opened above DB_POOL_SIZE under load
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 1800  # seconds; reconnect before MySQL's wait_timeout drops the connection
+    DB_POOL_PRE_PING: bool = True  # test each connection on checkout and replace dead ones
+    SQL_ECHO: Literal["off", "statements", "debug"] = "off"  # "statements" logs every SQL statement, "debug" also result rows
+
+    # Per-request SQL instrumentation (Server-Timing header + one log line per request)
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10  # flag a request when one statement shape runs this many times
+
+    # Slow-query log: statements above the threshold, grouped by fingerprint, with EXPLAIN for the worst
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN_TOP: int = 10  # fingerprints EXPLAINed, by total time spent
+    SLOW_QUERY_DUMP_PATH: str = ""  # if set, the log and its plans are written there on shutdown
+
+    # Read replicas
+    DATABASE_REPLICA_URLS: str = ""  # comma-separated; empty sends reads to DATABASE_URL
+    READ_YOUR_WRITES_SECONDS: int = 10  # after a write, the client's reads stay on the primary this long
+
+    # Operational /internal/* endpoints (cache, pool, job and SQL stats; cache clears; manual sweeps; EXPLAIN)
+    INTERNAL_API_TOKEN: str = ""  # empty: not mounted; otherwise every call must send it as X-Internal-Token
 
     # JWT Token config
     SECRET_KEY: str
@@ -22,6 +48,33 @@ class Settings(BaseSettings):
     SMTP_PORT: int = 587
     EMAIL_FROM_NAME: Optional[str] = "Booking App"
 
+    # Availability / search
+    AVAILABILITY_STORAGE: Literal["nights", "intervals"] = "nights"  # one room_availability row per night, or one room_blocks row per stay
+    AVAILABILITY_INDEX_ENABLED: bool = True  # keep an in-memory bitmap of blocked nights per room
+    AVAILABILITY_INDEX_REFRESH_SECONDS: float = 60.0  # reload the bitmap to pick up writes made by other processes
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    SEARCH_CACHE_TTL_SECONDS: float = 60.0
+    DESTINATION_REFRESH_SECONDS: float = 300.0  # reload country/city names changed by other processes
+    CALENDAR_CACHE_ENABLED: bool = True
+    CALENDAR_CACHE_MAX_ENTRIES: int = 2048
+    CALENDAR_CACHE_TTL_SECONDS: float = 300.0
+
+    # Booking holds
+    BOOKING_HOLD_MINUTES: int = 10  # a new booking must be paid within this time or its nights are released
+    HOLD_SWEEPER_ENABLED: bool = True
+    HOLD_SWEEP_INTERVAL_SECONDS: float = 30.0
+
+    # Booking lifecycle cleanup (complete past stays, cancel never-paid bookings)
+    BOOKING_CLEANUP_ENABLED: bool = True
+    BOOKING_CLEANUP_INTERVAL_SECONDS: float = 3600.0
+    BOOKING_CLEANUP_CHUNK_SIZE: int = 1000  # bookings per bulk UPDATE and commit
+
+    # Idempotency-Key on POST /bookings/ and /payments/
+    IDEMPOTENCY_TTL_HOURS: int = 24  # how long a stored response is replayed
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0  # how long a duplicate waits for the in-flight request before 409
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: float = 60.0  # an in-flight claim older than this is taken over (the first request died)
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -1,50 +1,58 @@
 from sqlalchemy import and_
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from datetime import date, timedelta
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional, List
 
 from app.models.booking import Booking
 from app.models.room import Room
 from app.models.user import User
-from app.models.room_availability import RoomAvailability
-from app.schemas.booking import BookingCreate, BookingStatusEnum
-from app.schemas.room_availability import RoomAvailabilityCreate
+from app.schemas.booking import BookingCreate, BookingStatusEnum, GroupBookingCreate
 from app.schemas.cancellation import CancellationCreate
-from app.crud.room_availability import create_availability_entry
-from app.crud.room_availability import is_room_available_for_range
+from app.crud.room_availability import block_room_nights, lock_rooms, release_room_nights, release_stays_nights
 from app.crud.cancellation import create_cancellation
 from app.schemas.booking import BookingStatusEnum
+from app.config.settings import settings
+from app.services.lock_metrics import lock_wait_stats
+from app.config.database import UNIT_OF_WORK_KEY, commit, is_deadlock, rollback, unit_of_work
+
+class CancellationRejected(Exception):
+    """
+    Raised inside cancel_booking() when the cancellation record cannot be created, to roll back its unit of work.
+    """
+
+def utc_now() -> datetime:
+    """
+    Current UTC time as a naive datetime, the way hold_expires_at is stored.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def hold_is_expired(booking: Booking, now: Optional[datetime] = None) -> bool:
+    return booking.hold_expires_at is not None and booking.hold_expires_at <= (now or utc_now())
 
 def create_booking(db: Session, booking_in: BookingCreate) -> Optional[Booking]:
     """
     Create a new booking if the room is available for the selected dates.
-    Adds RoomAvailability entries to block the room. Handles race conditions via row locking.
+    The booking and the blocks on its nights are written in one transaction;
+    a conflicting booking of the same nights rolls it back.
+    The booking starts as a pending hold: unless paid before hold_expires_at,
+    release_expired_holds() cancels it and frees the nights.
     """
 
     # 0. Check that date range is valid
     if booking_in.check_in_date >= booking_in.check_out_date:
         return None
 
-    # 1. Validate user and room exist
+    # 1. Validate user and room exist; the room row stays locked until commit,
+    # before the booking INSERT takes a shared lock on it through its foreign key
     if not db.query(User).filter(User.id == booking_in.user_id).first():
         return None
-    room = db.query(Room).filter(Room.id == booking_in.room_id).first()
-    if not room:
-        return None
-
-    # 2. Lock potential availability conflicts before checking
-    db.query(RoomAvailability).filter(
-        RoomAvailability.room_id == booking_in.room_id,
-        RoomAvailability.date >= booking_in.check_in_date,
-        RoomAvailability.date < booking_in.check_out_date
-    ).with_for_update().all()
-
-    # 3. Check room availability for range (assumes unavailable entries mean blocked)
-    if not is_room_available_for_range(db, booking_in.room_id, booking_in.check_in_date, booking_in.check_out_date):
-        return None
+    with lock_wait_stats.measure("room_nights"):
+        if not lock_rooms(db, [booking_in.room_id]):
+            rollback(db)
+            return None
 
-    # 4. Create booking object
+    # 2. Create booking object
     booking = Booking(
         user_id=booking_in.user_id,
         room_id=booking_in.room_id,
@@ -52,36 +60,89 @@ def create_booking(db: Session, booking_in: BookingCreate) -> Optional[Booking]:
         check_in_date=booking_in.check_in_date,
         check_out_date=booking_in.check_out_date,
         status="pending",
-        additional_info=booking_in.additional_info.strip() if booking_in.additional_info else None
+        additional_info=booking_in.additional_info.strip() if booking_in.additional_info else None,
+        hold_expires_at=utc_now() + timedelta(minutes=settings.BOOKING_HOLD_MINUTES)
     )
 
     db.add(booking)
+
+    # 3. Block the nights (locks, availability check and writes) and commit once
     try:
-        db.commit()
+        db.flush()
+        if not block_room_nights(db, booking.room_id, booking.check_in_date, booking.check_out_date, booking_id=booking.id, rooms_locked=True):
+            rollback(db)
+            return None
+        commit(db)
         db.refresh(booking)
     except IntegrityError:
-        db.rollback()
+        rollback(db)
+        return None  # Race condition fallback: the nights were taken concurrently
+    except OperationalError as exc:
+        if not is_deadlock(exc):
+            raise
+        rollback(db)
+        return None  # Deadlock with a writer that does not lock the room first
+
+    return booking
+
+def create_group_booking(db: Session, group_in: GroupBookingCreate) -> Optional[List[Booking]]:
+    """
+    Book several rooms for the same dates in one transaction: one booking per room.
+    Returns all the bookings, or None (and writes nothing) if any room cannot be booked.
+    """
+
+    # 0. Check that date range is valid and no room is listed twice
+    if group_in.check_in_date >= group_in.check_out_date:
+        return None
+    if len(set(group_in.room_ids)) != len(group_in.room_ids):
         return None
 
-    # 5. Add availability entries (booked days)
-    delta = (booking.check_out_date - booking.check_in_date).days
-    for i in range(delta):
-        day = booking.check_in_date + timedelta(days=i)
+    # 1. Validate user and rooms exist, locking the room rows in ascending id order
+    # Every booking locks its rooms this way before writing, so two overlapping group
+    # bookings queue on the first room they share instead of deadlocking
+    if not db.query(User).filter(User.id == group_in.user_id).first():
+        return None
+    with lock_wait_stats.measure("room_nights"):
+        room_ids = lock_rooms(db, group_in.room_ids)
+    if len(room_ids) != len(group_in.room_ids):
+        rollback(db)
+        return None
 
-        availability_entry = RoomAvailabilityCreate(
-            room_id=booking.room_id,
-            date=day,
-            is_available=False,
-            price_override=None
+    # 2. Create one booking per room, in ascending room order
+    hold_expires_at = utc_now() + timedelta(minutes=settings.BOOKING_HOLD_MINUTES)
+    bookings = [
+        Booking(
+            user_id=group_in.user_id,
+            room_id=room_id,
+            booking_date=group_in.booking_date,
+            check_in_date=group_in.check_in_date,
+            check_out_date=group_in.check_out_date,
+            status="pending",
+            additional_info=group_in.additional_info.strip() if group_in.additional_info else None,
+            hold_expires_at=hold_expires_at
         )
+        for room_id in room_ids
+    ]
+    db.add_all(bookings)
 
-        try:
-            create_availability_entry(db, availability_entry)
-        except IntegrityError:
-            db.rollback()
-            return None  # Race condition fallback
+    # 3. Block the nights of every room and commit once
+    try:
+        db.flush()
+        for booking in bookings:
+            if not block_room_nights(db, booking.room_id, booking.check_in_date, booking.check_out_date, booking_id=booking.id, rooms_locked=True):
+                rollback(db)
+                return None
+        commit(db)
+    except IntegrityError:
+        rollback(db)
+        return None  # Race condition fallback: a room was taken concurrently
+    except OperationalError as exc:
+        if not is_deadlock(exc):
+            raise
+        rollback(db)
+        return None  # Deadlock with a writer that does not lock the rooms first
 
-    return booking
+    return bookings
 
 def get_booking_by_id(db: Session, booking_id: int) -> Optional[Booking]:
     """
@@ -97,155 +158,224 @@ def get_bookings_by_user(db: Session, user_id: int) -> List[Booking]:
     return db.query(Booking).filter(Booking.user_id == user_id).order_by(Booking.check_in_date.desc()).all()
 
 def cancel_booking(db: Session, booking_id: int, refund_amount: float = 0.0) -> bool:
+    """
+    Cancel a booking: status change, cancellation record and freed nights, in one transaction.
+    Called inside a caller's unit_of_work() it only joins it and the caller owns the
+    rollback: database errors are re-raised to it instead of being turned into False.
+    """
     booking = get_booking_by_id(db, booking_id)
     if not booking or booking.status == BookingStatusEnum.cancelled or booking.status == BookingStatusEnum.completed:
         return False
 
-    # Update booking status
-    booking.status = BookingStatusEnum.cancelled
-
-    # Create cancellation record (via dedicated CRUD)
-    cancellation_data = CancellationCreate(
-        booking_id=booking.id,
-        cancellation_date=date.today(),
-        refund_amount=refund_amount
-    )
-    cancellation = create_cancellation(db, cancellation_data)
-    if not cancellation:
-        db.rollback()
-        return False
-
-    # Remove availability blocks
-    db.query(RoomAvailability).filter(
-        RoomAvailability.room_id == booking.room_id,
-        RoomAvailability.date >= booking.check_in_date,
-        RoomAvailability.date < booking.check_out_date,
-        RoomAvailability.is_available == False
-    ).delete(synchronize_session=False)
-
+    nested = bool(db.info.get(UNIT_OF_WORK_KEY))
+    previous_status = booking.status
     try:
-        db.commit()
+        with unit_of_work(db):
+            # Update booking status
+            booking.status = BookingStatusEnum.cancelled
+
+            # Create cancellation record (via dedicated CRUD)
+            cancellation_data = CancellationCreate(
+                booking_id=booking.id,
+                cancellation_date=date.today(),
+                refund_amount=refund_amount
+            )
+            if not create_cancellation(db, cancellation_data):
+                raise CancellationRejected(booking.id)
+
+            # Remove availability blocks
+            release_room_nights(db, booking.room_id, booking.check_in_date, booking.check_out_date)
         return True
-    except:
-        db.rollback()
+    except CancellationRejected:
+        # Nothing was written: undo the status change, which our own unit has already rolled back
+        booking.status = previous_status
         return False
+    except SQLAlchemyError:
+        if nested:
+            raise  # The caller's unit_of_work() rolls back
+        return False  # unit_of_work() has rolled back
 
 def mark_booking_as_confirmed(db: Session, booking_id: int) -> bool:
     """
     Update booking status to 'confirmed' after successful payment.
+    Only a pending booking whose hold has not expired can be confirmed.
     """
-    booking = get_booking_by_id(db, booking_id)
-    if not booking or booking.status != BookingStatusEnum.pending:
+    # The row lock keeps the hold sweeper away until we commit, as in create_payment()
+    with lock_wait_stats.measure("booking_payment"):
+        booking = db.query(Booking).filter(Booking.id == booking_id).populate_existing().with_for_update().first()
+    if not booking or booking.status != BookingStatusEnum.pending or hold_is_expired(booking):
         return False
 
     booking.status = BookingStatusEnum.confirmed
+    booking.hold_expires_at = None
+
+    commit(db)
+    db.refresh(booking)
+    return True
+
+def release_expired_holds(db: Session, now: Optional[datetime] = None, limit: int = 500) -> int:
+    """
+    Cancel up to `limit` pending bookings whose hold has expired and free their nights,
+    in one transaction. Rows locked by a payment in progress are skipped, not waited for.
+    Returns the number of holds released.
+    """
+    now = now or utc_now()
 
+    with lock_wait_stats.measure("hold_sweep"):
+        expired = db.query(Booking).filter(
+            Booking.status == BookingStatusEnum.pending,
+            Booking.hold_expires_at <= now
+        ).order_by(Booking.hold_expires_at.asc()).limit(limit).with_for_update(skip_locked=True).all()
+
+    for booking in expired:
+        booking.status = BookingStatusEnum.cancelled
+        booking.hold_expires_at = None
+        release_room_nights(db, booking.room_id, booking.check_in_date, booking.check_out_date)
+
+    if not expired:
+        db.rollback()
+        return 0
     try:
         db.commit()
-        db.refresh(booking)
-        return True
-    except:
+        return len(expired)
+    except IntegrityError:
         db.rollback()
-        return False
+        return 0
 
-#############################
-# MUST BE TRIGERRED 
-#How to Trigger It?
-#Run this once a day (e.g. with Celery, cronjob, or FastAPI’s BackgroundTasks).
-#It will silently clean up outdated confirmed bookings and mark them as completed.
-#############################
-def complete_and_cleanup_bookings(db: Session) -> dict:
+def complete_and_cleanup_bookings(db: Session, today: Optional[date] = None, chunk_size: int = 1000) -> dict:
     """
     - Mark confirmed bookings as completed if check-out has passed.
-    - Cancel pending bookings if check-in has passed and they were never confirmed.
-    Returns a summary dictionary.
+    - Cancel pending bookings if check-in has passed and they were never confirmed,
+      and free their nights.
+    Works through `chunk_size` bookings per bulk UPDATE and commits after each chunk;
+    rows locked by a request in progress are skipped until the next run.
+    Runs periodically through app.services.booking_cleanup. Returns a summary dictionary.
     """
-    today = date.today()
+    today = today or date.today()
     completed_count = 0
     cancelled_count = 0
 
     # 1. Complete confirmed bookings where check-out is in the past
-    confirmed_bookings = db.query(Booking).filter(
-        Booking.status == BookingStatusEnum.confirmed,
-        Booking.check_out_date < today
-    ).all()
-
-    for booking in confirmed_bookings:
-        booking.status = BookingStatusEnum.completed
-        completed_count += 1
-
-    # 2. Cancel pending bookings where check-in date is in the past
-    expired_pending = db.query(Booking).filter(
-        Booking.status == BookingStatusEnum.pending,
-        Booking.check_in_date < today
-    ).all()
-
-    for booking in expired_pending:
-        booking.status = BookingStatusEnum.cancelled
-        cancelled_count += 1
+    while True:
+        booking_ids = [booking_id for (booking_id,) in db.query(Booking.id).filter(
+            Booking.status == BookingStatusEnum.confirmed,
+            Booking.check_out_date < today
+        ).order_by(Booking.id).limit(chunk_size).with_for_update(skip_locked=True).all()]
+        if not booking_ids:
+            db.rollback()
+            break
 
-    if completed_count > 0 or cancelled_count > 0:
+        completed_count += db.query(Booking).filter(
+            Booking.id.in_(booking_ids),
+            Booking.status == BookingStatusEnum.confirmed
+        ).update({Booking.status: BookingStatusEnum.completed}, synchronize_session=False)
         db.commit()
+        if len(booking_ids) < chunk_size:
+            break
+
+    # 2. Cancel pending bookings where check-in date is in the past, freeing their nights in the same transaction
+    while True:
+        stays = db.query(Booking.id, Booking.room_id, Booking.check_in_date, Booking.check_out_date).filter(
+            Booking.status == BookingStatusEnum.pending,
+            Booking.check_in_date < today
+        ).order_by(Booking.id).limit(chunk_size).with_for_update(skip_locked=True).all()
+        if not stays:
+            db.rollback()
+            break
+
+        cancelled_count += db.query(Booking).filter(
+            Booking.id.in_([booking_id for booking_id, _, _, _ in stays]),
+            Booking.status == BookingStatusEnum.pending
+        ).update({
+            Booking.status: BookingStatusEnum.cancelled,
+            Booking.hold_expires_at: None
+        }, synchronize_session=False)
+        release_stays_nights(db, [(room_id, check_in, check_out) for _, room_id, check_in, check_out in stays])
+        db.commit()
+        if len(stays) < chunk_size:
+            break
 
     return {
         "completed_bookings": completed_count,
         "cancelled_pending_bookings": cancelled_count
     }
 
-from sqlalchemy.orm import Session
-from typing import List
-from app.models.booking import Booking
+from sqlalchemy import select
 from app.models.hotel import Hotel
 from app.models.city import City
 from app.models.country import Country
-from app.models.room import Room
 from app.models.payment import Payment
 from app.models.hotel_photo import HotelPhoto
 from app.schemas.enriched_booking import BookingUiModel
 
 
-def get_user_bookings_ui(db: Session, user_id: int) -> List[BookingUiModel]:
-    bookings = db.query(Booking).filter(Booking.user_id == user_id).all()
-    ui_models = []
-
-    for booking in bookings:
-        if not booking.room:
-            continue
-
-        room = booking.room
-        hotel = room.hotel
-        if not hotel:
-            continue
-
-        city = hotel.city
-        country = city.country if city else None
+def get_user_bookings_ui(
+    db: Session,
+    user_id: int,
+    status: Optional[BookingStatusEnum] = None,
+    skip: int = 0,
+    limit: Optional[int] = None
+) -> List[BookingUiModel]:
+    """
+    Bookings of a user with their hotel, location, cover photo and price, newest check-in first.
+    One query whatever the number of bookings: everything is joined in, the cover photo
+    comes from a correlated subquery. Bookings whose room or hotel is gone are left out.
+    """
+    cover_image_url = (
+        select(HotelPhoto.image_url)
+        .where(HotelPhoto.hotel_id == Hotel.id, HotelPhoto.is_cover == True)
+        .order_by(HotelPhoto.id)
+        .limit(1)
+        .correlate(Hotel)
+        .scalar_subquery()
+    )
 
-        cover_photo = (
-            db.query(HotelPhoto)
-            .filter(HotelPhoto.hotel_id == hotel.id, HotelPhoto.is_cover == True)
-            .first()
+    query = (
+        db.query(
+            Booking.id,
+            Booking.check_in_date,
+            Booking.check_out_date,
+            Booking.booking_date,
+            Booking.status,
+            Room.cancellation_policy,
+            Hotel.name,
+            Hotel.address,
+            Hotel.latitude,
+            Hotel.longitude,
+            City.name.label("city_name"),
+            Country.name.label("country_name"),
+            Payment.amount,
+            cover_image_url.label("cover_image_url")
         )
-
-        payment = db.query(Payment).filter(Payment.booking_id == booking.id).first()
-        total_price = f"${payment.amount:.2f}" if payment else None
-
-        ui_models.append(
-            BookingUiModel(
-                id=booking.id,
-                hotel_name=hotel.name,
-                address=hotel.address,
-                city=city.name if city else "",
-                country=country.name if country else "",
-                check_in=booking.check_in_date.isoformat(),
-                check_out=booking.check_out_date.isoformat(),
-                booking_date=booking.booking_date.isoformat(),
-                total_price=total_price,
-                status=booking.status,
-                cover_image_url=cover_photo.image_url if cover_photo else None,
-                cancellation_policy=room.cancellation_policy,
-                latitude=hotel.latitude,
-                longitude=hotel.longitude
-            )
+        .join(Room, Booking.room_id == Room.id)
+        .join(Hotel, Room.hotel_id == Hotel.id)
+        .outerjoin(City, Hotel.city_id == City.id)
+        .outerjoin(Country, City.country_id == Country.id)
+        .outerjoin(Payment, Payment.booking_id == Booking.id)
+        .filter(Booking.user_id == user_id)
+    )
+    if status is not None:
+        query = query.filter(Booking.status == status)
+    query = query.order_by(Booking.check_in_date.desc(), Booking.id.desc()).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [
+        BookingUiModel(
+            id=row.id,
+            hotel_name=row.name,
+            address=row.address,
+            city=row.city_name or "",
+            country=row.country_name or "",
+            check_in=row.check_in_date.isoformat(),
+            check_out=row.check_out_date.isoformat(),
+            booking_date=row.booking_date.isoformat(),
+            total_price=f"${row.amount:.2f}" if row.amount is not None else None,
+            status=row.status,
+            cover_image_url=row.cover_image_url,
+            cancellation_policy=row.cancellation_policy,
+            latitude=row.latitude,
+            longitude=row.longitude
         )
-
-    return ui_models
+        for row in query.all()
+    ]
@@ -4,6 +4,7 @@ from typing import Optional
 from app.models.cancellation import Cancellation
 from app.models.booking import Booking
 from app.schemas.cancellation import CancellationCreate
+from app.config.database import UNIT_OF_WORK_KEY, commit
 
 def create_cancellation(db: Session, cancellation_in: CancellationCreate) -> Optional[Cancellation]:
     """
@@ -28,10 +29,12 @@ def create_cancellation(db: Session, cancellation_in: CancellationCreate) -> Opt
 
     db.add(cancellation)
     try:
-        db.commit()
+        commit(db)
         db.refresh(cancellation)
         return cancellation
     except IntegrityError:
+        if db.info.get(UNIT_OF_WORK_KEY):
+            raise  # The caller's unit_of_work() owns the rollback
         db.rollback()
         return None
 
@@ -3,7 +3,9 @@ from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from app.models.city import City
 from app.schemas.city import CityCreate
+from app.services.destination_resolver import destination_resolver
 from sqlalchemy.orm import Session, joinedload
+from app.config.database import after_commit, commit
 
 
 def create_city(db: Session, city_in: CityCreate) -> Optional[City]:
@@ -24,7 +26,8 @@ def create_city(db: Session, city_in: CityCreate) -> Optional[City]:
     city = City(name=name_cleaned, country_id=city_in.country_id)
     db.add(city)
     try:
-        db.commit()
+        after_commit(db, destination_resolver.invalidate)
+        commit(db)
         db.refresh(city)
         return city
     except IntegrityError:
@@ -58,7 +61,8 @@ def delete_city(db: Session, city_id: int) -> bool:
 
     db.delete(city)
     try:
-        db.commit()
+        after_commit(db, destination_resolver.invalidate)
+        commit(db)
         return True
     except:
         db.rollback()
@@ -2,7 +2,9 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from app.models.country import Country
 from app.schemas.country import CountryCreate
+from app.services.destination_resolver import destination_resolver
 from typing import List, Optional
+from app.config.database import after_commit, commit
 
 
 def create_country(db: Session, country_in: CountryCreate) -> Optional[Country]:
@@ -19,7 +21,8 @@ def create_country(db: Session, country_in: CountryCreate) -> Optional[Country]:
     country = Country(name=name_cleaned)
     db.add(country)
     try:
-        db.commit()
+        after_commit(db, destination_resolver.invalidate)
+        commit(db)
         db.refresh(country)
         return country
     except IntegrityError:
@@ -59,7 +62,8 @@ def delete_country(db: Session, country_id: int) -> bool:
 
     db.delete(country)
     try:
-        db.commit()
+        after_commit(db, destination_resolver.invalidate)
+        commit(db)
         return True
     except:
         db.rollback()
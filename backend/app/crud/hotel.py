@@ -1,13 +1,17 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional  
-from sqlalchemy import func
+from sqlalchemy import or_, select
 
 from app.models.hotel import Hotel
 from app.models.city import City
 from app.models.user import User
 
 from app.schemas.hotel import HotelCreate, HotelUpdate
+from app.services.calendar_cache import calendar_cache
+from app.services.geo import bounding_box, haversine_km
+from app.config.database import after_commit, commit
 
 
 def create_hotel(db: Session, hotel_in: HotelCreate) -> Optional[Hotel]:
@@ -33,7 +37,7 @@ def create_hotel(db: Session, hotel_in: HotelCreate) -> Optional[Hotel]:
 
     db.add(hotel)
     try:
-        db.commit()
+        commit(db)
         db.refresh(hotel)
         return hotel
     except IntegrityError:
@@ -58,12 +62,36 @@ def get_hotel_by_id(db: Session, hotel_id: int) -> Optional[Hotel]:
     )
 
 
+async def get_hotel_by_id_async(db: AsyncSession, hotel_id: int) -> Optional[Hotel]:
+    """
+    get_hotel_by_id() on an async session.
+    """
+    result = await db.execute(
+        select(Hotel)
+        .options(
+            joinedload(Hotel.city),
+            joinedload(Hotel.owner),
+            selectinload(Hotel.rooms),
+            selectinload(Hotel.photos),
+        )
+        .filter(Hotel.id == hotel_id)
+    )
+    return result.scalars().first()
+
+
 def get_all_hotels(db: Session) -> List[Hotel]:
     """
     Return all hotels, ordered alphabetically.
     """
     return db.query(Hotel).order_by(Hotel.name.asc()).all()
 
+async def get_all_hotels_async(db: AsyncSession) -> List[Hotel]:
+    """
+    get_all_hotels() on an async session.
+    """
+    result = await db.execute(select(Hotel).order_by(Hotel.name.asc()))
+    return list(result.scalars().all())
+
 def get_hotels_by_owner(db: Session, owner_id: int) -> List[Hotel]:
     """
     Retrieve all hotels created by a specific user (owner).
@@ -86,7 +114,7 @@ def update_hotel(db: Session, hotel_id: int, hotel_update: HotelUpdate) -> Optio
         setattr(hotel, field, value)
 
     try:
-        db.commit()
+        commit(db)
         db.refresh(hotel)
         return hotel
     except IntegrityError:
@@ -104,7 +132,8 @@ def delete_hotel(db: Session, hotel_id: int) -> bool:
 
     db.delete(hotel)
     try:
-        db.commit()
+        after_commit(db, lambda: calendar_cache.invalidate_hotel(hotel_id))
+        commit(db)
         return True
     except:
         db.rollback()
@@ -117,8 +146,17 @@ def search_hotels(
     min_stars: Optional[int] = None,
     center_lat: Optional[float] = None,
     center_lon: Optional[float] = None,
-    radius_km: Optional[float] = None
+    radius_km: Optional[float] = None,
+    sort_by_distance: bool = False
 ) -> List[Hotel]:
+    """
+    Filter hotels by location, stars and (optionally) distance from a point.
+
+    Radius search runs in two steps: a bounding-box filter on the indexed
+    latitude/longitude columns, then an exact haversine check on the survivors.
+    Matching hotels get a `distance_km` attribute; with `sort_by_distance`
+    they are returned nearest first instead of by name.
+    """
     query = db.query(Hotel).join(Hotel.city).options(
         joinedload(Hotel.city).joinedload(City.country)
     )
@@ -132,17 +170,23 @@ def search_hotels(
     if min_stars is not None:
         query = query.filter(Hotel.stars >= min_stars)
 
-    if center_lat is not None and center_lon is not None and radius_km is not None:
-        EARTH_RADIUS_KM = 6371
-
-        distance_expr = EARTH_RADIUS_KM * func.acos(
-            func.cos(func.radians(center_lat)) *
-            func.cos(func.radians(Hotel.latitude)) *
-            func.cos(func.radians(Hotel.longitude) - func.radians(center_lon)) +
-            func.sin(func.radians(center_lat)) *
-            func.sin(func.radians(Hotel.latitude))
-        )
-
-        query = query.filter(distance_expr <= radius_km)
-
-    return query.order_by(Hotel.name.asc()).all()
+    if center_lat is None or center_lon is None or radius_km is None:
+        return query.order_by(Hotel.name.asc()).all()
+
+    # 1. Bounding-box prefilter (served by ix_hotels_lat_lon)
+    box = bounding_box(center_lat, center_lon, radius_km)
+    query = query.filter(Hotel.latitude.between(box.min_lat, box.max_lat))
+    if box.lon_ranges:
+        query = query.filter(or_(*[Hotel.longitude.between(low, high) for low, high in box.lon_ranges]))
+
+    # 2. Exact great-circle distance on the survivors
+    hotels = []
+    for hotel in query.order_by(Hotel.name.asc()).all():
+        distance = haversine_km(center_lat, center_lon, hotel.latitude, hotel.longitude)
+        if distance <= radius_km:
+            hotel.distance_km = round(distance, 3)
+            hotels.append(hotel)
+
+    if sort_by_distance:
+        hotels.sort(key=lambda hotel: hotel.distance_km)
+    return hotels
@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.models.hotel_photo import HotelPhoto
 from app.models.hotel import Hotel
 from app.schemas.hotel_photo import HotelPhotoCreate
+from app.config.database import commit
 
 
 def create_hotel_photo(db: Session, photo_in: HotelPhotoCreate) -> Optional[HotelPhoto]:
@@ -27,7 +28,7 @@ def create_hotel_photo(db: Session, photo_in: HotelPhotoCreate) -> Optional[Hote
 
     db.add(photo)
     try:
-        db.commit()
+        commit(db)
         db.refresh(photo)
         return photo
     except IntegrityError:
@@ -52,7 +53,7 @@ def delete_hotel_photo(db: Session, photo_id: int) -> bool:
 
     db.delete(photo)
     try:
-        db.commit()
+        commit(db)
         return True
     except:
         db.rollback()
@@ -69,7 +70,7 @@ def set_cover_photo(db: Session, hotel_id: int, photo_id: int) -> bool:
         photo.is_cover = (photo.id == photo_id)
 
     try:
-        db.commit()
+        commit(db)
         return True
     except:
         db.rollback()
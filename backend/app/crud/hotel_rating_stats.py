@@ -0,0 +1,80 @@
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+
+from app.models.hotel_rating_stats import HotelRatingStats, RATING_VALUES
+from app.models.review import Review
+from app.models.booking import Booking
+from app.models.room import Room
+
+
+def get_hotel_rating_stats(db: Session, hotel_id: int) -> Optional[HotelRatingStats]:
+    """
+    Return the review aggregates of a hotel, or None if it was never reviewed.
+    """
+    return db.query(HotelRatingStats).filter(HotelRatingStats.hotel_id == hotel_id).first()
+
+
+def apply_review_rating(db: Session, hotel_id: int, rating: int, delta: int) -> None:
+    """
+    Add (delta=1) or remove (delta=-1) one review of `rating` to the hotel's stats.
+    Does not commit: it must run in the transaction that creates/deletes the review.
+    """
+    values = {
+        HotelRatingStats.review_count: HotelRatingStats.review_count + delta,
+        HotelRatingStats.rating_sum: HotelRatingStats.rating_sum + delta * rating,
+    }
+    if rating in RATING_VALUES:
+        bucket = getattr(HotelRatingStats, f"rating_{rating}_count")
+        values[bucket] = bucket + delta
+
+    # Relative UPDATE, so concurrent reviews of the same hotel don't overwrite each other
+    updated = (
+        db.query(HotelRatingStats)
+        .filter(HotelRatingStats.hotel_id == hotel_id)
+        .update(values, synchronize_session=False)
+    )
+    if updated or delta < 0:
+        return
+
+    # First review of the hotel: create the row (another transaction may race us to it)
+    stats = HotelRatingStats(hotel_id=hotel_id, review_count=1, rating_sum=rating)
+    for value in RATING_VALUES:
+        setattr(stats, f"rating_{value}_count", 1 if value == rating else 0)
+    try:
+        with db.begin_nested():
+            db.add(stats)
+    except IntegrityError:
+        db.query(HotelRatingStats).filter(HotelRatingStats.hotel_id == hotel_id).update(
+            values, synchronize_session=False
+        )
+
+
+def rebuild_hotel_rating_stats(db: Session) -> int:
+    """
+    Recompute every hotel's stats from the reviews table (Review → Booking → Room).
+    Returns the number of hotels with at least one review.
+    """
+    rows = (
+        db.query(
+            Room.hotel_id,
+            func.count(Review.id),
+            func.sum(Review.rating),
+            *[func.sum(case((Review.rating == value, 1), else_=0)) for value in RATING_VALUES],
+        )
+        .join(Booking, Review.booking_id == Booking.id)
+        .join(Room, Booking.room_id == Room.id)
+        .group_by(Room.hotel_id)
+        .all()
+    )
+
+    db.query(HotelRatingStats).delete(synchronize_session=False)
+    for hotel_id, review_count, rating_sum, *histogram in rows:
+        stats = HotelRatingStats(hotel_id=hotel_id, review_count=review_count, rating_sum=int(rating_sum))
+        for value, count in zip(RATING_VALUES, histogram):
+            setattr(stats, f"rating_{value}_count", int(count))
+        db.add(stats)
+
+    db.commit()
+    return len(rows)
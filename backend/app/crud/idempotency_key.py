@@ -0,0 +1,90 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.exc import IntegrityError
+from typing import Optional
+
+from app.config.database import commit
+from app.models.idempotency_key import IdempotencyKey
+
+
+def get_idempotency_key(db: Session, user_id: int, endpoint: str, key: str) -> Optional[IdempotencyKey]:
+    return db.query(IdempotencyKey).filter(
+        IdempotencyKey.user_id == user_id,
+        IdempotencyKey.endpoint == endpoint,
+        IdempotencyKey.key == key
+    ).populate_existing().first()
+
+
+def claim_idempotency_key(db: Session, user_id: int, endpoint: str, key: str, request_hash: str, now: datetime) -> Optional[IdempotencyKey]:
+    """
+    Insert the in-flight row for a key and commit it, so concurrent duplicates see it.
+    Returns None if the key already exists.
+    """
+    record = IdempotencyKey(user_id=user_id, endpoint=endpoint, key=key, request_hash=request_hash, created_at=now)
+    db.add(record)
+    try:
+        db.commit()
+        return record
+    except IntegrityError:
+        db.rollback()
+        return None
+
+
+def take_over_idempotency_key(db: Session, record: IdempotencyKey, request_hash: str, now: datetime) -> bool:
+    """
+    Reset an expired or abandoned row to in-flight for a new request.
+    Only succeeds if nobody else took it over since `record` was read.
+    """
+    updated = db.query(IdempotencyKey).filter(
+        IdempotencyKey.id == record.id,
+        IdempotencyKey.created_at == record.created_at
+    ).update({
+        IdempotencyKey.request_hash: request_hash,
+        IdempotencyKey.status_code: None,
+        IdempotencyKey.response_body: None,
+        IdempotencyKey.created_at: now,
+    }, synchronize_session=False)
+    db.commit()
+    if updated == 1:
+        # Keep `record` in step with the row: its created_at identifies the new claim
+        for attribute, value in (("request_hash", request_hash), ("status_code", None), ("response_body", None), ("created_at", now)):
+            set_committed_value(record, attribute, value)
+    return updated == 1
+
+
+def complete_idempotency_key(db: Session, record: IdempotencyKey, status_code: int, response_body: str) -> bool:
+    """
+    Store the response of a claimed key. Commits through commit(), so inside a unit_of_work()
+    it is written in the same transaction as the request's own changes.
+    Returns False if the claim was taken over by another request since.
+    """
+    updated = db.query(IdempotencyKey).filter(
+        IdempotencyKey.id == record.id,
+        IdempotencyKey.created_at == record.created_at
+    ).update({
+        IdempotencyKey.status_code: status_code,
+        IdempotencyKey.response_body: response_body,
+    }, synchronize_session=False)
+    commit(db)
+    return updated == 1
+
+
+def release_idempotency_key(db: Session, record: IdempotencyKey) -> None:
+    """
+    Forget an in-flight key whose request failed, so a retry runs it again.
+    A claim taken over by another request since is left alone.
+    """
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.id == record.id,
+        IdempotencyKey.created_at == record.created_at
+    ).delete(synchronize_session=False)
+    db.commit()
+
+
+def purge_expired_idempotency_keys(db: Session, created_before: datetime) -> int:
+    deleted = db.query(IdempotencyKey).filter(
+        IdempotencyKey.created_at < created_before
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
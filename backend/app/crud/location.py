@@ -0,0 +1,54 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import List
+
+from app.models.city import City
+from app.models.country import Country
+
+
+def _city_statement(query: str, limit: int):
+    return select(City).options(joinedload(City.country)).filter(City.name.ilike(f"{query}%")).limit(limit)
+
+
+def _country_statement(query: str, limit: int):
+    return select(Country).filter(Country.name.ilike(f"{query}%")).limit(limit)
+
+
+def _location_results(cities: List[City], countries: List[Country]) -> List[dict]:
+    results = []
+
+    for city in cities:
+        results.append({
+            "id": city.id,
+            "name": city.name,
+            "country_name": city.country.name if city.country else None,
+            "type": "city"
+        })
+
+    for country in countries:
+        results.append({
+            "id": country.id,
+            "name": country.name,
+            "type": "country"
+        })
+
+    return results
+
+
+def search_locations(db: Session, query: str, limit: int = 5) -> List[dict]:
+    """
+    Cities then countries whose name starts with `query`, at most `limit` of each.
+    """
+    cities = db.execute(_city_statement(query, limit)).scalars().all()
+    countries = db.execute(_country_statement(query, limit)).scalars().all()
+    return _location_results(cities, countries)
+
+
+async def search_locations_async(db: AsyncSession, query: str, limit: int = 5) -> List[dict]:
+    """
+    search_locations() on an async session.
+    """
+    cities = (await db.execute(_city_statement(query, limit))).scalars().all()
+    countries = (await db.execute(_country_statement(query, limit))).scalars().all()
+    return _location_results(cities, countries)
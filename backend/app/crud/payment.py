@@ -5,23 +5,33 @@ from typing import Optional
 from app.models.payment import Payment
 from app.models.booking import Booking
 from app.schemas.payment import PaymentCreate
-from app.crud.booking import mark_booking_as_confirmed
+from app.schemas.booking import BookingStatusEnum
+from app.crud.booking import hold_is_expired
+from app.services.lock_metrics import lock_wait_stats
+from app.config.database import commit, rollback
 
 
 def create_payment(db: Session, payment_in: PaymentCreate) -> Optional[Payment]:
     """
-    Create a payment for a booking and mark the booking as confirmed.
-    Prevents duplicate payments.
+    Create a payment for a booking and mark the booking as confirmed, in one transaction.
+    Only a pending booking whose hold has not expired can be paid: duplicate payments
+    and payments for cancelled, completed or expired bookings are refused.
     """
 
-    # 1. Ensure booking exists
-    booking = db.query(Booking).filter(Booking.id == payment_in.booking_id).first()
+    # 1. Ensure booking exists; the row lock keeps the hold sweeper away until we commit
+    with lock_wait_stats.measure("booking_payment"):
+        booking = db.query(Booking).filter(Booking.id == payment_in.booking_id).populate_existing().with_for_update().first()
     if not booking:
         return None
+    # Only a live hold can be paid: once cancelled (e.g. by the hold sweeper) its nights may be resold
+    if booking.status != BookingStatusEnum.pending or hold_is_expired(booking):
+        rollback(db)
+        return None
 
     # 2. Prevent duplicate payment for this booking
     existing = db.query(Payment).filter(Payment.booking_id == payment_in.booking_id).first()
     if existing:
+        rollback(db)
         return None
 
     # 3. Create payment
@@ -31,18 +41,19 @@ def create_payment(db: Session, payment_in: PaymentCreate) -> Optional[Payment]:
         payment_method=payment_in.payment_method.value,
         amount=payment_in.amount
     )
-
     db.add(payment)
+
+    # 4. Mark booking as confirmed: the hold becomes a booking
+    booking.status = BookingStatusEnum.confirmed
+    booking.hold_expires_at = None
+
     try:
-        db.commit()
+        commit(db)
         db.refresh(payment)
     except IntegrityError:
-        db.rollback()
+        rollback(db)
         return None
 
-    # 4. Mark booking as confirmed (if pending)
-    mark_booking_as_confirmed(db, booking.id)
-
     return payment
 
 
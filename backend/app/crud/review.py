@@ -2,12 +2,16 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from sqlalchemy.orm import joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.review import Review
 from app.models.user import User
 from app.models.booking import Booking
 from app.models.room import Room
 from app.schemas.review import ReviewCreate
+from app.crud.hotel_rating_stats import apply_review_rating
+from app.config.database import commit
 
 def create_review(db: Session, review_in: ReviewCreate) -> Optional[Review]:
     """
@@ -39,7 +43,11 @@ def create_review(db: Session, review_in: ReviewCreate) -> Optional[Review]:
 
     db.add(review)
     try:
-        db.commit()
+        # Keep the hotel's rating stats in step, in the same transaction
+        hotel_id = db.query(Room.hotel_id).filter(Room.id == booking.room_id).scalar()
+        if hotel_id is not None:
+            apply_review_rating(db, hotel_id, review.rating, 1)
+        commit(db)
         db.refresh(review)
         return review
     except IntegrityError:
@@ -105,6 +113,35 @@ def get_reviews_for_hotel(
     return query.all()
 
 
+async def get_reviews_for_hotel_async(
+    db: AsyncSession,
+    hotel_id: int,
+    min_rating: Optional[int] = None,
+    only_with_text: bool = False,
+    sort_desc: bool = True
+) -> List[Review]:
+    """
+    get_reviews_for_hotel() on an async session.
+    """
+    statement = select(Review).options(
+        joinedload(Review.user),
+        joinedload(Review.booking)
+    ).join(Review.booking).join(Booking.room).filter(
+        Room.hotel_id == hotel_id
+    )
+
+    if min_rating:
+        statement = statement.filter(Review.rating >= min_rating)
+
+    if only_with_text:
+        statement = statement.filter(Review.text.isnot(None)).filter(Review.text != "")
+
+    statement = statement.order_by(Review.id.desc() if sort_desc else Review.id.asc())
+
+    result = await db.execute(statement)
+    return list(result.scalars().all())
+
+
 def delete_review(db: Session, review_id: int) -> bool:
     """
     Delete a review by its ID.
@@ -113,9 +150,20 @@ def delete_review(db: Session, review_id: int) -> bool:
     if not review:
         return False
 
+    hotel_id = None
+    if review.booking_id is not None:
+        hotel_id = (
+            db.query(Room.hotel_id)
+            .join(Booking, Booking.room_id == Room.id)
+            .filter(Booking.id == review.booking_id)
+            .scalar()
+        )
+
     db.delete(review)
     try:
-        db.commit()
+        if hotel_id is not None:
+            apply_review_rating(db, hotel_id, review.rating, -1)
+        commit(db)
         return True
     except:
         db.rollback()
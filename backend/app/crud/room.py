@@ -3,10 +3,12 @@ from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from sqlalchemy import and_
 
-from app.models.room import Room
+from app.models.room import Room, AMENITY_BITS
 from app.models.hotel import Hotel
 from app.schemas.room import RoomCreate
 from app.schemas.room import RoomUpdate 
+from app.services.calendar_cache import calendar_cache
+from app.config.database import after_commit, commit
 
 def create_room(db: Session, room_in: RoomCreate) -> Optional[Room]:
     """
@@ -33,16 +35,38 @@ def create_room(db: Session, room_in: RoomCreate) -> Optional[Room]:
         has_safe=room_in.has_safe,
         hotel_id=room_in.hotel_id
     )
+    room.refresh_amenity_mask()
 
     db.add(room)
     try:
-        db.commit()
+        after_commit(db, lambda: calendar_cache.invalidate_hotel(room.hotel_id))
+        commit(db)
         db.refresh(room)
         return room
     except IntegrityError:
         db.rollback()
         return None
 
+def amenity_filter_clause(**flags: Optional[bool]):
+    """
+    Build a single bitwise predicate on Room.amenity_mask from facility flags.
+    True requires the amenity, False excludes it, None ignores it.
+    Returns None when no flag is set.
+    """
+    required = 0
+    forbidden = 0
+    for field, value in flags.items():
+        if value is None:
+            continue
+        if value:
+            required |= AMENITY_BITS[field]
+        else:
+            forbidden |= AMENITY_BITS[field]
+
+    if not required and not forbidden:
+        return None
+    return Room.amenity_mask.op("&")(required | forbidden) == required
+
 def get_room_by_id(db: Session, room_id: int) -> Optional[Room]:
     """
     Fetch a room by ID, including hotel details.
@@ -67,14 +91,18 @@ def update_room(db: Session, room_id: int, room_update: RoomUpdate) -> Optional[
         return None
 
     update_data = room_update.model_dump(exclude_unset=True)
+    previous_hotel_id = room.hotel_id
 
     for field, value in update_data.items():
         if isinstance(value, str):
             value = value.strip()
         setattr(room, field, value)
+    room.refresh_amenity_mask()
 
+    hotel_ids = {previous_hotel_id, room.hotel_id}
     try:
-        db.commit()
+        after_commit(db, lambda: [calendar_cache.invalidate_hotel(hotel_id) for hotel_id in hotel_ids])
+        commit(db)
         db.refresh(room)
         return room
     except IntegrityError:
@@ -89,9 +117,11 @@ def delete_room(db: Session, room_id: int) -> bool:
     if not room:
         return False
 
+    hotel_id = room.hotel_id
     db.delete(room)
     try:
-        db.commit()
+        after_commit(db, lambda: calendar_cache.invalidate_hotel(hotel_id))
+        commit(db)
         return True
     except:
         db.rollback()
@@ -145,28 +175,17 @@ def filter_rooms(
         query = query.filter(Room.capacity >= min_capacity)
 
     # Facility filters (only apply if passed explicitly)
-    if has_wifi is not None:
-        query = query.filter(Room.has_wifi == has_wifi)
-
-    if allows_pets is not None:
-        query = query.filter(Room.allows_pets == allows_pets)
-
-    if has_air_conditioning is not None:
-        query = query.filter(Room.has_air_conditioning == has_air_conditioning)
-
-    if has_tv is not None:
-        query = query.filter(Room.has_tv == has_tv)
-
-    if has_minibar is not None:
-        query = query.filter(Room.has_minibar == has_minibar)
-
-    if has_balcony is not None:
-        query = query.filter(Room.has_balcony == has_balcony)
-
-    if has_kitchen is not None:
-        query = query.filter(Room.has_kitchen == has_kitchen)
-
-    if has_safe is not None:
-        query = query.filter(Room.has_safe == has_safe)
+    amenities = amenity_filter_clause(
+        has_wifi=has_wifi,
+        allows_pets=allows_pets,
+        has_air_conditioning=has_air_conditioning,
+        has_tv=has_tv,
+        has_minibar=has_minibar,
+        has_balcony=has_balcony,
+        has_kitchen=has_kitchen,
+        has_safe=has_safe,
+    )
+    if amenities is not None:
+        query = query.filter(amenities)
 
     return query.order_by(Room.price_per_night.asc()).all()
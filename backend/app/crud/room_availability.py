@@ -1,16 +1,51 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_
+from sqlalchemy import and_, exists, insert, or_
+from bisect import bisect_right
+from dataclasses import dataclass
 from datetime import date
 from datetime import timedelta
 
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
+from app.config.settings import settings
 from app.models.room_availability import RoomAvailability
+from app.models.room_block import RoomBlock
 from app.models.room import Room
+from app.models.booking import Booking
 from app.schemas.room_availability import RoomAvailabilityCreate
+from app.schemas.booking import BookingStatusEnum
+from app.services.inventory_events import record_nights_blocked, record_nights_released
+from app.services.lock_metrics import lock_wait_stats
+from app.config.database import commit
 
-def create_availability_entry(db: Session, availability_in: RoomAvailabilityCreate) -> Optional[RoomAvailability]:
+# Availability is stored either as one room_availability row per blocked night ("nights")
+# or as one room_blocks row per blocked stay ("intervals"); see settings.AVAILABILITY_STORAGE.
+# Everything that reads or writes blocked nights goes through this module.
+
+ROOM_ID_CHUNK = 1000  # rooms per IN (...) list in bulk lookups
+STAY_CHUNK = 200  # (room, range) pairs per OR-ed DELETE in bulk releases
+
+
+@dataclass
+class BlockedNight:
+    """
+    One night of a RoomBlock, shaped like a RoomAvailability row for the API.
+    """
+    id: int
+    room_id: int
+    date: date
+    is_available: bool = False
+    price_override: Optional[float] = None
+
+
+def uses_interval_storage() -> bool:
+    return settings.AVAILABILITY_STORAGE == "intervals"
+
+
+def create_availability_entry(
+    db: Session, availability_in: RoomAvailabilityCreate
+) -> Optional[Union[RoomAvailability, BlockedNight]]:
     """
     Adds an availability record marking the room as unavailable (booked) for a specific date.
     If the room is already unavailable for that date, it returns None.
@@ -20,6 +55,9 @@ def create_availability_entry(db: Session, availability_in: RoomAvailabilityCrea
     if not db.query(Room).filter(Room.id == availability_in.room_id).first():
         return None
 
+    if uses_interval_storage():
+        return _create_single_night_block(db, availability_in.room_id, availability_in.date)
+
     # Check if there's already a record and the room is unavailable
     existing = db.query(RoomAvailability).filter(
         RoomAvailability.room_id == availability_in.room_id,
@@ -34,8 +72,9 @@ def create_availability_entry(db: Session, availability_in: RoomAvailabilityCrea
             # Overwrite availability to unavailable
             existing.is_available = False
             existing.price_override = availability_in.price_override
+            record_nights_blocked(db, existing.room_id, existing.date, existing.date + timedelta(days=1))
             try:
-                db.commit()
+                commit(db)
                 db.refresh(existing)
                 return existing
             except IntegrityError:
@@ -51,8 +90,9 @@ def create_availability_entry(db: Session, availability_in: RoomAvailabilityCrea
     )
 
     db.add(availability)
+    record_nights_blocked(db, availability.room_id, availability.date, availability.date + timedelta(days=1))
     try:
-        db.commit()
+        commit(db)
         db.refresh(availability)
         return availability
     except IntegrityError:
@@ -65,6 +105,9 @@ def is_room_available_for_range(db: Session, room_id: int, check_in: date, check
     Return True if room has **no unavailable entries** for the date range.
     If a date is missing — it's assumed to be available.
     """
+    if uses_interval_storage():
+        return not db.query(room_blocked_clause(room_id, check_in, check_out)).scalar()
+
     blocked = db.query(RoomAvailability).filter(
         RoomAvailability.room_id == room_id,
         RoomAvailability.date >= check_in,
@@ -74,13 +117,398 @@ def is_room_available_for_range(db: Session, room_id: int, check_in: date, check
 
     return blocked is None  # If no blocked dates, room is available
 
-def get_unavailable_dates(db: Session, room_id: int, check_in: date, check_out: date) -> List[RoomAvailability]:
+def are_rooms_available(db: Session, checks: Sequence[Tuple[int, date, date]]) -> List[bool]:
+    """
+    Answer many (room_id, check_in, check_out) checks at once, in input order.
+    Blocked nights of all rooms involved are read with one range query (per chunk of
+    ROOM_ID_CHUNK rooms) spanning the earliest check-in to the latest check-out.
+    """
+    if not checks:
+        return []
+
+    span_start = min(check_in for _, check_in, _ in checks)
+    span_end = max(check_out for _, _, check_out in checks)
+    room_ids = sorted({room_id for room_id, _, _ in checks})
+
+    # 1. Blocked ranges per room over the whole span
+    ranges: Dict[int, List[Tuple[date, date]]] = {}
+    for i in range(0, len(room_ids), ROOM_ID_CHUNK):
+        chunk = room_ids[i:i + ROOM_ID_CHUNK]
+        if uses_interval_storage():
+            rows = db.query(RoomBlock.room_id, RoomBlock.start_date, RoomBlock.end_date).filter(
+                RoomBlock.room_id.in_(chunk),
+                RoomBlock.start_date < span_end,
+                RoomBlock.end_date > span_start
+            ).all()
+        else:
+            rows = [
+                (room_id, day, day + timedelta(days=1))
+                for room_id, day in db.query(RoomAvailability.room_id, RoomAvailability.date).filter(
+                    RoomAvailability.room_id.in_(chunk),
+                    RoomAvailability.date >= span_start,
+                    RoomAvailability.date < span_end,
+                    RoomAvailability.is_available == False
+                ).all()
+            ]
+        for room_id, start, end in rows:
+            ranges.setdefault(room_id, []).append((start, end))
+
+    # 2. Merge each room's ranges into sorted, disjoint runs, so a check is one bisect
+    runs: Dict[int, Tuple[List[date], List[date]]] = {}
+    for room_id, room_ranges in ranges.items():
+        starts: List[date] = []
+        ends: List[date] = []
+        for start, end in sorted(room_ranges):
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        runs[room_id] = (starts, ends)
+
+    # 3. A stay is free unless the first run ending after check-in starts before check-out
+    results = []
+    for room_id, check_in, check_out in checks:
+        starts, ends = runs.get(room_id, ([], []))
+        i = bisect_right(ends, check_in)
+        results.append(i == len(ends) or starts[i] >= check_out)
+    return results
+
+def room_blocked_clause(room_id_column, check_in: date, check_out: date):
+    """
+    EXISTS predicate that is true when the room referenced by `room_id_column`
+    has at least one blocked night in [check_in, check_out).
+    Negate it (~) to select rooms that are free for the whole range.
+    """
+    if uses_interval_storage():
+        # Half-open overlap: [start_date, end_date) intersects [check_in, check_out)
+        return exists().where(
+            RoomBlock.room_id == room_id_column,
+            RoomBlock.start_date < check_out,
+            RoomBlock.end_date > check_in,
+        )
+
+    return exists().where(
+        RoomAvailability.room_id == room_id_column,
+        RoomAvailability.date >= check_in,
+        RoomAvailability.date < check_out,
+        RoomAvailability.is_available == False
+    )
+
+def get_unavailable_dates(
+    db: Session, room_id: int, check_in: date, check_out: date
+) -> List[Union[RoomAvailability, BlockedNight]]:
     """
     Return all unavailable entries (booked/blocked) in a given date range for a room.
+    In interval storage, overlapping blocks are expanded into one entry per night in the range.
     """
+    if uses_interval_storage():
+        blocks = db.query(RoomBlock).filter(
+            RoomBlock.room_id == room_id,
+            RoomBlock.start_date < check_out,
+            RoomBlock.end_date > check_in
+        ).order_by(RoomBlock.start_date.asc()).all()
+
+        nights = []
+        for block in blocks:
+            day = max(block.start_date, check_in)
+            while day < min(block.end_date, check_out):
+                nights.append(BlockedNight(id=block.id, room_id=block.room_id, date=day))
+                day += timedelta(days=1)
+        return nights
+
     return db.query(RoomAvailability).filter(
         RoomAvailability.room_id == room_id,
         RoomAvailability.date >= check_in,
         RoomAvailability.date < check_out,
         RoomAvailability.is_available == False
     ).all()
+
+
+def get_hotel_nights(
+    db: Session, hotel_id: int, start: date, end: date
+) -> Tuple[Dict[int, Set[date]], Dict[int, Dict[date, float]]]:
+    """
+    Blocked nights and price overrides in [start, end) for every room of a hotel,
+    from one range query over room_availability (plus one over room_blocks in interval storage).
+    Returns ({room_id: blocked dates}, {room_id: {date: price_override}}).
+    """
+    blocked: Dict[int, Set[date]] = {}
+    overrides: Dict[int, Dict[date, float]] = {}
+    intervals = uses_interval_storage()
+
+    rows = db.query(
+        RoomAvailability.room_id, RoomAvailability.date, RoomAvailability.is_available, RoomAvailability.price_override
+    ).join(Room, Room.id == RoomAvailability.room_id).filter(
+        Room.hotel_id == hotel_id,
+        RoomAvailability.date >= start,
+        RoomAvailability.date < end
+    ).all()
+    for room_id, day, is_available, price_override in rows:
+        if not is_available and not intervals:
+            blocked.setdefault(room_id, set()).add(day)
+        if price_override is not None:
+            overrides.setdefault(room_id, {})[day] = price_override
+
+    if intervals:
+        blocks = db.query(RoomBlock.room_id, RoomBlock.start_date, RoomBlock.end_date).join(
+            Room, Room.id == RoomBlock.room_id
+        ).filter(
+            Room.hotel_id == hotel_id,
+            RoomBlock.start_date < end,
+            RoomBlock.end_date > start
+        ).all()
+        for room_id, block_start, block_end in blocks:
+            days = blocked.setdefault(room_id, set())
+            day = max(block_start, start)
+            while day < min(block_end, end):
+                days.add(day)
+                day += timedelta(days=1)
+
+    return blocked, overrides
+
+
+def lock_rooms(db: Session, room_ids: Sequence[int]) -> List[int]:
+    """
+    Lock the room rows, in ascending id order, and return the ids that exist.
+    Bookings lock their rooms this way before writing anything, so concurrent bookings
+    of a room queue on its row. A free range has no night rows to lock, and the gap
+    locks InnoDB takes on it instead do not exclude each other: two bookings would both
+    get them and deadlock on their INSERTs.
+    """
+    return [
+        room_id for (room_id,) in
+        db.query(Room.id).filter(Room.id.in_(room_ids)).order_by(Room.id).with_for_update().all()
+    ]
+
+
+def lock_room_nights(db: Session, room_id: int, check_in: date, check_out: date) -> None:
+    """
+    Take row locks that serialize concurrent bookings of the room for the range:
+    the room row, and in night storage the rows that already exist for the range.
+    """
+    lock_rooms(db, [room_id])
+    if uses_interval_storage():
+        return
+
+    db.query(RoomAvailability).filter(
+        RoomAvailability.room_id == room_id,
+        RoomAvailability.date >= check_in,
+        RoomAvailability.date < check_out
+    ).with_for_update().all()
+
+
+def add_room_block(
+    db: Session, room_id: int, start: date, end: date, booking_id: Optional[int] = None
+) -> RoomBlock:
+    """
+    Add a [start, end) block for the room (interval storage). Does not commit.
+    """
+    block = RoomBlock(room_id=room_id, start_date=start, end_date=end, booking_id=booking_id)
+    db.add(block)
+    record_nights_blocked(db, room_id, start, end)
+    return block
+
+
+def block_room_nights(
+    db: Session, room_id: int, check_in: date, check_out: date, booking_id: Optional[int] = None,
+    rooms_locked: bool = False
+) -> bool:
+    """
+    Block nights [check_in, check_out) of a room for a booking. Does not commit.
+    Returns False if any night is already blocked.
+
+    Both storages first lock the room row (see lock_rooms()), which serializes
+    concurrent bookings of the room; pass rooms_locked=True if the caller already
+    locked it, so the wait is measured once. Night storage then writes all missing
+    nights with one multi-row INSERT; the unique (room_id, date) constraint still
+    rejects a night written by a path that does not lock the room (IntegrityError).
+    """
+    if uses_interval_storage():
+        if not rooms_locked:
+            with lock_wait_stats.measure("room_nights"):
+                lock_room_nights(db, room_id, check_in, check_out)
+        if not is_room_available_for_range(db, room_id, check_in, check_out):
+            return False
+        add_room_block(db, room_id, check_in, check_out, booking_id=booking_id)
+        return True
+
+    # 1. Lock the room, then the rows that already exist for the range (blocked nights and price overrides)
+    if not rooms_locked:
+        with lock_wait_stats.measure("room_nights"):
+            lock_rooms(db, [room_id])
+    existing = db.query(RoomAvailability.id, RoomAvailability.date, RoomAvailability.is_available).filter(
+        RoomAvailability.room_id == room_id,
+        RoomAvailability.date >= check_in,
+        RoomAvailability.date < check_out
+    ).with_for_update().all()
+    if any(not row.is_available for row in existing):
+        return False
+
+    # 2. Nights that have an "available" row are flipped in place
+    if existing:
+        db.query(RoomAvailability).filter(
+            RoomAvailability.id.in_([row.id for row in existing])
+        ).update({RoomAvailability.is_available: False}, synchronize_session=False)
+
+    # 3. All other nights go in with a single INSERT
+    taken = {row.date for row in existing}
+    nights = [
+        {"room_id": room_id, "date": check_in + timedelta(days=i), "is_available": False, "price_override": None}
+        for i in range((check_out - check_in).days)
+        if check_in + timedelta(days=i) not in taken
+    ]
+    if nights:
+        db.execute(insert(RoomAvailability).values(nights))
+
+    record_nights_blocked(db, room_id, check_in, check_out)
+    return True
+
+
+def release_room_nights(db: Session, room_id: int, start: date, end: date) -> None:
+    """
+    Make nights [start, end) of a room available again. Does not commit.
+    In interval storage, blocks overlapping the range are trimmed to what lies outside it.
+    Only the nights that were actually blocked are reported as released.
+    """
+    if uses_interval_storage():
+        blocks = db.query(RoomBlock).filter(
+            RoomBlock.room_id == room_id,
+            RoomBlock.start_date < end,
+            RoomBlock.end_date > start
+        ).all()
+        for freed_start, freed_end in _trim_blocks(db, blocks, start, end):
+            record_nights_released(db, room_id, freed_start, freed_end)
+        return
+
+    nights = db.query(RoomAvailability.id, RoomAvailability.room_id, RoomAvailability.date).filter(
+        RoomAvailability.room_id == room_id,
+        RoomAvailability.date >= start,
+        RoomAvailability.date < end,
+        RoomAvailability.is_available == False
+    ).all()
+    _delete_nights(db, nights)
+
+
+def release_stays_nights(db: Session, stays: Sequence[Tuple[int, date, date]]) -> None:
+    """
+    release_room_nights() for many (room_id, start, end) stays, one lookup per STAY_CHUNK stays.
+    Does not commit.
+    """
+    for i in range(0, len(stays), STAY_CHUNK):
+        chunk = stays[i:i + STAY_CHUNK]
+        if uses_interval_storage():
+            blocks: Dict[int, List[RoomBlock]] = {}
+            for block in db.query(RoomBlock).filter(or_(*(
+                and_(RoomBlock.room_id == room_id, RoomBlock.start_date < end, RoomBlock.end_date > start)
+                for room_id, start, end in chunk
+            ))).all():
+                blocks.setdefault(block.room_id, []).append(block)
+            for room_id, start, end in chunk:
+                for freed_start, freed_end in _trim_blocks(db, blocks.get(room_id, []), start, end):
+                    record_nights_released(db, room_id, freed_start, freed_end)
+        else:
+            nights = db.query(RoomAvailability.id, RoomAvailability.room_id, RoomAvailability.date).filter(
+                RoomAvailability.is_available == False,
+                or_(*(
+                    and_(RoomAvailability.room_id == room_id, RoomAvailability.date >= start, RoomAvailability.date < end)
+                    for room_id, start, end in chunk
+                ))
+            ).all()
+            _delete_nights(db, nights)
+
+
+def _trim_blocks(db: Session, blocks: List[RoomBlock], start: date, end: date) -> List[Tuple[date, date]]:
+    """
+    Free [start, end) in `blocks` (all of one room): blocks inside the range are deleted,
+    blocks crossing one edge are shortened and a block spanning the range is split in two.
+    `blocks` is updated in place so it can be trimmed again. Returns the freed ranges.
+    """
+    freed = []
+    for block in list(blocks):
+        if block.start_date >= end or block.end_date <= start:
+            continue
+        freed.append((max(block.start_date, start), min(block.end_date, end)))
+        if block.start_date < start and block.end_date > end:
+            tail = RoomBlock(room_id=block.room_id, start_date=end, end_date=block.end_date, booking_id=block.booking_id)
+            db.add(tail)
+            blocks.append(tail)
+            block.end_date = start
+        elif block.start_date < start:
+            block.end_date = start
+        elif block.end_date > end:
+            block.start_date = end
+        else:
+            db.delete(block)
+            blocks.remove(block)
+    return sorted(freed)
+
+
+def _delete_nights(db: Session, nights: Sequence[Tuple[int, int, date]]) -> None:
+    """
+    Delete blocked (id, room_id, date) night rows and report each run of consecutive nights as released.
+    """
+    ids = [night_id for night_id, _, _ in nights]
+    for i in range(0, len(ids), ROOM_ID_CHUNK):
+        db.query(RoomAvailability).filter(
+            RoomAvailability.id.in_(ids[i:i + ROOM_ID_CHUNK])
+        ).delete(synchronize_session=False)
+
+    runs: List[List] = []
+    for _, room_id, day in sorted(nights, key=lambda night: (night[1], night[2])):
+        last = runs[-1] if runs else None
+        if last and last[0] == room_id and last[2] == day:
+            last[2] = day + timedelta(days=1)
+        else:
+            runs.append([room_id, day, day + timedelta(days=1)])
+    for room_id, run_start, run_end in runs:
+        record_nights_released(db, room_id, run_start, run_end)
+
+
+def rebuild_blocks_from_nights(db: Session) -> int:
+    """
+    Replace room_blocks with the blocked nights of room_availability: one block per
+    run of consecutive nights of the same booking (a night belongs to the live booking
+    of the room that covers it), so releasing a booking frees exactly its own nights.
+    Run when switching AVAILABILITY_STORAGE to "intervals".
+    Returns the number of blocks written.
+    """
+    nights = db.query(RoomAvailability.room_id, RoomAvailability.date, Booking.id).outerjoin(
+        Booking, and_(
+            Booking.room_id == RoomAvailability.room_id,
+            Booking.check_in_date <= RoomAvailability.date,
+            Booking.check_out_date > RoomAvailability.date,
+            Booking.status != BookingStatusEnum.cancelled
+        )
+    ).filter(
+        RoomAvailability.is_available == False
+    ).order_by(RoomAvailability.room_id.asc(), RoomAvailability.date.asc(), Booking.id.asc()).all()
+
+    blocks = []
+    for room_id, day, booking_id in nights:
+        last = blocks[-1] if blocks else None
+        if last and last["room_id"] == room_id and last["end_date"] > day:
+            continue  # Night already covered (overlapping bookings): keep the first
+        if last and last["room_id"] == room_id and last["end_date"] == day and last["booking_id"] == booking_id:
+            last["end_date"] = day + timedelta(days=1)
+        else:
+            blocks.append({"room_id": room_id, "start_date": day, "end_date": day + timedelta(days=1), "booking_id": booking_id})
+
+    db.query(RoomBlock).delete(synchronize_session=False)
+    if blocks:
+        db.bulk_insert_mappings(RoomBlock, blocks)
+    db.commit()
+    return len(blocks)
+
+
+def _create_single_night_block(db: Session, room_id: int, day: date) -> Optional[BlockedNight]:
+    if not is_room_available_for_range(db, room_id, day, day + timedelta(days=1)):
+        return None
+
+    block = add_room_block(db, room_id, day, day + timedelta(days=1))
+    try:
+        commit(db)
+        return BlockedNight(id=block.id, room_id=room_id, date=day)
+    except IntegrityError:
+        db.rollback()
+        return None
@@ -5,6 +5,7 @@ from app.models.user import User
 from app.models.booking import Booking
 from app.schemas.user import UserCreate, UserUpdate
 from passlib.context import CryptContext
+from app.config.database import commit
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -36,7 +37,7 @@ def create_user(db: Session, user_in: UserCreate) -> Optional[User]:
 
     db.add(user)
     try:
-        db.commit()
+        commit(db)
         db.refresh(user)
         return user
     except IntegrityError:
@@ -56,7 +57,7 @@ def delete_user(db: Session, user_id: int) -> bool:
 
     db.delete(user)
     try:
-        db.commit()
+        commit(db)
         return True
     except:
         db.rollback()
@@ -72,7 +73,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
     for field, value in user_update.model_dump(exclude_unset=True).items():
         setattr(user, field, value.strip() if isinstance(value, str) else value)
 
-    db.commit()
+    commit(db)
     db.refresh(user)
     return user
 
@@ -92,6 +93,6 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
 def update_user_password(db: Session, user: User, new_password: str) -> User:
     """Securely update a user's password."""
     user.password_hash = pwd_context.hash(new_password)
-    db.commit()
+    commit(db)
     db.refresh(user)
     return user
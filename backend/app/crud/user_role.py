@@ -4,6 +4,7 @@ from typing import List, Optional
 from app.models.user_role import UserRole
 from app.schemas.user_role import UserRoleCreate
 from app.models.user import User
+from app.config.database import commit
 
 
 def assign_user_role(db: Session, role_in: UserRoleCreate) -> Optional[UserRole]:
@@ -27,7 +28,7 @@ def assign_user_role(db: Session, role_in: UserRoleCreate) -> Optional[UserRole]
 
     db.add(role)
     try:
-        db.commit()
+        commit(db)
         db.refresh(role)
         return role
     except IntegrityError:
@@ -52,7 +53,7 @@ def remove_user_role(db: Session, user_id: int, role_name: str) -> bool:
 
     db.delete(role)
     try:
-        db.commit()
+        commit(db)
         return True
     except:
         db.rollback()
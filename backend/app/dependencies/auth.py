@@ -1,12 +1,15 @@
 # dependencies/auth.py
 
-from fastapi import Depends, HTTPException, status
+import secrets
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
 from app.config.jwt_config import SECRET_KEY, ALGORITHM
 from app.config.database import get_db
+from app.config.settings import settings
 from app.crud.user import get_user_by_email
 from app.models.user import User
 
@@ -35,3 +38,12 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
 
 
     return user
+
+
+def require_internal_token(x_internal_token: str = Header("", alias="X-Internal-Token")) -> None:
+    """
+    Guard for the /internal/* operational endpoints: the caller must send INTERNAL_API_TOKEN.
+    """
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected or not secrets.compare_digest(x_internal_token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid internal token")
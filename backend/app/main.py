@@ -1,13 +1,20 @@
 # backend/app/main.py
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from app.config.settings import settings
+from app.config.database import READ_PRIMARY_COOKIE, REPLICA_URLS, SessionLocal, engine
+from app.services.availability_index import availability_index
+from app.services.hold_sweeper import hold_sweeper
+from app.services.booking_cleanup import booking_cleanup_job
+from app.services.sql_instrumentation import finish_request, start_request
+from app.services.slow_queries import slow_query_log
 from fastapi.staticfiles import StaticFiles
 
 import os
+import time
 
 # Routers
-from app.routers import city, country, user, user_role, hotel, room, room_availability, hotel_photo, booking, cancellation, payment, review, location
+from app.routers import city, country, user, user_role, hotel, room, room_availability, hotel_photo, booking, cancellation, payment, review, location, internal
 app = FastAPI(
     title="Booking API",
     version="1.0.0"
@@ -15,6 +22,98 @@ app = FastAPI(
 
 UPLOAD_DIR = os.path.join("static", "uploads")
 
+@app.on_event("startup")
+def load_availability_index():
+    """
+    Build the in-memory availability bitmap from room_availability.
+    """
+    if not settings.AVAILABILITY_INDEX_ENABLED:
+        return
+    db = SessionLocal()
+    try:
+        availability_index.load(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def start_hold_sweeper():
+    """
+    Release booking holds that were not paid in time, in the background.
+    """
+    if settings.HOLD_SWEEPER_ENABLED:
+        hold_sweeper.start()
+
+@app.on_event("shutdown")
+def stop_hold_sweeper():
+    hold_sweeper.stop()
+
+@app.on_event("startup")
+def start_booking_cleanup():
+    """
+    Complete past stays and cancel never-paid bookings periodically, in the background.
+    """
+    if settings.BOOKING_CLEANUP_ENABLED:
+        booking_cleanup_job.start()
+
+@app.on_event("shutdown")
+def stop_booking_cleanup():
+    booking_cleanup_job.stop()
+
+@app.on_event("shutdown")
+def dump_slow_queries():
+    if settings.SLOW_QUERY_DUMP_PATH:
+        slow_query_log.explain_worst(engine)
+        slow_query_log.dump(settings.SLOW_QUERY_DUMP_PATH)
+
+@app.middleware("http")
+async def keep_writers_on_primary(request: Request, call_next):
+    """
+    Read-your-writes with replicas: after a successful write, the client's reads
+    go to the primary for READ_YOUR_WRITES_SECONDS, until the replicas have caught up.
+    """
+    response = await call_next(request)
+    is_write = request.method in ("POST", "PUT", "PATCH", "DELETE") and not getattr(request.state, "read_only", False)
+    if REPLICA_URLS and is_write and response.status_code < 400:
+        response.set_cookie(READ_PRIMARY_COOKIE, "1", max_age=settings.READ_YOUR_WRITES_SECONDS, httponly=True)
+    return response
+
+@app.middleware("http")
+async def instrument_sql(request: Request, call_next):
+    """
+    Count the SQL statements and database time of each request; reported in a
+    Server-Timing header and one structured log line (logger "app.sql").
+    """
+    if not settings.SQL_INSTRUMENTATION_ENABLED:
+        return await call_next(request)
+
+    stats = start_request()
+    started = time.perf_counter()
+    response = await call_next(request)
+
+    route = request.scope.get("route")
+    def finish() -> str:
+        return finish_request(
+            request.method, route.path if route else request.url.path, response.status_code,
+            stats, time.perf_counter() - started
+        )
+
+    # A body of known length was fully rendered before the headers went out
+    if "content-length" in response.headers:
+        response.headers.append("Server-Timing", finish())
+        return response
+
+    # A streamed body runs its queries while it is sent, after the headers: no
+    # Server-Timing, the log line and endpoint stats are written once it is complete
+    body = response.body_iterator
+    async def instrumented_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            finish()
+    response.body_iterator = instrumented_body()
+    return response
+
 app.mount("/static/uploads", StaticFiles(directory=UPLOAD_DIR), name="uploads")
 
 # Register all routers
@@ -30,4 +129,6 @@ app.include_router(booking.router)
 app.include_router(cancellation.router)
 app.include_router(payment.router)
 app.include_router(review.router)
-app.include_router(location.router)
\ No newline at end of file
+app.include_router(location.router)
+if settings.INTERNAL_API_TOKEN:
+    app.include_router(internal.router)
\ No newline at end of file
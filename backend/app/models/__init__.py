@@ -3,10 +3,13 @@ from .user_role import UserRole
 from .hotel import Hotel
 from .room import Room
 from .room_availability import RoomAvailability
+from .room_block import RoomBlock
 from .review import Review
 from .payment import Payment
 from .hotel_photo import HotelPhoto
+from .hotel_rating_stats import HotelRatingStats
 from .country import Country
 from .city import City
 from .cancellation import Cancellation
-from .booking import Booking
\ No newline at end of file
+from .booking import Booking
+from .idempotency_key import IdempotencyKey
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 
@@ -13,6 +13,7 @@ class Booking(Base):
     check_out_date = Column(Date, nullable=False)  # Check-out date
     status = Column(String(50), nullable=False, default="pending")  # Booking status
     additional_info = Column(String(500), nullable=True)  # Additional information (e.g., number of guests, guest names)
+    hold_expires_at = Column(DateTime, nullable=True, index=True)  # UTC; a pending booking not paid by then is released
     
     # Relationship to User (Many-to-One)
     user = relationship("User", back_populates="bookings")  # Linking to User table
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 
 class Hotel(Base):
     __tablename__ = "hotels"
+    __table_args__ = (
+        # Bounding-box prefilter for radius search
+        Index("ix_hotels_lat_lon", "latitude", "longitude"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String(255), nullable=False)
@@ -23,4 +27,5 @@ class Hotel(Base):
     # Relationships
     city = relationship("City", back_populates="hotels")  # Delete hotels when a city is deleted
     rooms = relationship("Room", back_populates="hotel", cascade="none")  # No delete cascade on rooms
-    photos = relationship("HotelPhoto", back_populates="hotel", cascade="all, delete")
\ No newline at end of file
+    photos = relationship("HotelPhoto", back_populates="hotel", cascade="all, delete")
+    rating_stats = relationship("HotelRatingStats", back_populates="hotel", uselist=False, cascade="all, delete")
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy.orm import relationship
+from app.config.database import Base
+
+# Ratings are 1-5 (see app.schemas.review.ReviewBase)
+RATING_VALUES = range(1, 6)
+
+
+class HotelRatingStats(Base):
+    """
+    Running review aggregates for one hotel, maintained by app.crud.review
+    in the same transaction as the review itself.
+    """
+    __tablename__ = "hotel_rating_stats"
+
+    hotel_id = Column(Integer, ForeignKey("hotels.id", ondelete="CASCADE"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Histogram: number of reviews per star value
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    hotel = relationship("Hotel", back_populates="rating_stats")
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @property
+    def histogram(self) -> dict:
+        return {rating: getattr(self, f"rating_{rating}_count") for rating in RATING_VALUES}
+
+    def __repr__(self):
+        return f"<HotelRatingStats(hotel_id={self.hotel_id}, review_count={self.review_count}, rating_sum={self.rating_sum})>"
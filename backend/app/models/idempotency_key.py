@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from app.config.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    First response to a request sent with an Idempotency-Key header, replayed to retries
+    (see app.services.idempotency). A row with status_code NULL is a request still in flight.
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("user_id", "endpoint", "key", name="uq_idempotency_keys_user_endpoint_key"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    endpoint = Column(String(100), nullable=False)  # e.g. "POST /bookings/"
+    key = Column(String(255), nullable=False)  # Client-chosen Idempotency-Key value
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request body, to reject a key reused for another request
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is still running
+    response_body = Column(Text, nullable=True)  # JSON
+    created_at = Column(DateTime, nullable=False, index=True)  # UTC
+
+    def __repr__(self):
+        return f"<IdempotencyKey(id={self.id}, endpoint={self.endpoint}, key={self.key}, status_code={self.status_code})>"
@@ -1,9 +1,25 @@
-from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 
+# Bit positions of the packed amenity mask (never reorder: values are stored in the DB)
+AMENITY_BITS = {
+    "has_wifi": 1 << 0,
+    "allows_pets": 1 << 1,
+    "has_air_conditioning": 1 << 2,
+    "has_tv": 1 << 3,
+    "has_minibar": 1 << 4,
+    "has_balcony": 1 << 5,
+    "has_kitchen": 1 << 6,
+    "has_safe": 1 << 7,
+}
+
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        # Search selects rooms by hotel and capacity and filters on the amenity mask
+        Index("ix_rooms_hotel_capacity_amenity", "hotel_id", "capacity", "amenity_mask"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     name = Column(String(255), nullable=False)
@@ -22,6 +38,7 @@ class Room(Base):
     has_balcony = Column(Boolean, default=False)  # Whether the room has a balcony
     has_kitchen = Column(Boolean, default=False)  # Whether the room has a kitchen
     has_safe = Column(Boolean, default=False)  # Whether the room has a safe
+    amenity_mask = Column(Integer, nullable=False, default=0, server_default="0")  # Packed copy of the flags above (see AMENITY_BITS)
 
     # Cancellation policy (can be implemented using Enum)
     cancellation_policy = Column(String(255), nullable=True)  # e.g., "Flexible", "Non-refundable"
@@ -33,4 +50,13 @@ class Room(Base):
     bookings = relationship("Booking", back_populates="room", cascade="none")   
 
     # One-to-Many: Room can have multiple availability records
-    availability = relationship("RoomAvailability", back_populates="room", cascade="all, delete-orphan")
\ No newline at end of file
+    availability = relationship("RoomAvailability", back_populates="room", cascade="all, delete-orphan")
+
+    # One-to-Many: blocked date ranges (interval availability storage)
+    blocks = relationship("RoomBlock", back_populates="room", cascade="all, delete-orphan")
+
+    def refresh_amenity_mask(self):
+        """
+        Recompute amenity_mask from the boolean facility columns.
+        """
+        self.amenity_mask = sum(bit for field, bit in AMENITY_BITS.items() if getattr(self, field))
@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, Date, Boolean, Float, ForeignKey, String
+from sqlalchemy import Column, Integer, Date, Boolean, Float, ForeignKey, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.config.database import Base
 
 class RoomAvailability(Base):
     __tablename__ = "room_availability"
+    __table_args__ = (
+        # One row per room and night; concurrent bookings of the same night fail on insert
+        UniqueConstraint("room_id", "date", name="uq_room_availability_room_date"),
+    )
 
     id = Column(Integer, primary_key=True)
     room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"))
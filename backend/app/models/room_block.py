@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index, CheckConstraint
+from sqlalchemy.orm import relationship
+from app.config.database import Base
+
+class RoomBlock(Base):
+    """
+    Nights [start_date, end_date) during which a room is unavailable.
+    Used instead of one room_availability row per night when
+    AVAILABILITY_STORAGE is "intervals".
+    """
+    __tablename__ = "room_blocks"
+    __table_args__ = (
+        # Overlap checks: room_id = ? AND start_date < :check_out AND end_date > :check_in
+        Index("ix_room_blocks_room_start_end", "room_id", "start_date", "end_date"),
+        CheckConstraint("start_date < end_date", name="ck_room_blocks_range"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), nullable=False)
+    start_date = Column(Date, nullable=False)  # First blocked night
+    end_date = Column(Date, nullable=False)  # Day after the last blocked night (exclusive)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="SET NULL"), nullable=True)  # Booking that created the block, if any
+
+    room = relationship("Room", back_populates="blocks")
+
+    def __repr__(self):
+        return f"<RoomBlock(id={self.id}, room_id={self.room_id}, start_date={self.start_date}, end_date={self.end_date})>"
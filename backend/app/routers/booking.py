@@ -1,22 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
 
-from app.config.database import get_db
-from app.schemas.booking import BookingCreate, BookingRead, BookingWithRelations
+from app.config.database import get_db, unit_of_work
+from app.schemas.booking import BookingCreate, BookingRead, BookingStatusEnum, BookingWithRelations, GroupBookingCreate
 from app.crud.booking import (
     create_booking,
+    create_group_booking,
     get_booking_by_id,
     get_bookings_by_user,
     cancel_booking,
     mark_booking_as_confirmed,
-    complete_and_cleanup_bookings,
     get_user_bookings_ui
 )
 from app.models.user import User
 from app.dependencies.auth import get_current_user
 from app.schemas.enriched_booking import BookingUiModel 
+from app.services.idempotency import run_idempotent
+from app.services.booking_cleanup import booking_cleanup_job
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
@@ -25,20 +27,53 @@ router = APIRouter(prefix="/bookings", tags=["Bookings"])
 def create_new_booking(
     booking_in: BookingCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """
     Create a new booking using the current authenticated user.
     Automatically injects user_id from token.
+    Retries sent with the same Idempotency-Key get the first response back.
     """
     # Inject current user's ID into the booking input
     booking_data = booking_in.model_copy(update={"user_id": current_user.id})
-    
-    booking = create_booking(db, booking_data)
-    if not booking:
-        raise HTTPException(status_code=400, detail="Booking could not be created")
-    
-    return booking
+
+    def handler():
+        with unit_of_work(db):
+            booking = create_booking(db, booking_data)
+            if not booking:
+                raise HTTPException(status_code=400, detail="Booking could not be created")
+        return booking
+
+    return run_idempotent(
+        idempotency_key, current_user.id, "POST /bookings/", booking_data, db,
+        handler, BookingRead, status.HTTP_201_CREATED
+    )
+
+@router.post("/group", response_model=List[BookingRead], status_code=status.HTTP_201_CREATED)
+def create_new_group_booking(
+    group_in: GroupBookingCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
+):
+    """
+    Book several rooms for the same dates as the current user.
+    Either every room is booked or none is.
+    """
+    group_data = group_in.model_copy(update={"user_id": current_user.id})
+
+    def handler():
+        with unit_of_work(db):
+            bookings = create_group_booking(db, group_data)
+            if not bookings:
+                raise HTTPException(status_code=400, detail="Group booking could not be created")
+        return bookings
+
+    return run_idempotent(
+        idempotency_key, current_user.id, "POST /bookings/group", group_data, db,
+        handler, List[BookingRead], status.HTTP_201_CREATED
+    )
 
 @router.get("/my-bookings")
 def get_my_bookings(
@@ -97,13 +132,14 @@ def cancel_my_booking(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    booking = get_booking_by_id(db, booking_id)
-    if not booking or booking.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="You can only cancel your own bookings")
+    with unit_of_work(db):
+        booking = get_booking_by_id(db, booking_id)
+        if not booking or booking.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="You can only cancel your own bookings")
 
-    success = cancel_booking(db, booking_id)
-    if not success:
-        raise HTTPException(status_code=400, detail="Cancellation failed")
+        success = cancel_booking(db, booking_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Cancellation failed")
 
     return {"message": "Booking cancelled successfully"}
 
@@ -114,9 +150,10 @@ def cancel_existing_booking(
     booking_id: int,
     db: Session = Depends(get_db),
 ):
-    success = cancel_booking(db, booking_id)
-    if not success:
-        raise HTTPException(status_code=400, detail="Cancellation failed")
+    with unit_of_work(db):
+        success = cancel_booking(db, booking_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Cancellation failed")
     return {"message": "Booking cancelled successfully"}
 
 
@@ -125,24 +162,33 @@ def confirm_existing_booking(
     booking_id: int,
     db: Session = Depends(get_db),
 ):
-    success = mark_booking_as_confirmed(db, booking_id)
-    if not success:
-        raise HTTPException(status_code=400, detail="Cannot confirm booking")
+    with unit_of_work(db):
+        success = mark_booking_as_confirmed(db, booking_id)
+        if not success:
+            raise HTTPException(status_code=400, detail="Cannot confirm booking")
     return {"message": "Booking confirmed"}
 
 
 @router.post("/cleanup", status_code=status.HTTP_200_OK)
-def trigger_booking_cleanup(db: Session = Depends(get_db)):
-    result = complete_and_cleanup_bookings(db)
+def trigger_booking_cleanup():
+    """
+    Run the periodic booking cleanup now. Returns rows processed and duration.
+    """
+    result = booking_cleanup_job.run_once()
+    if result is None:
+        raise HTTPException(status_code=409, detail="Booking cleanup is already running")
     return result
 
 @router.get("/", response_model=List[BookingUiModel])
 def get_user_bookings(
+    status_filter: Optional[BookingStatusEnum] = Query(None, alias="status", description="Only bookings in this status"),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit to get every booking"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Returns detailed bookings (with hotel, address, city, country, image, price) for the current user.
     """
-    bookings = get_user_bookings_ui(db=db, user_id=current_user.id)
+    bookings = get_user_bookings_ui(db=db, user_id=current_user.id, status=status_filter, skip=skip, limit=limit)
     return bookings
\ No newline at end of file
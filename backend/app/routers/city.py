@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.config.database import get_db  
+from app.config.database import get_db, get_read_db
 from app.crud import city as crud_city
 from app.schemas.city import CityCreate, CityRead
 from app.models.city import City
@@ -26,7 +26,7 @@ def create_city(city_in: CityCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/by_country/{country_id}", response_model=List[CityRead])
-def get_cities_by_country(country_id: int, db: Session = Depends(get_db)):
+def get_cities_by_country(country_id: int, db: Session = Depends(get_read_db)):
     """
     List all cities that belong to a specific country.
     """
@@ -38,7 +38,7 @@ def search_cities(
     q: str = Query(..., min_length=1),
     country_id: Optional[int] = None,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Autocomplete search for cities by name prefix.
@@ -58,7 +58,7 @@ def delete_city(city_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{city_id}")
-def get_city_with_country(city_id: int, db: Session = Depends(get_db)):
+def get_city_with_country(city_id: int, db: Session = Depends(get_read_db)):
     """
     Get city with its country's name only (avoids circular import).
     """
@@ -80,7 +80,7 @@ from app.schemas.city import LocationSearchResult
 def location_autocomplete(
     q: str = Query(..., min_length=1),
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     cities = crud_city.search_city_with_country(db, query=q, limit=limit)
     return [
@@ -4,20 +4,20 @@ from typing import List, Optional
 
 from app.schemas.country import CountryCreate, CountryRead, CountryWithCities
 from app.models.country import Country
-from app.config.database import get_db  
+from app.config.database import get_db, get_read_db
 from app.crud import country as crud_country
 
 router = APIRouter(prefix="/countries", tags=["Countries"])
 
 
 @router.get("", response_model=List[CountryRead])
-def list_countries(db: Session = Depends(get_db)):
+def list_countries(db: Session = Depends(get_read_db)):
     """Return all countries ordered alphabetically."""
     return crud_country.get_all_countries(db)
 
 
 @router.get("/{country_id}", response_model=CountryWithCities)
-def get_country_by_id(country_id: int, db: Session = Depends(get_db)):
+def get_country_by_id(country_id: int, db: Session = Depends(get_read_db)):
     """Get a single country with its cities."""
     country = crud_country.get_country_by_id(db, country_id)
     if not country:
@@ -46,7 +46,7 @@ def delete_country(country_id: int, db: Session = Depends(get_db)):
 def search_countries(
     q: str = Query(..., min_length=1, description="Query prefix for country name"),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Autocomplete search for countries by name prefix."""
     return crud_country.search_countries_by_prefix(db, query=q, limit=limit)
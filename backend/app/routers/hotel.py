@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
-
-from app.config.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional, Union
+
+from app.config.database import get_async_read_db, get_db, get_read_db, read_session_factory
 from app.models.user import User
 from app.schemas.hotel import HotelCreate, HotelRead, HotelUpdate, HotelWithRelations
 from app.crud.hotel import (
-    create_hotel, get_hotel_by_id, get_all_hotels,
+    create_hotel, get_hotel_by_id_async, get_all_hotels_async,
     delete_hotel, update_hotel, search_hotels, get_hotels_by_owner
 )
-from app.crud.review import get_reviews_for_hotel
-from app.schemas.search import HotelSearchRequest, HotelSearchResult
-from app.services.search import perform_hotel_search
+from app.crud.review import get_reviews_for_hotel_async
+from app.schemas.search import HotelSearchRequest, HotelSearchResponse, HotelSearchResult
+from app.services.search import InvalidCursorError, search_hotels_page, stream_hotel_search
 
 from app.models.hotel import Hotel
 from app.models.city import City
@@ -19,6 +22,8 @@ from app.models.country import Country
 from app.models.review import Review
 from app.models.user import User
 from app.schemas.search_detail import HotelDetailResponse
+from app.schemas.calendar import HotelCalendar
+from app.services.hotel_calendar import get_hotel_calendar
 
 router = APIRouter(prefix="/hotels", tags=["Hotels"])
 
@@ -44,13 +49,13 @@ def create_new_hotel(
 
 
 @router.get("/", response_model=List[HotelRead])
-def list_all_hotels(db: Session = Depends(get_db)):
-    return get_all_hotels(db)
+async def list_all_hotels(db: AsyncSession = Depends(get_async_read_db)):
+    return await get_all_hotels_async(db)
 
 
 @router.get("/{hotel_id}", response_model=HotelWithRelations)
-def get_hotel(hotel_id: int, db: Session = Depends(get_db)):
-    hotel = get_hotel_by_id(db, hotel_id)
+async def get_hotel(hotel_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    hotel = await get_hotel_by_id_async(db, hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
     return hotel
@@ -78,13 +83,14 @@ def delete_existing_hotel(hotel_id: int, db: Session = Depends(get_db)):
 
 @router.get("/search/", response_model=List[HotelRead])
 def search_hotel_list(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     country_id: Optional[int] = None,
     city_id: Optional[int] = None,
     min_stars: Optional[int] = None,
     center_lat: Optional[float] = None,
     center_lon: Optional[float] = None,
     radius_km: Optional[float] = None,
+    sort_by_distance: bool = False,
 ):
     return search_hotels(
         db=db,
@@ -94,10 +100,11 @@ def search_hotel_list(
         center_lat=center_lat,
         center_lon=center_lon,
         radius_km=radius_km,
+        sort_by_distance=sort_by_distance,
     )
 
 @router.get("/owner/{owner_id}")
-def hotels_by_owner(owner_id: int, db: Session = Depends(get_db)):
+def hotels_by_owner(owner_id: int, db: Session = Depends(get_read_db)):
     """
     Get all hotels created by a specific user (owner), including owner info.
     """
@@ -134,7 +141,7 @@ def hotels_by_owner(owner_id: int, db: Session = Depends(get_db)):
 
 @router.get("/my-hotels", response_model=List[HotelRead])
 def get_my_hotels(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -143,34 +150,67 @@ def get_my_hotels(
     return get_hotels_by_owner(db, current_user.id)
 
 # NEW: Advanced Hotel Search with Availability & Destination logic
-@router.post("/search-available", response_model=List[HotelSearchResult])
-def search_available_hotels(
+@router.post("/search-available", response_model=Union[List[HotelSearchResult], HotelSearchResponse])
+async def search_available_hotels(
     request: HotelSearchRequest,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size; omit to get every result"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    stream: bool = Query(False, description="Stream results as NDJSON, one hotel per line"),
+    facets: bool = Query(False, description="Also return hotel counts per star level, price bucket, amenity and rating"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    return perform_hotel_search(db, request)
+    """
+    Search hotels with free rooms for the stay, sorted by `sort_by`.
+    With `limit`, the cursor for the next page is returned in the X-Next-Cursor header
+    (absent on the last page). With `stream=true`, results are sent as NDJSON and a
+    trailing {"next_cursor": ...} line replaces the header.
+    With `facets=true`, the response is an object with `results`, `facets` and
+    `next_cursor` (facets are computed for the first page only; in a stream they
+    come as a {"facets": ...} line).
+    """
+    try:
+        if stream:
+            lines = stream_hotel_search(read_session_factory(http_request), request, limit=limit, cursor=cursor, facets=facets)
+            return StreamingResponse(lines, media_type="application/x-ndjson")
+
+        # The search runs the sync ORM code on the async connection
+        page = await db.run_sync(
+            lambda session: search_hotels_page(session, request, limit=limit, cursor=cursor, facets=facets)
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    if facets:
+        return HotelSearchResponse(results=page.results, facets=page.facets, next_cursor=page.next_cursor)
+    return page.results
 
 
 
 
 @router.get("/{hotel_id}/details", response_model=HotelDetailResponse)
-def get_hotel_detail(hotel_id: int, db: Session = Depends(get_db)):
-    hotel = (
-        db.query(Hotel)
+async def get_hotel_detail(hotel_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    result = await db.execute(
+        select(Hotel)
         .options(
             joinedload(Hotel.city).joinedload(City.country),
-            joinedload(Hotel.photos),
-            joinedload(Hotel.rooms)
+            selectinload(Hotel.photos),
+            selectinload(Hotel.rooms),
+            joinedload(Hotel.rating_stats)
         )
         .filter(Hotel.id == hotel_id)
-        .first()
     )
+    hotel = result.scalars().first()
 
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
 
     # Get reviews separately via Booking → Room → Hotel
-    reviews = get_reviews_for_hotel(db, hotel_id=hotel_id)
+    reviews = await get_reviews_for_hotel_async(db, hotel_id=hotel_id)
+    stats = hotel.rating_stats
 
     return {
         "id": hotel.id,
@@ -193,4 +233,23 @@ def get_hotel_detail(hotel_id: int, db: Session = Depends(get_db)):
             }
             for r in reviews
         ],
-    }
\ No newline at end of file
+        "review_count": stats.review_count if stats else 0,
+        "average_rating": round(stats.average_rating, 2) if stats and stats.average_rating is not None else None,
+        "rating_histogram": stats.histogram if stats else {},
+    }
+
+
+@router.get("/{hotel_id}/calendar", response_model=HotelCalendar)
+def get_hotel_month_calendar(
+    hotel_id: int,
+    month: str = Query(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$", description="Month as YYYY-MM"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Per-day availability and nightly price of every room of the hotel for one month.
+    """
+    year, month_number = (int(part) for part in month.split("-"))
+    result = get_hotel_calendar(db, hotel_id, year, month_number)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    return result
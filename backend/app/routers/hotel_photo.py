@@ -2,7 +2,7 @@ from fastapi import APIRouter, UploadFile, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
 from app.schemas.hotel_photo import HotelPhotoCreate, HotelPhotoRead
 from app.crud.hotel_photo import (
     create_hotel_photo,
@@ -48,7 +48,7 @@ def upload_photo(
 
 
 @router.get("/hotel/{hotel_id}", response_model=List[HotelPhotoRead])
-def list_photos(hotel_id: int, db: Session = Depends(get_db)):
+def list_photos(hotel_id: int, db: Session = Depends(get_read_db)):
     return get_photos_by_hotel(db, hotel_id)
 
 
@@ -0,0 +1,153 @@
+from datetime import timedelta
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.config.database import engine, get_db
+from app.models.booking import Booking
+from app.schemas.booking import BookingStatusEnum
+from app.crud.booking import utc_now
+from app.crud.idempotency_key import purge_expired_idempotency_keys
+from app.dependencies.auth import require_internal_token
+from app.config.settings import settings
+from app.services.calendar_cache import calendar_cache
+from app.services.hold_sweeper import hold_sweeper
+from app.services.booking_cleanup import booking_cleanup_job
+from app.services.lock_metrics import lock_wait_stats
+from app.services.pool_metrics import pool_metrics
+from app.services.search_cache import search_cache
+from app.services.slow_queries import slow_query_log
+from app.services.sql_instrumentation import endpoint_sql_stats
+
+# Only mounted when INTERNAL_API_TOKEN is set (see app.main); every route requires it
+router = APIRouter(prefix="/internal", tags=["Internal"], dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/search-cache")
+def get_search_cache_stats():
+    """
+    Hit/miss/eviction counters of the hotel search result cache (for sizing).
+    """
+    return search_cache.stats()
+
+
+@router.delete("/search-cache", status_code=status.HTTP_204_NO_CONTENT)
+def clear_search_cache():
+    """
+    Drop every cached search result.
+    """
+    search_cache.clear()
+
+
+@router.get("/calendar-cache")
+def get_calendar_cache_stats():
+    """
+    Hit/miss/eviction counters of the hotel calendar cache.
+    """
+    return calendar_cache.stats()
+
+
+@router.delete("/calendar-cache", status_code=status.HTTP_204_NO_CONTENT)
+def clear_calendar_cache():
+    """
+    Drop every cached hotel calendar.
+    """
+    calendar_cache.clear()
+
+
+@router.get("/booking-holds")
+def get_booking_hold_stats(db: Session = Depends(get_db)):
+    """
+    Pending holds still inside their payment window and the sweeper's counters.
+    """
+    now = utc_now()
+    active = db.query(Booking).filter(
+        Booking.status == BookingStatusEnum.pending,
+        Booking.hold_expires_at > now
+    ).count()
+    overdue = db.query(Booking).filter(
+        Booking.status == BookingStatusEnum.pending,
+        Booking.hold_expires_at <= now
+    ).count()
+    return {"active_holds": active, "expired_not_released": overdue, "sweeper": hold_sweeper.stats()}
+
+
+@router.post("/booking-holds/sweep")
+def sweep_booking_holds():
+    """
+    Release expired holds now instead of waiting for the next sweep.
+    """
+    return {"released": hold_sweeper.run_once()}
+
+
+@router.get("/booking-cleanup")
+def get_booking_cleanup_stats():
+    """
+    Counters and last report of the periodic booking cleanup job.
+    """
+    return booking_cleanup_job.stats()
+
+
+@router.get("/lock-waits")
+def get_lock_wait_stats():
+    """
+    Time spent acquiring row locks on the booking path, per lock site.
+    """
+    return lock_wait_stats.stats()
+
+
+@router.delete("/lock-waits", status_code=status.HTTP_204_NO_CONTENT)
+def reset_lock_wait_stats():
+    lock_wait_stats.reset()
+
+
+@router.get("/db-pool")
+def get_db_pool_stats():
+    """
+    Connection pool state and counters per engine: checked-out connections, overflow,
+    checkout wait histogram, timeouts and connection churn.
+    """
+    return pool_metrics.stats()
+
+
+@router.delete("/db-pool", status_code=status.HTTP_204_NO_CONTENT)
+def reset_db_pool_stats():
+    pool_metrics.reset()
+
+
+@router.get("/sql-requests")
+def get_sql_request_stats():
+    """
+    SQL statements and database time per request, by route; routes with the most statements first.
+    """
+    return endpoint_sql_stats.stats()
+
+
+@router.delete("/sql-requests", status_code=status.HTTP_204_NO_CONTENT)
+def reset_sql_request_stats():
+    endpoint_sql_stats.reset()
+
+
+@router.get("/slow-queries")
+def get_slow_queries(explain: bool = True):
+    """
+    Statements slower than SLOW_QUERY_THRESHOLD_MS by fingerprint, most total time first,
+    with count, p50/p99 and (explain=true) the query plan of the worst SLOW_QUERY_EXPLAIN_TOP
+    and the tables they read in full.
+    """
+    if explain:
+        slow_query_log.explain_worst(engine)
+    return slow_query_log.stats()
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+def reset_slow_queries():
+    slow_query_log.reset()
+
+
+@router.delete("/idempotency-keys")
+def purge_idempotency_keys(db: Session = Depends(get_db)):
+    """
+    Delete stored Idempotency-Key responses older than IDEMPOTENCY_TTL_HOURS.
+    """
+    cutoff = utc_now() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    return {"deleted": purge_expired_idempotency_keys(db, cutoff)}
@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.config.database import get_db
+from app.config.database import get_db, unit_of_work
 from app.schemas.payment import PaymentCreate, PaymentRead
 from app.crud.payment import create_payment, get_payment_by_booking_id
 from app.dependencies.auth import get_current_user  
 from app.models.user import User
 from app.crud.booking import get_booking_by_id
+from app.services.idempotency import run_idempotent
 
 router = APIRouter(
     prefix="/payments",
@@ -17,26 +19,35 @@ router = APIRouter(
 def create_new_payment(
     payment_in: PaymentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)  
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
 ):
     """
     Create a payment for a booking.
     Confirms the booking on success. Duplicate payments are prevented.
     Only the user who made the booking can pay for it.
+    Retries sent with the same Idempotency-Key get the first response back.
     """
-    # Check booking ownership
-    booking = get_booking_by_id(db, payment_in.booking_id)
-    if not booking or booking.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to pay for this booking.")
+    def handler():
+        with unit_of_work(db):
+            # Check booking ownership
+            booking = get_booking_by_id(db, payment_in.booking_id)
+            if not booking or booking.user_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Not authorized to pay for this booking.")
 
-    # Create the payment
-    payment = create_payment(db, payment_in)
-    if not payment:
-        raise HTTPException(
-            status_code=400,
-            detail="Payment could not be processed. Booking may not exist or has already been paid."
-        )
-    return payment
+            # Create the payment
+            payment = create_payment(db, payment_in)
+            if not payment:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Payment could not be processed. Booking may not exist, has already been paid, or is no longer pending."
+                )
+        return payment
+
+    return run_idempotent(
+        idempotency_key, current_user.id, "POST /payments/", payment_in, db,
+        handler, PaymentRead, status.HTTP_201_CREATED
+    )
 
 
 @router.get("/by-booking/{booking_id}", response_model=PaymentRead)
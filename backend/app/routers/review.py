@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.config.database import get_db
+from app.config.database import get_async_read_db, get_db, get_read_db
 from app.schemas.review import ReviewCreate, ReviewRead, ReviewWithRelations
 from app.crud.review import (
     create_review, get_review_by_id, get_reviews_by_user,
-    get_reviews_by_booking, get_reviews_for_hotel, delete_review
+    get_reviews_by_booking, get_reviews_for_hotel_async, delete_review
 )
 from app.dependencies.auth import get_current_user
 from app.models.user import User
@@ -45,23 +46,23 @@ def get_my_reviews(
 
 
 @router.get("/booking/{booking_id}", response_model=List[ReviewWithRelations])
-def get_reviews_for_booking(booking_id: int, db: Session = Depends(get_db)):
+def get_reviews_for_booking(booking_id: int, db: Session = Depends(get_read_db)):
     """
     Get all reviews for a specific booking (usually 1).
     """
     return get_reviews_by_booking(db, booking_id)
 
 @router.get("/hotel/{hotel_id}", response_model=List[ReviewWithRelations])
-def get_reviews_for_hotel_endpoint(
+async def get_reviews_for_hotel_endpoint(
     hotel_id: int,
     min_rating: Optional[int] = None,  # None means "no filter"
     only_with_text: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """
     Get all reviews for a specific hotel with optional filters.
     """
-    return get_reviews_for_hotel(
+    return await get_reviews_for_hotel_async(
         db=db,
         hotel_id=hotel_id,
         min_rating=min_rating,
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
-from app.config.database import get_db
+from app.config.database import get_db, get_read_db
 from app.crud import room as crud_room
 from app.models.room import Room
 from app.schemas.room import RoomCreate, RoomRead, RoomUpdate
@@ -23,7 +23,7 @@ def create_room(
 
 
 @router.get("/{room_id}")
-def get_room_with_hotel(room_id: int, db: Session = Depends(get_db)):
+def get_room_with_hotel(room_id: int, db: Session = Depends(get_read_db)):
     room = crud_room.get_room_by_id(db, room_id)
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -74,13 +74,13 @@ def delete_room(room_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/hotel/{hotel_id}", response_model=List[RoomRead])
-def get_rooms_by_hotel(hotel_id: int, db: Session = Depends(get_db)):
+def get_rooms_by_hotel(hotel_id: int, db: Session = Depends(get_read_db)):
     return crud_room.get_rooms_by_hotel_id(db, hotel_id)
 
 
 @router.get("/search/", response_model=List[RoomRead])
 def filter_rooms(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     hotel_id: Optional[int] = None,
     room_type: Optional[str] = None,
     min_price: Optional[float] = None,
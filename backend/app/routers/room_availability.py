@@ -4,8 +4,9 @@ from typing import List, Optional
 from datetime import date
 
 from app.config.database import get_db
-from app.schemas.room_availability import RoomAvailabilityCreate, RoomAvailabilityRead
+from app.schemas.room_availability import BulkAvailabilityCheck, RoomAvailabilityCreate, RoomAvailabilityRead
 from app.crud import room_availability as crud
+from app.services.availability_check import check_availability_bulk
 
 router = APIRouter(
     prefix="/availability",
@@ -43,6 +44,22 @@ def check_room_availability(
     return is_available
 
 
+@router.post("/check-bulk", response_model=List[bool])
+def check_room_availability_bulk(
+    request: BulkAvailabilityCheck,
+    db: Session = Depends(get_db)
+):
+    """
+    Check many (room_id, check_in, check_out) ranges at once.
+    Returns one boolean per check, in the order they were sent.
+    """
+    for i, check in enumerate(request.checks):
+        if check.check_out <= check.check_in:
+            raise HTTPException(status_code=400, detail=f"checks[{i}]: check_out must be after check_in")
+
+    return check_availability_bulk(db, [(check.room_id, check.check_in, check.check_out) for check in request.checks])
+
+
 @router.get("/unavailable", response_model=List[RoomAvailabilityRead])
 def get_unavailable_dates(
     room_id: int,
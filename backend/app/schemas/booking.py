@@ -1,6 +1,6 @@
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
-from typing import Optional, Annotated, TYPE_CHECKING
+from typing import List, Optional, Annotated, TYPE_CHECKING
 
 from pydantic import BaseModel, Field, StringConstraints
 from app.schemas.user import UserRead
@@ -29,8 +29,17 @@ class BookingBase(BaseModel):
 class BookingCreate(BookingBase):
     room_id: int
 
+MAX_GROUP_ROOMS = 10
+
+class GroupBookingCreate(BookingBase):
+    """
+    Several rooms for the same dates, booked together: all of them or none.
+    """
+    room_ids: List[int] = Field(..., min_length=1, max_length=MAX_GROUP_ROOMS)
+
 class BookingRead(BookingBase):
     id: int
+    hold_expires_at: Optional[datetime] = None  # UTC deadline for paying a pending booking
 
     class Config:
         orm_mode = True
@@ -0,0 +1,22 @@
+from datetime import date
+from typing import List, Tuple
+from pydantic import BaseModel
+
+
+class RoomCalendar(BaseModel):
+    room_id: int
+    name: str
+    room_type: str
+    price_per_night: float
+    availability: str  # One character per day of the month: "1" available, "0" booked/blocked
+    prices: List[Tuple[float, int]]  # Effective nightly price as runs of [price, days], covering the month in order
+
+class HotelCalendar(BaseModel):
+    """
+    Per-day availability and price of every room of a hotel for one month.
+    """
+    hotel_id: int
+    month: str  # "YYYY-MM"
+    start_date: date
+    days: int
+    rooms: List[RoomCalendar]
@@ -31,6 +31,7 @@ class HotelRead(BaseModel):
     stars: Optional[int] = None
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    distance_km: Optional[float] = None  # Set by radius search only
 
     class Config:
         orm_mode = True
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 # Base Schema
@@ -22,3 +22,14 @@ class RoomAvailabilityRead(BaseModel):
 
     class Config:
         orm_mode = True
+
+# Bulk check Schemas
+MAX_BULK_CHECKS = 5000
+
+class AvailabilityCheck(BaseModel):
+    room_id: int
+    check_in: date  # inclusive
+    check_out: date  # exclusive
+
+class BulkAvailabilityCheck(BaseModel):
+    checks: List[AvailabilityCheck] = Field(..., min_length=1, max_length=MAX_BULK_CHECKS)
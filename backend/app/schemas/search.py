@@ -1,5 +1,5 @@
 from datetime import date
-from typing import List, Optional, Literal
+from typing import Dict, List, Optional, Literal
 from pydantic import BaseModel, HttpUrl
 from enum import Enum
 
@@ -43,3 +43,27 @@ class HotelSearchResult(BaseModel):
     # New fields for sorting/filtering
     review_count: int = 0
     average_rating: Optional[float] = None
+
+
+class PriceBucketFacet(BaseModel):
+    min_price: float
+    max_price: Optional[float]  # None for the open-ended top bucket
+    count: int
+
+class SearchFacets(BaseModel):
+    """
+    Hotel counts over the whole result set (not just the returned page).
+    """
+    total: int = 0
+    stars: Dict[int, int] = {}  # star level -> hotels (unrated hotels are not counted)
+    price_buckets: List[PriceBucketFacet] = []  # by lowest available price per night
+    amenities: Dict[str, int] = {}  # amenity -> hotels with at least one matching free room
+    rating: Dict[str, int] = {}  # "4.5+" -> hotels with average rating >= 4.5
+
+class HotelSearchResponse(BaseModel):
+    """
+    Search response used when facets are requested.
+    """
+    results: List[HotelSearchResult]
+    facets: Optional[SearchFacets] = None
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional
+from typing import Dict, List, Optional
 from enum import Enum
 
 
@@ -62,5 +62,10 @@ class HotelDetailResponse(BaseModel):
     rooms: List[RoomDetail]
     reviews: List[ReviewDetail]
 
+    # From hotel_rating_stats
+    review_count: int = 0
+    average_rating: Optional[float] = None
+    rating_histogram: Dict[int, int] = Field(default_factory=dict)  # stars -> number of reviews
+
     class Config:
         orm_mode = True
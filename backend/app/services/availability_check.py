@@ -0,0 +1,27 @@
+from datetime import date
+from typing import List, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.crud.room_availability import are_rooms_available
+from app.services.availability_index import availability_index
+
+
+def check_availability_bulk(db: Session, checks: Sequence[Tuple[int, date, date]]) -> List[bool]:
+    """
+    Answer (room_id, check_in, check_out) checks in input order.
+    Checks inside the in-memory index horizon are answered from memory in one pass;
+    the rest go to the database together, with one range query.
+    """
+    results = [None] * len(checks)
+    if settings.AVAILABILITY_INDEX_ENABLED and availability_index.is_loaded:
+        availability_index.ensure_current(db)
+        results = availability_index.check_ranges(checks)
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        answers = are_rooms_available(db, [checks[i] for i in missing])
+        for i, answer in zip(missing, answers):
+            results[i] = answer
+    return results
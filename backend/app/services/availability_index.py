@@ -0,0 +1,207 @@
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.models.room import Room
+from app.models.room_availability import RoomAvailability
+from app.models.room_block import RoomBlock
+
+# Rolling window kept in memory (~18 months from today)
+HORIZON_DAYS = 548
+
+
+class AvailabilityIndex:
+    """
+    In-memory day bitmap of blocked nights per room.
+
+    Row i of the matrix belongs to one room, column j is `start + j days`.
+    A range check is a slice test and a batch of rooms is checked with one
+    vectorized `any()` over the matrix.
+
+    The index lives in the process that loaded it. It is kept in sync by
+    `app.services.inventory_events` after each commit that blocks or releases
+    nights, and reloaded every `refresh_seconds` (and when the day rolls over)
+    to pick up writes made by other processes: scripts, other workers, replicas.
+    Dates outside the horizon are never answered from memory.
+
+    The matrix can have more rows than rooms: rows for rooms first seen after a
+    load are allocated by doubling the matrix, not by copying it once per room.
+    """
+
+    def __init__(self, horizon_days: int = HORIZON_DAYS, refresh_seconds: float = 60.0):
+        self.horizon_days = horizon_days
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._start: Optional[date] = None
+        self._loaded_at: Optional[float] = None
+        self._rows: Dict[int, int] = {}
+        self._blocked = np.zeros((0, horizon_days), dtype=np.bool_)
+        self._reloading = threading.Lock()
+        # Changes applied while a load() reads the database, replayed onto the new bitmap
+        self._changes_during_load: Optional[List[Tuple[int, date, date, bool]]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._start is not None
+
+    def load(self, db: Session) -> None:
+        """
+        (Re)build the bitmap from room_availability or room_blocks, per AVAILABILITY_STORAGE.
+        """
+        start = date.today()
+        end = start + timedelta(days=self.horizon_days)
+        with self._lock:
+            self._changes_during_load = []
+
+        room_ids = [room_id for (room_id,) in db.query(Room.id).order_by(Room.id).all()]
+        rows = {room_id: i for i, room_id in enumerate(room_ids)}
+        blocked = np.zeros((len(room_ids), self.horizon_days), dtype=np.bool_)
+
+        if settings.AVAILABILITY_STORAGE == "intervals":
+            blocks = db.query(RoomBlock.room_id, RoomBlock.start_date, RoomBlock.end_date).filter(
+                RoomBlock.start_date < end,
+                RoomBlock.end_date > start
+            ).all()
+            for room_id, block_start, block_end in blocks:
+                if room_id in rows:
+                    first = max((block_start - start).days, 0)
+                    last = min((block_end - start).days, self.horizon_days)
+                    blocked[rows[room_id], first:last] = True
+        else:
+            blocked_nights = db.query(RoomAvailability.room_id, RoomAvailability.date).filter(
+                RoomAvailability.date >= start,
+                RoomAvailability.date < end,
+                RoomAvailability.is_available == False
+            ).all()
+            known = [(rows[room_id], (day - start).days) for room_id, day in blocked_nights if room_id in rows]
+            if known:
+                row_idx, day_idx = np.array(known, dtype=np.int64).T
+                blocked[row_idx, day_idx] = True
+
+        with self._lock:
+            changes, self._changes_during_load = self._changes_during_load, None
+            self._rows = rows
+            self._blocked = blocked
+            self._start = start
+            self._loaded_at = time.monotonic()
+            # Commits made since the queries above may be missing from their results
+            for room_id, change_start, change_end, value in changes or ():
+                self._set_range(room_id, change_start, change_end, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._start = None
+            self._loaded_at = None
+            self._rows = {}
+            self._blocked = np.zeros((0, self.horizon_days), dtype=np.bool_)
+
+    def ensure_current(self, db: Session) -> None:
+        """
+        Reload when the day has rolled over, so the window keeps starting today,
+        or when the bitmap is older than `refresh_seconds`. One thread reloads;
+        the others keep answering from the current bitmap meanwhile.
+        """
+        if not self.is_loaded:
+            return
+        stale = self._start != date.today() or time.monotonic() - self._loaded_at > self.refresh_seconds
+        if stale and self._reloading.acquire(blocking=False):
+            try:
+                self.load(db)
+            finally:
+                self._reloading.release()
+
+    def covers(self, check_in: date, check_out: date) -> bool:
+        if not self.is_loaded or check_in >= check_out:
+            return False
+        offset = (check_in - self._start).days
+        return offset >= 0 and (check_out - self._start).days <= self.horizon_days
+
+    def is_room_available(self, room_id: int, check_in: date, check_out: date) -> Optional[bool]:
+        """
+        True/False when the range is inside the horizon, None when the caller must ask the database.
+        """
+        available = self.available_room_ids([room_id], check_in, check_out)
+        if available is None:
+            return None
+        return bool(available)
+
+    def available_room_ids(self, room_ids: Iterable[int], check_in: date, check_out: date) -> Optional[List[int]]:
+        """
+        Filter `room_ids` down to rooms with no blocked night in [check_in, check_out).
+        Order is preserved. Returns None if the range is outside the horizon.
+        """
+        with self._lock:
+            if not self.covers(check_in, check_out):
+                return None
+            room_ids = list(room_ids)
+            if not room_ids:
+                return []
+
+            first = (check_in - self._start).days
+            last = (check_out - self._start).days
+            rows = np.fromiter((self._rows.get(room_id, -1) for room_id in room_ids), dtype=np.int64, count=len(room_ids))
+
+            # Rooms the index has never seen have no blocked nights
+            free = rows < 0
+            known = ~free
+            free[known] = ~self._blocked[rows[known], first:last].any(axis=1)
+
+        return [room_id for room_id, is_free in zip(room_ids, free) if is_free]
+
+    def check_ranges(self, checks: Sequence[Tuple[int, date, date]]) -> List[Optional[bool]]:
+        """
+        Availability of many (room_id, check_in, check_out) tuples in one pass under one lock.
+        Each answer is True/False, or None when that range is outside the horizon.
+        """
+        with self._lock:
+            results: List[Optional[bool]] = []
+            for room_id, check_in, check_out in checks:
+                if not self.covers(check_in, check_out):
+                    results.append(None)
+                    continue
+                row = self._rows.get(room_id)
+                if row is None:
+                    results.append(True)
+                    continue
+                first = (check_in - self._start).days
+                last = (check_out - self._start).days
+                results.append(not self._blocked[row, first:last].any())
+        return results
+
+    def block(self, room_id: int, start: date, end: date) -> None:
+        self._set_range(room_id, start, end, True)
+
+    def release(self, room_id: int, start: date, end: date) -> None:
+        self._set_range(room_id, start, end, False)
+
+    def _set_range(self, room_id: int, start: date, end: date, value: bool) -> None:
+        with self._lock:
+            if self._changes_during_load is not None:
+                self._changes_during_load.append((room_id, start, end, value))
+            if not self.is_loaded:
+                return
+            first = max((start - self._start).days, 0)
+            last = min((end - self._start).days, self.horizon_days)
+            if first >= last:
+                return
+
+            row = self._rows.get(room_id)
+            if row is None:
+                if not value:
+                    return
+                row = len(self._rows)
+                if row == self._blocked.shape[0]:
+                    grown = np.zeros((max(2 * row, 64), self.horizon_days), dtype=np.bool_)
+                    grown[:row] = self._blocked[:row]
+                    self._blocked = grown
+                self._rows[room_id] = row
+
+            self._blocked[row, first:last] = value
+
+
+availability_index = AvailabilityIndex(refresh_seconds=settings.AVAILABILITY_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config.database import SessionLocal, engine
+from app.config.settings import settings
+from app.crud.booking import complete_and_cleanup_bookings
+from app.services.periodic_job import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "booking_cleanup"
+
+
+class BookingCleanupJob(PeriodicJob):
+    """
+    Background thread that runs complete_and_cleanup_bookings() every `interval_seconds`.
+
+    Only one run happens at a time across all processes: a run first takes a named
+    database lock (MySQL GET_LOCK / PostgreSQL advisory lock) on a dedicated connection
+    and is skipped if another process holds it. Other databases fall back to a
+    process-local lock.
+    """
+
+    thread_name = "booking-cleanup"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        lock_engine: Engine,
+        interval_seconds: float = 3600.0,
+        chunk_size: int = 1000,
+    ):
+        super().__init__(interval_seconds)
+        self.session_factory = session_factory
+        self.lock_engine = lock_engine
+        self.chunk_size = chunk_size
+        self._local_lock = threading.Lock()
+
+        self.skipped = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.last_result: Optional[dict] = None
+
+    def run_once(self) -> Optional[dict]:
+        """
+        Run one cleanup and return its report, or None if another run holds the lock.
+        """
+        with self._single_runner() as acquired:
+            if not acquired:
+                with self._lock:
+                    self.skipped += 1
+                return None
+
+            started = time.perf_counter()
+            db = self.session_factory()
+            try:
+                result = complete_and_cleanup_bookings(db, chunk_size=self.chunk_size)
+            finally:
+                db.close()
+
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        with self._lock:
+            self.runs += 1
+            self.completed += result["completed_bookings"]
+            self.cancelled += result["cancelled_pending_bookings"]
+            self.last_run_at = time.time()
+            self.last_result = result
+        logger.info(
+            "Booking cleanup: %d completed, %d pending cancelled in %.1f ms",
+            result["completed_bookings"], result["cancelled_pending_bookings"], result["duration_ms"]
+        )
+        return result
+
+    def _job_stats(self) -> dict:
+        return {
+            "chunk_size": self.chunk_size,
+            "skipped": self.skipped,
+            "completed_bookings": self.completed,
+            "cancelled_pending_bookings": self.cancelled,
+            "last_run": self.last_result,
+        }
+
+    @contextmanager
+    def _single_runner(self):
+        if not self._local_lock.acquire(blocking=False):
+            yield False
+            return
+        try:
+            dialect = self.lock_engine.dialect.name
+            if dialect not in ("mysql", "postgresql"):
+                yield True
+                return
+
+            # Session-level locks belong to the connection: take and release them on one
+            # connection kept aside, not on the pooled ones the job commits through
+            with self.lock_engine.connect() as conn:
+                if dialect == "mysql":
+                    acquired = conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": LOCK_NAME}).scalar() == 1
+                else:
+                    acquired = conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": LOCK_NAME}).scalar()
+                try:
+                    yield acquired
+                finally:
+                    if acquired:
+                        if dialect == "mysql":
+                            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+                        else:
+                            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": LOCK_NAME})
+        finally:
+            self._local_lock.release()
+
+
+booking_cleanup_job = BookingCleanupJob(
+    SessionLocal,
+    engine,
+    interval_seconds=settings.BOOKING_CLEANUP_INTERVAL_SECONDS,
+    chunk_size=settings.BOOKING_CLEANUP_CHUNK_SIZE,
+)
@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from app.config.settings import settings
+from app.services.ttl_cache import TtlLruCache
+
+CalendarKey = Tuple[int, int, int]  # (hotel_id, year, month)
+
+
+def months_between(start: date, end: date):
+    """
+    (year, month) of every month that contains a night in [start, end).
+    """
+    year, month = start.year, start.month
+    last = end - timedelta(days=1)
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+class CalendarCache(TtlLruCache):
+    """
+    LRU + TTL cache of hotel month calendars, keyed by CalendarKey.
+
+    A committed inventory change drops the months it touches of that hotel only;
+    room edits (price, new or deleted room) drop every month of the hotel. The TTL
+    bounds how long changes made by other processes can go unnoticed.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300.0, lag_seconds: float = 0.0):
+        super().__init__(max_entries, ttl_seconds, lag_seconds)
+
+    def invalidate_range(self, hotel_id: Optional[int], start: date, end: date) -> None:
+        self.invalidate_keys((hotel_id, year, month) for year, month in months_between(start, end))
+
+    def invalidate_hotel(self, hotel_id: int) -> None:
+        self.invalidate_where(lambda key, _: key[0] == hotel_id)
+
+
+calendar_cache = CalendarCache(
+    max_entries=settings.CALENDAR_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CALENDAR_CACHE_TTL_SECONDS,
+    # Reads from replicas lag behind invalidations by up to the read-your-writes window
+    lag_seconds=settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_REPLICA_URLS else 0.0,
+)
@@ -0,0 +1,96 @@
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config.settings import settings
+from app.models.city import City
+from app.models.country import Country
+
+
+def normalize_name(name: str) -> str:
+    """
+    Casefold, strip accents and collapse whitespace: " São  Paulo " -> "sao paulo".
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.split())
+
+
+class DestinationResolver:
+    """
+    In-process dictionary of country and city names for resolving search destinations.
+
+    Accepts "City, Country", "Country" and, when the name is unique across countries,
+    "City". Names are compared after normalize_name(). The dictionary is loaded lazily,
+    dropped by app.crud.city / app.crud.country after a create or delete so the next
+    lookup reloads it, and reloaded every `refresh_seconds` to pick up changes made by
+    other processes. Between reloads, resolve() runs no query.
+    """
+
+    def __init__(self, refresh_seconds: float = 300.0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._countries: Dict[str, int] = {}
+        self._cities: Dict[Tuple[int, str], int] = {}
+        self._cities_by_name: Dict[str, Set[Tuple[int, int]]] = {}
+
+    def load(self, db: Session) -> None:
+        countries: Dict[str, int] = {}
+        for country_id, name in db.query(Country.id, Country.name).order_by(Country.id).all():
+            countries.setdefault(normalize_name(name), country_id)
+
+        cities: Dict[Tuple[int, str], int] = {}
+        cities_by_name: Dict[str, Set[Tuple[int, int]]] = {}
+        for city_id, name, country_id in db.query(City.id, City.name, City.country_id).order_by(City.id).all():
+            key = normalize_name(name)
+            if (country_id, key) in cities:
+                continue
+            cities[(country_id, key)] = city_id
+            cities_by_name.setdefault(key, set()).add((country_id, city_id))
+
+        with self._lock:
+            self._countries = countries
+            self._cities = cities
+            self._cities_by_name = cities_by_name
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def resolve(self, db: Session, destination: str) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Parse a destination into (country_id, city_id).
+        An unknown city falls back to the whole country; an unknown country,
+        or a city-only name shared by several countries, returns None.
+        """
+        self._ensure_loaded(db)
+
+        parts = [normalize_name(part) for part in destination.split(",")]
+        with self._lock:
+            if len(parts) >= 2:
+                country_id = self._countries.get(parts[1])
+                if country_id is None:
+                    return None
+                return country_id, self._cities.get((country_id, parts[0]))
+
+            country_id = self._countries.get(parts[0])
+            if country_id is not None:
+                return country_id, None
+
+            matches = self._cities_by_name.get(parts[0], set())
+            if len(matches) == 1:
+                return next(iter(matches))
+            return None
+
+    def _ensure_loaded(self, db: Session) -> None:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.refresh_seconds:
+            self.load(db)
+
+
+destination_resolver = DestinationResolver(refresh_seconds=settings.DESTINATION_REFRESH_SECONDS)
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from math import asin, cos, degrees, radians, sin, sqrt
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@dataclass
+class BoundingBox:
+    """
+    Latitude/longitude rectangle enclosing a circle on the sphere.
+    `lon_ranges` has two entries when the box crosses the antimeridian.
+    An empty list means every longitude (the circle contains a pole).
+    """
+    min_lat: float
+    max_lat: float
+    lon_ranges: List[Tuple[float, float]]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance in km. Numerically stable for short distances,
+    unlike the spherical law of cosines.
+    """
+    d_lat = radians(lat2 - lat1)
+    d_lon = radians(lon2 - lon1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> BoundingBox:
+    """
+    Smallest lat/lon box that contains every point within `radius_km` of (lat, lon).
+    Used as an index-friendly prefilter; survivors still need an exact distance check.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    min_lat = lat - degrees(angular)
+    max_lat = lat + degrees(angular)
+
+    if min_lat <= -90 or max_lat >= 90:
+        return BoundingBox(max(min_lat, -90.0), min(max_lat, 90.0), [])
+
+    # Widest longitude span of the circle (reached north/south of the center)
+    d_lon = degrees(asin(min(1.0, sin(angular) / cos(radians(lat)))))
+    min_lon = lon - d_lon
+    max_lon = lon + d_lon
+
+    if min_lon < -180:
+        lon_ranges = [(min_lon + 360, 180.0), (-180.0, max_lon)]
+    elif max_lon > 180:
+        lon_ranges = [(min_lon, 180.0), (-180.0, max_lon - 360)]
+    else:
+        lon_ranges = [(min_lon, max_lon)]
+    return BoundingBox(min_lat, max_lat, lon_ranges)
@@ -0,0 +1,57 @@
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config.database import SessionLocal
+from app.config.settings import settings
+from app.crud.booking import release_expired_holds
+from app.services.periodic_job import PeriodicJob
+
+
+class HoldSweeper(PeriodicJob):
+    """
+    Background thread that releases expired booking holds every `interval_seconds`,
+    so abandoned checkouts stop keeping nights off the market.
+
+    Each sweep runs release_expired_holds() in batches until nothing is left.
+    Several processes may run a sweeper: locked rows are skipped, not waited for.
+    """
+
+    thread_name = "hold-sweeper"
+
+    def __init__(self, session_factory: Callable[[], Session], interval_seconds: float = 30.0, batch_size: int = 500):
+        super().__init__(interval_seconds)
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+
+        self.released = 0
+        self.last_duration_ms: Optional[float] = None
+
+    def run_once(self) -> int:
+        started = time.perf_counter()
+        released = 0
+        db = self.session_factory()
+        try:
+            while True:
+                count = release_expired_holds(db, limit=self.batch_size)
+                released += count
+                if count < self.batch_size:
+                    break
+        finally:
+            db.close()
+        with self._lock:
+            self.runs += 1
+            self.released += released
+            self.last_run_at = time.time()
+            self.last_duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        return released
+
+    def _job_stats(self) -> dict:
+        return {
+            "released": self.released,
+            "last_duration_ms": self.last_duration_ms,
+        }
+
+
+hold_sweeper = HoldSweeper(SessionLocal, interval_seconds=settings.HOLD_SWEEP_INTERVAL_SECONDS)
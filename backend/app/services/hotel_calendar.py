@@ -0,0 +1,78 @@
+import calendar
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config.database import is_replica_session
+from app.config.settings import settings
+from app.models.hotel import Hotel
+from app.models.room import Room
+from app.schemas.calendar import HotelCalendar, RoomCalendar
+from app.crud.room_availability import get_hotel_nights
+from app.services.calendar_cache import calendar_cache
+
+
+def run_lengths(values: List[float]) -> List[Tuple[float, int]]:
+    """
+    [80, 80, 95, 80] -> [(80, 2), (95, 1), (80, 1)]
+    """
+    runs: List[Tuple[float, int]] = []
+    for value in values:
+        if runs and runs[-1][0] == value:
+            runs[-1] = (value, runs[-1][1] + 1)
+        else:
+            runs.append((value, 1))
+    return runs
+
+
+def get_hotel_calendar(db: Session, hotel_id: int, year: int, month: int) -> Optional[HotelCalendar]:
+    """
+    Month calendar of a hotel: per room, which days are free and what a night costs
+    (price_override when set, otherwise price_per_night). Returns None for an unknown hotel.
+    Calendars are cached per (hotel, month) until a booking or room edit touches them.
+    """
+    key = (hotel_id, year, month)
+    if settings.CALENDAR_CACHE_ENABLED:
+        cached = calendar_cache.get(key)
+        if cached is not None:
+            return cached
+        generation = calendar_cache.generation()
+
+    # 1. Rooms of the hotel (an empty list still needs the hotel to exist)
+    rooms = db.query(Room.id, Room.name, Room.room_type, Room.price_per_night).filter(
+        Room.hotel_id == hotel_id
+    ).order_by(Room.id.asc()).all()
+    if not rooms and not db.query(Hotel.id).filter(Hotel.id == hotel_id).first():
+        return None
+
+    # 2. Blocked nights and price overrides of the whole month in one range query
+    start = date(year, month, 1)
+    days = calendar.monthrange(year, month)[1]
+    month_days = [start + timedelta(days=i) for i in range(days)]
+    blocked, overrides = get_hotel_nights(db, hotel_id, start, start + timedelta(days=days))
+
+    # 3. Pack each room: availability as a bitstring, prices as run lengths
+    room_calendars = []
+    for room_id, name, room_type, price_per_night in rooms:
+        room_blocked = blocked.get(room_id, set())
+        room_overrides = overrides.get(room_id, {})
+        room_calendars.append(RoomCalendar(
+            room_id=room_id,
+            name=name,
+            room_type=room_type,
+            price_per_night=price_per_night,
+            availability="".join("0" if day in room_blocked else "1" for day in month_days),
+            prices=run_lengths([room_overrides.get(day, price_per_night) for day in month_days]),
+        ))
+
+    result = HotelCalendar(
+        hotel_id=hotel_id,
+        month=f"{year:04d}-{month:02d}",
+        start_date=start,
+        days=days,
+        rooms=room_calendars,
+    )
+    if settings.CALENDAR_CACHE_ENABLED:
+        calendar_cache.put(key, result, generation, from_replica=is_replica_session(db))
+    return result
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.config.database import SessionLocal, unit_of_work
+from app.config.settings import settings
+from app.crud.booking import utc_now
+from app.crud.idempotency_key import (
+    get_idempotency_key,
+    claim_idempotency_key,
+    take_over_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key,
+)
+from app.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 0.05
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(payload: BaseModel) -> str:
+    body = json.dumps(payload.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def run_idempotent(
+    key: Optional[str],
+    user_id: int,
+    endpoint: str,
+    payload: BaseModel,
+    db: Session,
+    handler: Callable[[], Any],
+    response_model: Any,
+    status_code: int,
+) -> Any:
+    """
+    Run `handler` once per (user, endpoint, Idempotency-Key) and replay its response to retries.
+
+    The first request claims the key with a committed in-flight row, then runs the handler
+    in a unit_of_work() on the request session `db` and stores the serialized response in
+    that same transaction: the key is answered exactly when the booking or payment is
+    committed, and a crash before the commit leaves neither. 4xx errors are stored too.
+    Retries are answered from the row without touching bookings or availability; a retry
+    arriving while the first request is still running waits for it. Failures that roll
+    the request back drop the claim so a retry runs again. Without a key the handler simply runs.
+    """
+    if not key:
+        return handler()
+
+    request_hash = request_fingerprint(payload)
+    claim_db = SessionLocal()
+    try:
+        # 1. Claim the key, or find the stored response of an earlier request
+        record, replay = _claim_or_wait(claim_db, user_id, endpoint, key, request_hash)
+        if replay is not None:
+            return replay
+
+        # 2. Run the request and store its response in its own transaction
+        try:
+            with unit_of_work(db):
+                result = handler()
+                content = jsonable_encoder(_adapter(response_model).validate_python(result, from_attributes=True))
+                if not complete_idempotency_key(db, record, status_code, json.dumps(content)):
+                    raise HTTPException(status_code=409, detail="A retry with this Idempotency-Key took over the request")
+        except HTTPException as exc:
+            # The request was rolled back; a claim that was taken over is left to its new owner
+            if exc.status_code >= 500:
+                _release(claim_db, record)
+            else:
+                _complete(claim_db, record, exc.status_code, {"detail": exc.detail})
+            raise
+        except Exception:
+            _release(claim_db, record)
+            raise
+
+        return JSONResponse(status_code=status_code, content=content)
+    finally:
+        claim_db.close()
+
+
+def _claim_or_wait(db: Session, user_id: int, endpoint: str, key: str, request_hash: str) -> Tuple[Optional[IdempotencyKey], Optional[JSONResponse]]:
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        # Whole seconds, as DATETIME columns store them: created_at identifies the claim
+        now = utc_now().replace(microsecond=0)
+        record = claim_idempotency_key(db, user_id, endpoint, key, request_hash, now)
+        if record:
+            return record, None
+
+        existing = get_idempotency_key(db, user_id, endpoint, key)
+        if existing is None:
+            continue  # Released by a failed request in the meantime
+
+        # Keys past their TTL are treated as never seen
+        if existing.created_at <= now - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS):
+            if take_over_idempotency_key(db, existing, request_hash, now):
+                return existing, None
+            continue
+
+        if existing.request_hash != request_hash:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+
+        if existing.status_code is not None:
+            return None, JSONResponse(
+                status_code=existing.status_code,
+                content=json.loads(existing.response_body),
+                headers={REPLAY_HEADER: "true"}
+            )
+
+        # The first request is still running: wait for it, unless it was abandoned
+        if existing.created_at <= now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS):
+            if take_over_idempotency_key(db, existing, request_hash, now):
+                return existing, None
+            continue
+        if time.monotonic() >= deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still being processed")
+        db.rollback()  # End the read transaction so the next poll sees new commits
+        time.sleep(POLL_INTERVAL_SECONDS)
+
+
+def _complete(db: Session, record: IdempotencyKey, status_code: int, content: Any) -> None:
+    # Only for errors, after the request rolled back: if this fails, a retry simply runs again
+    try:
+        complete_idempotency_key(db, record, status_code, json.dumps(content))
+    except Exception:
+        db.rollback()
+        logger.exception("Storing the response of idempotency key %s failed", record.id)
+
+
+def _release(db: Session, record: IdempotencyKey) -> None:
+    try:
+        release_idempotency_key(db, record)
+    except Exception:
+        db.rollback()
+        logger.exception("Releasing idempotency key %s failed", record.id)
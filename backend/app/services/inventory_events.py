@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.room import Room
+from app.models.hotel import Hotel
+from app.models.city import City
+from app.services.availability_index import availability_index
+from app.services.calendar_cache import calendar_cache
+from app.services.search_cache import search_cache
+
+# Changes are queued on the session and only applied once the transaction commits,
+# so a rollback never leaks into the in-memory structures.
+PENDING_KEY = "pending_inventory_changes"
+
+
+@dataclass
+class InventoryChange:
+    kind: str  # "blocked" or "released"
+    room_id: int
+    start: date
+    end: date
+    hotel_id: Optional[int] = None
+    city_id: Optional[int] = None
+    country_id: Optional[int] = None
+
+
+def record_nights_blocked(db: Session, room_id: int, start: date, end: date) -> None:
+    """
+    Note that nights [start, end) of a room became unavailable in this transaction.
+    """
+    db.info.setdefault(PENDING_KEY, []).append(InventoryChange("blocked", room_id, start, end))
+
+
+def record_nights_released(db: Session, room_id: int, start: date, end: date) -> None:
+    """
+    Note that nights [start, end) of a room became available again in this transaction.
+    """
+    db.info.setdefault(PENDING_KEY, []).append(InventoryChange("released", room_id, start, end))
+
+
+def apply_inventory_changes(changes: List[InventoryChange]) -> None:
+    for change in changes:
+        if change.kind == "blocked":
+            availability_index.block(change.room_id, change.start, change.end)
+            search_cache.invalidate_blocked(
+                change.hotel_id, change.city_id, change.country_id, change.start, change.end
+            )
+        else:
+            availability_index.release(change.room_id, change.start, change.end)
+            search_cache.invalidate_released(
+                change.hotel_id, change.city_id, change.country_id, change.start, change.end
+            )
+        calendar_cache.invalidate_range(change.hotel_id, change.start, change.end)
+
+
+@event.listens_for(Session, "before_commit")
+def _resolve_locations(session: Session) -> None:
+    """
+    Attach hotel/city/country to pending changes with one query, while SQL can still be emitted.
+    """
+    changes = session.info.get(PENDING_KEY)
+    if not changes:
+        return
+
+    room_ids = {change.room_id for change in changes if change.hotel_id is None}
+    if not room_ids:
+        return
+
+    locations = {
+        room_id: (hotel_id, city_id, country_id)
+        for room_id, hotel_id, city_id, country_id in (
+            session.query(Room.id, Room.hotel_id, Hotel.city_id, City.country_id)
+            .outerjoin(Hotel, Room.hotel_id == Hotel.id)
+            .outerjoin(City, Hotel.city_id == City.id)
+            .filter(Room.id.in_(room_ids))
+            .all()
+        )
+    }
+    for change in changes:
+        if change.room_id in locations:
+            change.hotel_id, change.city_id, change.country_id = locations[change.room_id]
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_after_commit(session: Session) -> None:
+    changes = session.info.pop(PENDING_KEY, None)
+    if changes:
+        apply_inventory_changes(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
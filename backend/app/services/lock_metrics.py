@@ -0,0 +1,62 @@
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+
+from app.services.percentiles import percentile
+
+
+class LockWaitStats:
+    """
+    How long the booking path waits for row locks (SELECT ... FOR UPDATE), per lock site.
+    Keeps running counters plus the most recent `window` samples for percentiles.
+    """
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._totals: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, site: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(site, time.perf_counter() - started)
+
+    def record(self, site: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(site, deque(maxlen=self.window)).append(seconds)
+            self._counts[site] = self._counts.get(site, 0) + 1
+            self._totals[site] = self._totals.get(site, 0.0) + seconds
+            self._max[site] = max(self._max.get(site, 0.0), seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+            self._max.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            result = {}
+            for site, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[site] = {
+                    "count": self._counts[site],
+                    "total_ms": round(self._totals[site] * 1000, 3),
+                    "max_ms": round(self._max[site] * 1000, 3),
+                    "p50_ms": round(statistics.median(ordered) * 1000, 3),
+                    "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                }
+            return result
+
+
+lock_wait_stats = LockWaitStats()
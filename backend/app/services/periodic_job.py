@@ -0,0 +1,69 @@
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """
+    Background thread that calls run_once() every `interval_seconds` until stop().
+
+    Subclasses implement run_once() and update their counters with `self._lock` held:
+    the counters are written from the job thread (or a manual run) and read by
+    stats() from request threads.
+    """
+
+    thread_name = "periodic-job"
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.runs = 0
+        self.errors = 0
+        self.last_run_at: Optional[float] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def run_once(self):
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": bool(self._thread and self._thread.is_alive()),
+                "interval_seconds": self.interval_seconds,
+                "runs": self.runs,
+                "errors": self.errors,
+                "last_run_at": self.last_run_at,
+                **self._job_stats(),
+            }
+
+    def _job_stats(self) -> dict:
+        """
+        Counters specific to the job; called with `self._lock` held.
+        """
+        return {}
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                logger.exception("%s run failed", self.thread_name)
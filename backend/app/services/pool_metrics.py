@@ -0,0 +1,122 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket is open-ended
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class _EngineCounters:
+    def __init__(self):
+        self.checkouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets: List[int] = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+
+class PoolMetrics:
+    """
+    Connection pool counters per engine: checkout waits (histogram), timeouts and
+    connection churn (connections opened, closed and invalidated).
+    Pool state (size, checked out, overflow) is read live from the pools.
+
+    Waits are recorded by the Instrumented*QueuePool classes; the engines are
+    registered with attach() under their pool_logging_name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines: Dict[str, Engine] = {}
+        self._counters: Dict[str, _EngineCounters] = {}
+
+    def attach(self, engine: Engine) -> None:
+        name = engine.pool.logging_name
+        with self._lock:
+            self._engines[name] = engine
+            self._counters.setdefault(name, _EngineCounters())
+
+        # Engine-level pool listeners survive engine.dispose() recreating the pool
+        event.listen(engine, "checkout", lambda *args: self._count(name, "checkouts"))
+        event.listen(engine, "connect", lambda *args: self._count(name, "connects"))
+        event.listen(engine, "close", lambda *args: self._count(name, "closes"))
+        event.listen(engine, "invalidate", lambda *args: self._count(name, "invalidations"))
+
+    def record_wait(self, name: str, seconds: float, timed_out: bool = False) -> None:
+        counters = self._counters.get(name)
+        if counters is None:
+            return
+        with self._lock:
+            counters.wait_total += seconds
+            counters.wait_max = max(counters.wait_max, seconds)
+            counters.wait_buckets[bisect_left(WAIT_BUCKETS_MS, seconds * 1000)] += 1
+            if timed_out:
+                counters.timeouts += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = _EngineCounters()
+
+    def stats(self) -> dict:
+        with self._lock:
+            result = {}
+            for name, engine in self._engines.items():
+                pool = engine.pool
+                counters = self._counters[name]
+                waits = sum(counters.wait_buckets)
+                labels = [f"<={bound}ms" for bound in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+                result[name] = {
+                    "pool_size": pool.size() if hasattr(pool, "size") else None,
+                    "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                    "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                    "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                    "checkouts": counters.checkouts,
+                    "connections_opened": counters.connects,
+                    "connections_closed": counters.closes,
+                    "invalidations": counters.invalidations,
+                    "timeouts": counters.timeouts,
+                    "wait_avg_ms": round(counters.wait_total / waits * 1000, 3) if waits else None,
+                    "wait_max_ms": round(counters.wait_max * 1000, 3),
+                    "wait_histogram": dict(zip(labels, counters.wait_buckets)),
+                }
+            return result
+
+    def _count(self, name: str, field: str) -> None:
+        counters = self._counters[name]
+        with self._lock:
+            setattr(counters, field, getattr(counters, field) + 1)
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that reports how long each checkout waited for a connection to pool_metrics.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_wait(self.logging_name, time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.record_wait(self.logging_name, time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """
+    InstrumentedQueuePool for asyncio engines.
+    """
@@ -1,106 +1,529 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
 from math import ceil
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Float, and_, case, cast, func, or_
 from sqlalchemy.orm import Session
 from app.models.hotel import Hotel
-from app.models.review import Review
-from app.models.room import Room
-from app.models.booking import Booking
-from app.schemas.search import HotelSearchRequest, HotelSearchResult
-from app.crud.hotel import search_hotels
-from app.crud.room import get_rooms_by_hotel_and_guests
-from app.crud import country as crud_country
-from app.crud import city as crud_city
-from app.crud.room_availability import is_room_available_for_range
+from app.models.hotel_photo import HotelPhoto
+from app.models.city import City
+from app.models.country import Country
+from app.models.hotel_rating_stats import HotelRatingStats
+from app.models.room import AMENITY_BITS, Room
+from app.schemas.search import HotelSearchRequest, HotelSearchResult, PriceBucketFacet, SearchFacets
+from app.crud.room_availability import room_blocked_clause
+from app.crud.room import amenity_filter_clause
+from app.config.database import is_replica_session
+from app.config.settings import settings
+from app.services.availability_index import availability_index
+from app.services.destination_resolver import destination_resolver
+from app.services.search_cache import SearchScope, make_search_key, search_cache
+
+# Hotels per batch when streaming results
+STREAM_BATCH_SIZE = 50
+
+# Most room ids an availability index answer may bind into the search query
+INDEX_MAX_BOUND_IDS = 500
+
+# Facet buckets: lower bounds of the price buckets (per night) and rating thresholds
+PRICE_BUCKET_BOUNDS = (0, 50, 100, 150, 200, 300)
+RATING_THRESHOLDS = (3.0, 3.5, 4.0, 4.5)
+STAR_LEVELS = range(1, 6)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another sort order."""
+
+
+@dataclass
+class SearchPage:
+    results: List[HotelSearchResult] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    facets: Optional[SearchFacets] = None
 
 
 def perform_hotel_search(db: Session, search_in: HotelSearchRequest) -> List[HotelSearchResult]:
-    city_name = None
-    country_name = search_in.destination.strip()
+    """
+    Find hotels in the requested destination that have at least `rooms` free rooms
+    for the whole stay, in the requested sort order. Returns the full result list.
+    """
+    return search_hotels_page(db, search_in).results
 
-    if "," in country_name:
-        parts = [p.strip() for p in country_name.split(",")]
-        if len(parts) >= 2:
-            city_name = parts[0]
-            country_name = parts[1]
 
-    country = crud_country.get_country_by_name(db, country_name)
-    if not country:
-        return []
+def search_hotels_page(
+    db: Session,
+    search_in: HotelSearchRequest,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    facets: bool = False,
+) -> SearchPage:
+    """
+    One page of search results, starting after `cursor` (keyset pagination).
+    With `facets`, the first page also carries hotel counts per star level, price
+    bucket, amenity and rating over the whole result set, computed as window
+    aggregates of the same query that returns the page.
+
+    The destination is resolved in memory by the destination resolver; the search
+    itself is one aggregate query over the available-room set (sorted and limited in SQL),
+    one query for the available room ids and one for cover photos
+    (plus one candidate-room query when the in-memory availability index is used).
+    Repeated searches are served from the result cache until an overlapping
+    booking, cancellation or availability change can affect them.
+    """
+    after = _decode_cursor(cursor, search_in.sort_by) if cursor else None
+
+    cache_key = None
+    if settings.SEARCH_CACHE_ENABLED:
+        cache_key = (make_search_key(search_in), limit, cursor, facets)
+        cached = search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = search_cache.generation()
+
+    destination = destination_resolver.resolve(db, search_in.destination)
+    if destination is None:
+        return SearchPage(facets=_empty_facets() if facets and after is None else None)
+    country_id, city_id = destination
+
+    hotel_rows, available_rooms, has_more, page_facets = _query_hotel_rows(
+        db, search_in, country_id, city_id, limit, after, facets
+    )
+    page = SearchPage(
+        results=_build_results(db, hotel_rows, available_rooms),
+        next_cursor=_encode_cursor(hotel_rows[-1], search_in.sort_by) if has_more else None,
+        facets=page_facets,
+    )
+
+    if cache_key is not None:
+        scope = SearchScope(
+            country_id, city_id, search_in.check_in, search_in.check_out,
+            hotel_ids={result.id for result in page.results},
+            complete=limit is None and cursor is None,
+        )
+        search_cache.put(cache_key, page, scope, generation, from_replica=is_replica_session(db))
+    return page
+
+
+def stream_hotel_search(
+    session_factory: Callable[[], Session],
+    search_in: HotelSearchRequest,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    facets: bool = False,
+) -> Iterator[str]:
+    """
+    NDJSON variant of search_hotels_page: one HotelSearchResult per line. The hotels
+    are read in keyset chunks of STREAM_BATCH_SIZE, then twice as many each time, and
+    each chunk is emitted before the next is queried, so the first results go out
+    before the whole set is read; the doubling keeps the number of aggregate queries
+    logarithmic in the result size. When a limit cuts the set short, a final
+    {"next_cursor": "..."} line is emitted. With `facets`, the first page ends
+    with a {"facets": {...}} line. Does not use the result cache.
+
+    The cursor is validated immediately; the returned generator opens its own session
+    from `session_factory`, since it outlives the request's dependencies.
+    """
+    after = _decode_cursor(cursor, search_in.sort_by) if cursor else None
 
-    country_id = country.id
-    city_id = None
-    if city_name:
-        city = crud_city.get_city_by_name_and_country(db, city_name, country_id)
-        if city:
-            city_id = city.id
+    def generate() -> Iterator[str]:
+        db = session_factory()
+        try:
+            destination = destination_resolver.resolve(db, search_in.destination)
+            if destination is None:
+                if facets and after is None:
+                    yield json.dumps({"facets": _empty_facets().model_dump()}) + "\n"
+                return
+            country_id, city_id = destination
 
+            position, remaining, chunk_size = after, limit, STREAM_BATCH_SIZE
+            page_facets, last_row, has_more = None, None, False
+            while True:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                # Facets are only computed by the first chunk of a first page (position is None)
+                hotel_rows, available_rooms, has_more, chunk_facets = _query_hotel_rows(
+                    db, search_in, country_id, city_id, size, position, facets
+                )
+                if chunk_facets is not None:
+                    page_facets = chunk_facets
+                for result in _build_results(db, hotel_rows, available_rooms):
+                    yield result.model_dump_json() + "\n"
+
+                if hotel_rows:
+                    last_row = hotel_rows[-1]
+                    position = _sort_keys(last_row)
+                if remaining is not None:
+                    remaining -= len(hotel_rows)
+                if not has_more or remaining == 0:
+                    break
+                chunk_size *= 2
+
+            if page_facets is not None:
+                yield json.dumps({"facets": page_facets.model_dump()}) + "\n"
+
+            if has_more:
+                yield json.dumps({"next_cursor": _encode_cursor(last_row, search_in.sort_by)}) + "\n"
+        finally:
+            db.close()
+
+    return generate()
+
+
+def _query_hotel_rows(
+    db: Session,
+    search_in: HotelSearchRequest,
+    country_id: int,
+    city_id: Optional[int],
+    limit: Optional[int],
+    after: Optional[list],
+    facets: bool = False,
+):
+    """
+    Run the sorted (and optionally limited) aggregate hotel query.
+    Returns (hotel_rows, available_rooms subquery, has_more, facets).
+
+    Facets are only computed for the first page: window aggregates run after the
+    keyset filter, so on later pages they would only describe the remaining rows.
+    """
+    with_facets = facets and after is None
+    hotel_query, available_rooms, facet_keys = _available_hotels_query(
+        db, search_in, country_id, city_id, with_facets
+    )
+    if hotel_query is None:
+        return [], None, False, _empty_facets() if with_facets else None
+
+    hotel_query = _apply_sort(hotel_query, _sort_columns(hotel_query, search_in.sort_by), after)
+    if limit is None:
+        hotel_rows, has_more = hotel_query.all(), False
+    else:
+        hotel_rows = hotel_query.limit(limit + 1).all()
+        hotel_rows, has_more = hotel_rows[:limit], len(hotel_rows) > limit
+
+    page_facets = None
+    if with_facets:
+        page_facets = _read_facets(facet_keys, hotel_rows[0]) if hotel_rows else _empty_facets()
+    return hotel_rows, available_rooms, has_more, page_facets
+
+
+def _available_hotels_query(
+    db: Session, search_in: HotelSearchRequest, country_id: int, city_id: Optional[int], with_facets: bool = False
+):
+    """
+    Build the aggregate hotel query over the available-room set.
+    Returns (hotel_query, available_rooms subquery, facet keys), or (None, None, [])
+    when no room is free. With `with_facets`, each row also carries the facet counts
+    of the whole set as `facet_<i>` window columns.
+    """
     guests_per_room = ceil(search_in.adults / search_in.rooms)
-    hotels = search_hotels(db, country_id=country_id, city_id=city_id)
-    results: List[HotelSearchResult] = []
-
-    for hotel in hotels:
-        if search_in.min_stars and hotel.stars and hotel.stars < search_in.min_stars:
-            continue
-
-        rooms = get_rooms_by_hotel_and_guests(db, hotel.id, guests_per_room)
-        available_rooms = [
-            room for room in rooms if is_room_available_for_range(
-                db, room.id, search_in.check_in, search_in.check_out
-            )
+
+    # 1. Rooms in the destination that fit the party and the requested room type / amenities
+    candidate_rooms = (
+        db.query(
+            Room.id.label("room_id"),
+            Room.hotel_id.label("hotel_id"),
+            Room.price_per_night.label("price"),
+            Room.amenity_mask.label("amenity_mask"),
+        )
+        .join(Hotel, Room.hotel_id == Hotel.id)
+        .join(City, Hotel.city_id == City.id)
+        .filter(
+            City.country_id == country_id,
+            Room.capacity >= guests_per_room,
+        )
+    )
+    if city_id is not None:
+        candidate_rooms = candidate_rooms.filter(Hotel.city_id == city_id)
+    if search_in.min_stars:
+        candidate_rooms = candidate_rooms.filter(
+            or_(Hotel.stars.is_(None), Hotel.stars >= search_in.min_stars)
+        )
+    if search_in.room_type:
+        candidate_rooms = candidate_rooms.filter(Room.room_type == search_in.room_type.value)
+    amenities = amenity_filter_clause(
+        has_wifi=search_in.has_wifi,
+        allows_pets=search_in.allows_pets,
+        has_kitchen=search_in.has_kitchen,
+        has_air_conditioning=search_in.has_air_conditioning,
+        has_tv=search_in.has_tv,
+        has_safe=search_in.has_safe,
+        has_balcony=search_in.has_balcony,
+    )
+    if amenities is not None:
+        candidate_rooms = candidate_rooms.filter(amenities)
+
+    # ...that have no blocked night: answered by the in-memory index when it covers
+    # the stay and its answer is short enough to bind, otherwise by a NOT EXISTS anti-join
+    available_rooms = _filter_available(db, candidate_rooms, search_in.check_in, search_in.check_out)
+    if available_rooms is None:
+        return None, None, []
+    available_rooms = available_rooms.subquery()
+
+    # 2. Per-hotel room count / lowest price, keeping only hotels with enough free rooms
+    # (plus, for facets, which amenities at least one free room offers)
+    amenity_columns = []
+    if with_facets:
+        amenity_columns = [
+            func.max(available_rooms.c.amenity_mask.op("&")(bit)).label(f"amenity_{name}")
+            for name, bit in AMENITY_BITS.items()
         ]
+    room_stats = (
+        db.query(
+            available_rooms.c.hotel_id,
+            func.min(available_rooms.c.price).label("lowest_price"),
+            *amenity_columns,
+        )
+        .group_by(available_rooms.c.hotel_id)
+        .having(func.count(available_rooms.c.room_id) >= search_in.rooms)
+        .subquery()
+    )
 
-        if len(available_rooms) >= search_in.rooms:
-            city_name_safe = getattr(hotel.city, "name", None)
-            country_name_safe = None
+    hotel_query = (
+        db.query(
+            Hotel.id,
+            Hotel.name,
+            Hotel.address,
+            Hotel.stars,
+            City.name.label("city_name"),
+            Country.name.label("country_name"),
+            room_stats.c.lowest_price,
+            # 3. Review aggregates come from the maintained hotel_rating_stats row
+            func.coalesce(HotelRatingStats.review_count, 0).label("review_count"),
+            (
+                cast(HotelRatingStats.rating_sum, Float) / func.nullif(HotelRatingStats.review_count, 0)
+            ).label("average_rating"),
+        )
+        .join(room_stats, room_stats.c.hotel_id == Hotel.id)
+        .join(City, Hotel.city_id == City.id)
+        .join(Country, City.country_id == Country.id)
+        .outerjoin(HotelRatingStats, HotelRatingStats.hotel_id == Hotel.id)
+    )
 
-            country_id_from_city = getattr(hotel.city, "country_id", None)
-            if country_id_from_city:
-                country_obj = crud_country.get_country_by_id(db, country_id_from_city)
-                if country_obj:
-                    country_name_safe = getattr(country_obj, "name", None)
+    facet_keys = []
+    if with_facets:
+        facet_keys, facet_columns = zip(*_facet_columns(room_stats))
+        hotel_query = hotel_query.add_columns(
+            *[column.over().label(f"facet_{i}") for i, column in enumerate(facet_columns)]
+        )
+    return hotel_query, available_rooms, list(facet_keys)
 
-            cover_image_url = None
-            if hotel.photos:
-                cover_photo = next(
-                    (p for p in hotel.photos if str(p.is_cover).lower() == "true"), None
-                )
-                cover_image_url = cover_photo.image_url if cover_photo else hotel.photos[0].image_url
-
-            # Review stats using explicit join
-            all_reviews = (
-                db.query(Review)
-                .join(Booking, Review.booking_id == Booking.id)
-                .join(Room, Booking.room_id == Room.id)
-                .filter(Room.hotel_id == hotel.id)
-                .all()
-            )
-
-            review_count = len(all_reviews)
-            avg_rating = round(sum(r.rating for r in all_reviews) / review_count, 2) if review_count > 0 else None
-
-            results.append(HotelSearchResult(
-                id=hotel.id,
-                name=hotel.name,
-                address=hotel.address,
-                city=city_name_safe,
-                country=country_name_safe,
-                stars=hotel.stars,
-                lowest_price=min((r.price_per_night for r in available_rooms), default=None),
-                cover_image_url=cover_image_url,
-                available_room_ids=[r.id for r in available_rooms],
-                average_rating=avg_rating,
-                review_count=review_count
-            ))
-
-    # Apply sorting
-    if search_in.sort_by:
-        if search_in.sort_by == "price_asc":
-            results.sort(key=lambda h: h.lowest_price or float('inf'))
-        elif search_in.sort_by == "price_desc":
-            results.sort(key=lambda h: h.lowest_price or 0, reverse=True)
-        elif search_in.sort_by == "reviews":
-            results.sort(key=lambda h: h.review_count, reverse=True)
-        elif search_in.sort_by == "rating":
-            results.sort(key=lambda h: h.average_rating or 0, reverse=True)
-
-    return results
+
+def _facet_columns(room_stats) -> List[Tuple[Tuple[str, object], object]]:
+    """
+    ((facet, bucket), aggregate) pairs; each aggregate counts matching hotel rows.
+    """
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    lowest_price = room_stats.c.lowest_price
+    columns = [(("total", None), func.count())]
+    columns += [(("stars", stars), count_if(Hotel.stars == stars)) for stars in STAR_LEVELS]
+    for i, low in enumerate(PRICE_BUCKET_BOUNDS):
+        high = PRICE_BUCKET_BOUNDS[i + 1] if i + 1 < len(PRICE_BUCKET_BOUNDS) else None
+        condition = lowest_price >= low if high is None else and_(lowest_price >= low, lowest_price < high)
+        columns.append((("price", (low, high)), count_if(condition)))
+    columns += [
+        (("amenity", name), count_if(room_stats.c[f"amenity_{name}"] > 0)) for name in AMENITY_BITS
+    ]
+    # Average >= threshold, compared on integers: rating_sum >= threshold * review_count
+    columns += [
+        (
+            ("rating", threshold),
+            count_if(and_(
+                HotelRatingStats.review_count > 0,
+                HotelRatingStats.rating_sum * 2 >= HotelRatingStats.review_count * int(threshold * 2),
+            )),
+        )
+        for threshold in RATING_THRESHOLDS
+    ]
+    return columns
+
+
+def _read_facets(facet_keys: List[Tuple[str, object]], row) -> SearchFacets:
+    facets = _empty_facets()
+    for i, (facet, bucket) in enumerate(facet_keys):
+        count = int(getattr(row, f"facet_{i}") or 0)
+        if facet == "total":
+            facets.total = count
+        elif facet == "stars":
+            facets.stars[bucket] = count
+        elif facet == "price":
+            next(b for b in facets.price_buckets if b.min_price == bucket[0]).count = count
+        elif facet == "amenity":
+            facets.amenities[bucket] = count
+        elif facet == "rating":
+            facets.rating[f"{bucket:g}+"] = count
+    return facets
+
+
+def _empty_facets() -> SearchFacets:
+    bounds = list(PRICE_BUCKET_BOUNDS) + [None]
+    return SearchFacets(
+        total=0,
+        stars={stars: 0 for stars in STAR_LEVELS},
+        price_buckets=[
+            PriceBucketFacet(min_price=low, max_price=high, count=0) for low, high in zip(bounds, bounds[1:])
+        ],
+        amenities={name: 0 for name in AMENITY_BITS},
+        rating={f"{threshold:g}+": 0 for threshold in RATING_THRESHOLDS},
+    )
+
+
+def _sort_columns(hotel_query, sort_by: Optional[str]) -> List[Tuple[object, bool]]:
+    """
+    (expression, descending) pairs for the requested sort. Name and id are appended
+    as tie-breakers so the order is total and can serve as a keyset.
+    """
+    columns = {column["name"]: column["expr"] for column in hotel_query.column_descriptions}
+
+    primary = []
+    if sort_by == "price_asc":
+        primary = [(columns["lowest_price"], False)]
+    elif sort_by == "price_desc":
+        primary = [(columns["lowest_price"], True)]
+    elif sort_by == "reviews":
+        primary = [(columns["review_count"], True)]
+    elif sort_by == "rating":
+        # Clients see the rating rounded to 2 decimals; sort on that value, scaled to an integer
+        primary = [(func.coalesce(func.round(columns["average_rating"] * 100), 0), True)]
+
+    return primary + [(Hotel.name, False), (Hotel.id, False)]
+
+
+def _apply_sort(hotel_query, sort_columns: List[Tuple[object, bool]], after: Optional[list]):
+    keys = [column.label(f"sort_key_{i}") for i, (column, _) in enumerate(sort_columns)]
+    hotel_query = hotel_query.add_columns(*keys).order_by(
+        *[column.desc() if descending else column.asc() for column, descending in sort_columns]
+    )
+
+    if after is not None:
+        if len(after) != len(sort_columns):
+            raise InvalidCursorError("Cursor does not match the requested sort order")
+        # Rows strictly after the cursor in the (mixed-direction) sort order
+        clauses = []
+        for i, (column, descending) in enumerate(sort_columns):
+            same_prefix = [prev == value for (prev, _), value in zip(sort_columns[:i], after[:i])]
+            step = column < after[i] if descending else column > after[i]
+            clauses.append(and_(*same_prefix, step))
+        hotel_query = hotel_query.filter(or_(*clauses))
+
+    return hotel_query
+
+
+def _sort_keys(row) -> list:
+    """
+    Keyset position of a hotel row: its sort_key_<i> columns, as _decode_cursor() returns them.
+    """
+    keys = []
+    for name in row._fields:
+        if name.startswith("sort_key_"):
+            value = getattr(row, name)
+            keys.append(float(value) if isinstance(value, Decimal) else value)
+    return keys
+
+
+def _encode_cursor(row, sort_by: Optional[str]) -> str:
+    payload = json.dumps({"s": sort_by, "k": _sort_keys(row)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: Optional[str]) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        keys = payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursorError("Malformed cursor")
+    if payload.get("s") != sort_by or not isinstance(keys, list):
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return keys
+
+
+def _build_results(db: Session, hotel_rows, available_rooms) -> List[HotelSearchResult]:
+    if not hotel_rows:
+        return []
+
+    hotel_ids = [row.id for row in hotel_rows]
+    room_ids_by_hotel = _get_available_room_ids(db, available_rooms, hotel_ids)
+    cover_by_hotel = _get_cover_image_urls(db, hotel_ids)
+
+    return [
+        HotelSearchResult(
+            id=row.id,
+            name=row.name,
+            address=row.address,
+            city=row.city_name,
+            country=row.country_name,
+            stars=row.stars,
+            lowest_price=row.lowest_price,
+            cover_image_url=cover_by_hotel.get(row.id),
+            available_room_ids=room_ids_by_hotel.get(row.id, []),
+            average_rating=round(float(row.average_rating), 2) if row.average_rating is not None else None,
+            review_count=row.review_count
+        )
+        for row in hotel_rows
+    ]
+
+
+def _filter_available(db: Session, candidate_rooms, check_in, check_out):
+    """
+    Restrict the candidate room query to rooms free for the whole stay.
+    Returns None when the index proves that no candidate is free.
+    The index's answer is sent back as the shorter of the free and the blocked id
+    lists, and only while that fits in INDEX_MAX_BOUND_IDS parameters: wide searches
+    with many free and many blocked rooms are filtered by the anti-join instead.
+    """
+    if settings.AVAILABILITY_INDEX_ENABLED:
+        availability_index.ensure_current(db)
+        if availability_index.covers(check_in, check_out):
+            room_ids = [row.room_id for row in candidate_rooms.all()]
+            free_room_ids = availability_index.available_room_ids(room_ids, check_in, check_out)
+            if free_room_ids is not None:
+                if not free_room_ids:
+                    return None
+                blocked_room_ids = set(room_ids).difference(free_room_ids)
+                if not blocked_room_ids:
+                    return candidate_rooms
+                if len(free_room_ids) <= INDEX_MAX_BOUND_IDS:
+                    return candidate_rooms.filter(Room.id.in_(free_room_ids))
+                if len(blocked_room_ids) <= INDEX_MAX_BOUND_IDS:
+                    return candidate_rooms.filter(Room.id.notin_(sorted(blocked_room_ids)))
+
+    return candidate_rooms.filter(~room_blocked_clause(Room.id, check_in, check_out))
+
+
+def _get_available_room_ids(db: Session, available_rooms, hotel_ids: List[int]) -> Dict[int, List[int]]:
+    """
+    Available room ids per hotel, cheapest first.
+    """
+    rows = (
+        db.query(available_rooms.c.room_id, available_rooms.c.hotel_id)
+        .filter(available_rooms.c.hotel_id.in_(hotel_ids))
+        .order_by(available_rooms.c.price.asc(), available_rooms.c.room_id.asc())
+        .all()
+    )
+    room_ids: Dict[int, List[int]] = {}
+    for room_id, hotel_id in rows:
+        room_ids.setdefault(hotel_id, []).append(room_id)
+    return room_ids
+
+
+def _get_cover_image_urls(db: Session, hotel_ids: List[int]) -> Dict[int, Optional[str]]:
+    """
+    Cover photo URL per hotel. Falls back to the first photo when none is marked as cover.
+    """
+    photos = (
+        db.query(HotelPhoto.hotel_id, HotelPhoto.image_url, HotelPhoto.is_cover)
+        .filter(HotelPhoto.hotel_id.in_(hotel_ids))
+        .order_by(HotelPhoto.hotel_id.asc(), HotelPhoto.id.asc())
+        .all()
+    )
+    covers: Dict[int, Optional[str]] = {}
+    explicit = set()
+    for hotel_id, image_url, is_cover in photos:
+        if is_cover and hotel_id not in explicit:
+            covers[hotel_id] = image_url
+            explicit.add(hotel_id)
+        elif hotel_id not in covers:
+            covers[hotel_id] = image_url
+    return covers
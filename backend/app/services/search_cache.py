@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Hashable, Optional, Set
+
+from app.config.settings import settings
+from app.schemas.search import HotelSearchRequest
+from app.services.destination_resolver import normalize_name
+from app.services.ttl_cache import TtlLruCache
+
+
+@dataclass
+class SearchScope:
+    """
+    What a cached search depends on: its destination, its stay and the hotels it returned.
+    `complete` is False for a single page of a sorted result set, where a change in a
+    hotel outside the page can still move it into the page.
+    """
+    country_id: int
+    city_id: Optional[int]
+    check_in: date
+    check_out: date
+    hotel_ids: Set[int] = field(default_factory=set)
+    complete: bool = True
+
+    def overlaps(self, start: date, end: date) -> bool:
+        return start < self.check_out and end > self.check_in
+
+    def covers_location(self, country_id: Optional[int], city_id: Optional[int]) -> bool:
+        if country_id != self.country_id:
+            return False
+        return self.city_id is None or self.city_id == city_id
+
+
+def make_search_key(search_in: HotelSearchRequest) -> Hashable:
+    """
+    Normalized cache key: destination parts go through the resolver's normalize_name,
+    so "Zürich,Switzerland" and " zurich , SWITZERLAND" share an entry.
+    """
+    destination = ",".join(normalize_name(part) for part in search_in.destination.split(","))
+    fields = search_in.model_dump(exclude={"destination"})
+    return (destination,) + tuple(sorted((name, str(value)) for name, value in fields.items()))
+
+
+class SearchResultCache(TtlLruCache):
+    """
+    LRU + TTL cache of hotel search results, tagged with their SearchScope.
+
+    Entries are dropped as soon as a committed inventory change can alter them:
+    - nights blocked in hotel H drop entries that returned H for an overlapping stay
+      (or, for partial pages, any entry whose destination contains H);
+    - nights released in hotel H drop entries whose destination contains H for an
+      overlapping stay (H may now qualify even though it was not returned).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0, lag_seconds: float = 0.0):
+        super().__init__(max_entries, ttl_seconds, lag_seconds)
+
+    def put(self, key: Hashable, value: Any, scope: SearchScope, generation: int, from_replica: bool = False) -> None:
+        super().put(key, value, generation, tag=scope, from_replica=from_replica)
+
+    def invalidate_blocked(
+        self, hotel_id: Optional[int], city_id: Optional[int], country_id: Optional[int], start: date, end: date
+    ) -> None:
+        self.invalidate_where(
+            lambda key, scope: scope.overlaps(start, end)
+            and (
+                hotel_id in scope.hotel_ids
+                or (not scope.complete and scope.covers_location(country_id, city_id))
+            )
+        )
+
+    def invalidate_released(
+        self, hotel_id: Optional[int], city_id: Optional[int], country_id: Optional[int], start: date, end: date
+    ) -> None:
+        self.invalidate_where(
+            lambda key, scope: scope.overlaps(start, end)
+            and (hotel_id in scope.hotel_ids or scope.covers_location(country_id, city_id))
+        )
+
+
+search_cache = SearchResultCache(
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+    # Reads from replicas lag behind invalidations by up to the read-your-writes window
+    lag_seconds=settings.READ_YOUR_WRITES_SECONDS if settings.DATABASE_REPLICA_URLS else 0.0,
+)
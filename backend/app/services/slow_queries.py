@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import settings
+from app.services.percentiles import percentile
+from app.services.sql_instrumentation import normalize_statement
+
+logger = logging.getLogger("app.sql.slow")
+
+# Plan lines that mean a table is read in full: MySQL type=ALL, SQLite SCAN (even along an index), PostgreSQL Seq Scan
+_FULL_SCAN = {
+    "sqlite": re.compile(r"^SCAN (?!CONSTANT ROW)(?:TABLE )?(\w+)"),
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+}
+
+
+def fingerprint(shape: str) -> str:
+    return hashlib.sha1(shape.encode()).hexdigest()[:16]
+
+
+class SlowQueryLog:
+    """
+    Statements slower than SLOW_QUERY_THRESHOLD_MS, grouped by fingerprint (the hash
+    of the normalized statement). Keeps counters plus the most recent `window`
+    durations per fingerprint for percentiles, and the parameters of the slowest
+    run so the worst offenders can be EXPLAINed later.
+    """
+
+    def __init__(self, window: int = 512, max_fingerprints: int = 500):
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self.dropped = 0
+
+    def record(self, statement: str, parameters, seconds: float) -> None:
+        shape = normalize_statement(statement)
+        key = fingerprint(shape)
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    self.dropped += 1
+                    return
+                entry = self._entries[key] = {
+                    "statement": shape, "samples": deque(maxlen=self.window), "count": 0,
+                    "total": 0.0, "max": 0.0, "first_seen": now, "explain": None,
+                }
+            entry["samples"].append(seconds)
+            entry["count"] += 1
+            entry["total"] += seconds
+            entry["last_seen"] = now
+            if seconds >= entry["max"]:
+                # Keep the slowest run's SQL and parameters to EXPLAIN
+                entry["max"] = seconds
+                entry["example"] = (statement, parameters)
+
+    def worst(self, limit: int) -> List[str]:
+        """
+        Fingerprints with the most total time spent above the threshold.
+        """
+        with self._lock:
+            ranked = sorted(self._entries.items(), key=lambda item: -item[1]["total"])
+            return [key for key, _ in ranked[:limit]]
+
+    def explain_worst(self, engine: Engine, limit: Optional[int] = None) -> int:
+        """
+        EXPLAIN the slowest run of the `limit` worst fingerprints that have no plan yet.
+        Plans come from `engine` (the primary: replicas share its schema) and never
+        execute the statement. Returns the number of plans captured.
+        """
+        captured = 0
+        for key in self.worst(limit or settings.SLOW_QUERY_EXPLAIN_TOP):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or entry["explain"] is not None:
+                    continue
+                statement, parameters = entry["example"]
+            plan = explain(engine, statement, parameters)
+            with self._lock:
+                if key in self._entries:
+                    self._entries[key]["explain"] = plan
+            captured += 1
+        return captured
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.dropped = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            queries = []
+            for key, entry in sorted(self._entries.items(), key=lambda item: -item[1]["total"]):
+                ordered = sorted(entry["samples"])
+                queries.append({
+                    "fingerprint": key,
+                    "statement": entry["statement"],
+                    "count": entry["count"],
+                    "total_ms": round(entry["total"] * 1000, 3),
+                    "max_ms": round(entry["max"] * 1000, 3),
+                    "p50_ms": round(statistics.median(ordered) * 1000, 3),
+                    "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                    "first_seen": entry["first_seen"],
+                    "last_seen": entry["last_seen"],
+                    "explain": entry["explain"],
+                })
+            return {
+                "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+                "fingerprints": len(queries),
+                "dropped": self.dropped,
+                "queries": queries,
+            }
+
+    def dump(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, indent=2, default=str)
+
+
+slow_query_log = SlowQueryLog()
+
+
+def explain(engine: Engine, statement: str, parameters) -> dict:
+    """
+    Query plan of a statement, as rows of column -> value, plus the tables it reads in full.
+    """
+    dialect = engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    try:
+        with engine.connect() as conn:
+            result = conn.exec_driver_sql(prefix + statement, parameters or ())
+            columns = list(result.keys())
+            rows = [dict(zip(columns, (str(value) if value is not None else None for value in row))) for row in result]
+            conn.rollback()
+    except Exception as exc:
+        return {"error": str(exc).splitlines()[0]}
+
+    if dialect == "mysql":
+        full_scans = sorted({row.get("table") for row in rows if row.get("type") == "ALL" and row.get("table")})
+    else:
+        pattern = _FULL_SCAN.get(dialect)
+        lines = [row.get("detail") or row.get("QUERY PLAN") or "" for row in rows]
+        full_scans = sorted({match.group(1) for line in lines if pattern and (match := pattern.search(line))})
+    return {"plan": rows, "full_scans": full_scans}
+
+
+# Start times live on the execution context, as in app.services.sql_instrumentation
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if settings.SLOW_QUERY_ENABLED and context is not None:
+        context.slow_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "slow_query_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    if seconds * 1000 < settings.SLOW_QUERY_THRESHOLD_MS or statement.lstrip().upper().startswith("EXPLAIN"):
+        return
+    # executemany parameters cannot be replayed in one EXPLAIN
+    slow_query_log.record(statement, None if executemany else parameters, seconds)
+    logger.warning("slow query (%.1f ms): %s", seconds * 1000, normalize_statement(statement)[:300])
@@ -0,0 +1,155 @@
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config.settings import settings
+
+logger = logging.getLogger("app.sql")
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%s|:\w+|\$\d+))*\s*\)")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Shape of a SQL statement: literals and placeholders become ?, IN lists of any
+    length collapse to (?), whitespace is squeezed. Statements that differ only in
+    their parameters normalize to the same string.
+    """
+    shape = _STRING.sub("?", statement)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class RequestSqlStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def most_repeated(self) -> Optional[tuple]:
+        """
+        (shape, count) of the statement run most often in the request, or None.
+        """
+        top = self.shapes.most_common(1)
+        return top[0] if top else None
+
+
+# Set by the middleware for the duration of a request. Sync routes run in a threadpool
+# with a copy of the context, so they record into the same RequestSqlStats.
+_current: ContextVar[Optional[RequestSqlStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def start_request() -> RequestSqlStats:
+    stats = RequestSqlStats()
+    _current.set(stats)
+    return stats
+
+
+# The start time lives on the statement's execution context: after_cursor_execute does
+# not fire for a statement that fails, and a per-connection stack would then leak
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context.request_sql_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "request_sql_started", None)
+    if stats is None or started is None:
+        return
+    stats.db_seconds += time.perf_counter() - started
+    stats.statements += 1
+    stats.shapes[normalize_statement(statement)] += 1
+
+
+class EndpointSqlStats:
+    """
+    Statements per request aggregated by route, to spot the endpoints whose
+    statement count grows with the size of their result (N+1 queries).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, dict] = {}
+
+    def record(self, route: str, stats: RequestSqlStats, flagged: bool) -> None:
+        with self._lock:
+            entry = self._routes.setdefault(route, {
+                "requests": 0, "statements": 0, "max_statements": 0, "db_ms": 0.0, "flagged": 0,
+            })
+            entry["requests"] += 1
+            entry["statements"] += stats.statements
+            entry["max_statements"] = max(entry["max_statements"], stats.statements)
+            entry["db_ms"] += stats.db_seconds * 1000
+            entry["flagged"] += flagged
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                route: {
+                    "requests": entry["requests"],
+                    "avg_statements": round(entry["statements"] / entry["requests"], 2),
+                    "max_statements": entry["max_statements"],
+                    "avg_db_ms": round(entry["db_ms"] / entry["requests"], 3),
+                    "flagged_n_plus_one": entry["flagged"],
+                }
+                for route, entry in sorted(self._routes.items(), key=lambda item: -item[1]["max_statements"])
+            }
+
+
+endpoint_sql_stats = EndpointSqlStats()
+
+
+def finish_request(method: str, route: str, status_code: int, stats: RequestSqlStats, total_seconds: float) -> str:
+    """
+    Log one structured line for the request, add it to endpoint_sql_stats and
+    return the Server-Timing header value.
+
+    A request is flagged as a likely N+1 when one statement shape ran at least
+    SQL_N_PLUS_ONE_THRESHOLD times: that count grows with the number of rows returned.
+    """
+    repeated = stats.most_repeated()
+    flagged = repeated is not None and repeated[1] >= settings.SQL_N_PLUS_ONE_THRESHOLD
+    endpoint_sql_stats.record(f"{method} {route}", stats, flagged)
+
+    db_ms = stats.db_seconds * 1000
+    total_ms = total_seconds * 1000
+    line = {
+        "method": method,
+        "route": route,
+        "status": status_code,
+        "duration_ms": round(total_ms, 3),
+        "db_ms": round(db_ms, 3),
+        "statements": stats.statements,
+        "n_plus_one": flagged,
+    }
+    if flagged:
+        line["repeated_statement"] = repeated[0][:300]
+        line["repeated_count"] = repeated[1]
+        logger.warning(json.dumps(line))
+    else:
+        logger.info(json.dumps(line))
+
+    timing = f'db;dur={db_ms:.1f};desc="{stats.statements} statements", app;dur={total_ms:.1f}'
+    if flagged:
+        timing += f', n-plus-one;desc="{repeated[1]}x same statement"'
+    return timing
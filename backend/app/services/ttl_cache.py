@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    tag: Any
+    expires_at: float
+
+
+class TtlLruCache:
+    """
+    Thread-safe LRU + TTL cache. Cached values are shared between callers and
+    must be treated as read-only.
+
+    Each entry can carry a tag describing what it depends on, for invalidate_where().
+    Readers take a generation() token before computing a value and pass it to put():
+    a value computed while an invalidation ran is not stored, since it may predate it.
+    A value read from a replica is not stored either if an invalidation matching it ran
+    in the last `lag_seconds`: the replica may not have the change that caused it yet.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, lag_seconds: float = 0.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.lag_seconds = lag_seconds
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # (monotonic time, predicate(key, tag)) of the invalidations of the last lag_seconds
+        self._recent: "deque[Tuple[float, Callable[[Hashable, Any], bool]]]" = deque()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.replica_skips = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def generation(self) -> int:
+        return self._generation
+
+    def put(self, key: Hashable, value: Any, generation: int, tag: Any = None, from_replica: bool = False) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            if from_replica and self._invalidated_recently(key, tag):
+                self.replica_skips += 1
+                return
+            self._entries[key] = _CacheEntry(value, tag, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_keys(self, keys: Iterable[Hashable]) -> None:
+        keys = frozenset(keys)
+        with self._lock:
+            self._generation += 1
+            self._remember(lambda key, tag: key in keys)
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        """
+        Drop every entry for which predicate(key, tag) is true.
+        """
+        with self._lock:
+            self._generation += 1
+            self._remember(predicate)
+            stale = [key for key, entry in self._entries.items() if predicate(key, entry.tag)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._remember(lambda key, tag: True)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "replica_skips": self.replica_skips,
+            }
+
+    def _remember(self, predicate: Callable[[Hashable, Any], bool]) -> None:
+        # Called with self._lock held
+        if self.lag_seconds > 0:
+            self._recent.append((time.monotonic(), predicate))
+            self._forget_old()
+
+    def _invalidated_recently(self, key: Hashable, tag: Any) -> bool:
+        # Called with self._lock held
+        self._forget_old()
+        return any(predicate(key, tag) for _, predicate in self._recent)
+
+    def _forget_old(self) -> None:
+        cutoff = time.monotonic() - self.lag_seconds
+        while self._recent and self._recent[0][0] <= cutoff:
+            self._recent.popleft()
@@ -0,0 +1,17 @@
+from sqlalchemy.orm import Session
+from app.config.database import SessionLocal
+from app.crud.hotel_rating_stats import rebuild_hotel_rating_stats
+
+# Recompute hotel_rating_stats from the reviews table.
+# Run once after importing reviews outside the API (e.g. populate_reviews.py).
+
+if __name__ == "__main__":
+    db: Session = SessionLocal()
+    try:
+        hotels = rebuild_hotel_rating_stats(db)
+        print(f"✅ Rating stats rebuilt for {hotels} hotels.")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed to rebuild rating stats: {e}")
+    finally:
+        db.close()
@@ -0,0 +1,171 @@
+"""
+Compare the set-based hotel search against the previous per-hotel loop.
+
+Runs both implementations against the configured database (DATABASE_URL) and
+reports SQL statement count and latency per search. Results are also checked
+for equality so the benchmark doubles as a regression check.
+
+Usage:
+    python -m scripts.benchmark_search --destination "France" --nights 3 --rooms 1 --adults 2
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from math import ceil
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config.database import SessionLocal, engine
+from app.models.review import Review
+from app.models.room import Room
+from app.models.booking import Booking
+from app.schemas.search import HotelSearchRequest, HotelSearchResult
+from app.crud.hotel import search_hotels
+from app.crud.room import get_rooms_by_hotel_and_guests
+from app.crud import country as crud_country
+from app.crud import city as crud_city
+from app.crud.room_availability import is_room_available_for_range
+from app.services.search import perform_hotel_search
+
+
+def legacy_hotel_search(db: Session, search_in: HotelSearchRequest) -> List[HotelSearchResult]:
+    """
+    The original per-hotel / per-room loop, kept here as the benchmark baseline.
+    """
+    city_name = None
+    country_name = search_in.destination.strip()
+
+    if "," in country_name:
+        parts = [p.strip() for p in country_name.split(",")]
+        if len(parts) >= 2:
+            city_name = parts[0]
+            country_name = parts[1]
+
+    country = crud_country.get_country_by_name(db, country_name)
+    if not country:
+        return []
+
+    country_id = country.id
+    city_id = None
+    if city_name:
+        city = crud_city.get_city_by_name_and_country(db, city_name, country_id)
+        if city:
+            city_id = city.id
+
+    guests_per_room = ceil(search_in.adults / search_in.rooms)
+    hotels = search_hotels(db, country_id=country_id, city_id=city_id)
+    results: List[HotelSearchResult] = []
+
+    for hotel in hotels:
+        if search_in.min_stars and hotel.stars and hotel.stars < search_in.min_stars:
+            continue
+
+        rooms = get_rooms_by_hotel_and_guests(db, hotel.id, guests_per_room)
+        available_rooms = [
+            room for room in rooms if is_room_available_for_range(
+                db, room.id, search_in.check_in, search_in.check_out
+            )
+        ]
+
+        if len(available_rooms) >= search_in.rooms:
+            country_name_safe = None
+            country_id_from_city = getattr(hotel.city, "country_id", None)
+            if country_id_from_city:
+                country_obj = crud_country.get_country_by_id(db, country_id_from_city)
+                if country_obj:
+                    country_name_safe = getattr(country_obj, "name", None)
+
+            cover_image_url = None
+            if hotel.photos:
+                cover_photo = next((p for p in hotel.photos if p.is_cover), None)
+                cover_image_url = cover_photo.image_url if cover_photo else hotel.photos[0].image_url
+
+            all_reviews = (
+                db.query(Review)
+                .join(Booking, Review.booking_id == Booking.id)
+                .join(Room, Booking.room_id == Room.id)
+                .filter(Room.hotel_id == hotel.id)
+                .all()
+            )
+            review_count = len(all_reviews)
+            avg_rating = round(sum(r.rating for r in all_reviews) / review_count, 2) if review_count > 0 else None
+
+            results.append(HotelSearchResult(
+                id=hotel.id,
+                name=hotel.name,
+                address=hotel.address,
+                city=getattr(hotel.city, "name", None),
+                country=country_name_safe,
+                stars=hotel.stars,
+                lowest_price=min((r.price_per_night for r in available_rooms), default=None),
+                cover_image_url=cover_image_url,
+                available_room_ids=[r.id for r in available_rooms],
+                average_rating=avg_rating,
+                review_count=review_count
+            ))
+
+    return results
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def run_case(label: str, search_fn, search_in: HotelSearchRequest, iterations: int):
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    timings = []
+    results = None
+    try:
+        for _ in range(iterations):
+            db = SessionLocal()
+            counter.count = 0
+            start = time.perf_counter()
+            results = search_fn(db, search_in)
+            timings.append((time.perf_counter() - start) * 1000)
+            db.close()
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+    print(
+        f"{label:<12} hotels={len(results):<5} statements={counter.count:<6} "
+        f"median={statistics.median(timings):.1f}ms min={min(timings):.1f}ms max={max(timings):.1f}ms"
+    )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hotel availability search")
+    parser.add_argument("--destination", default="France")
+    parser.add_argument("--days-ahead", type=int, default=14)
+    parser.add_argument("--nights", type=int, default=3)
+    parser.add_argument("--rooms", type=int, default=1)
+    parser.add_argument("--adults", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    engine.echo = False
+    check_in = date.today() + timedelta(days=args.days_ahead)
+    request = HotelSearchRequest(
+        destination=args.destination,
+        check_in=check_in,
+        check_out=check_in + timedelta(days=args.nights),
+        rooms=args.rooms,
+        adults=args.adults,
+    )
+
+    legacy = run_case("legacy loop", legacy_hotel_search, request, args.iterations)
+    current = run_case("set-based", perform_hotel_search, request, args.iterations)
+
+    key = lambda h: h.id
+    if sorted(legacy, key=key) == sorted(current, key=key):
+        print("✅ Both implementations returned identical results.")
+    else:
+        print("❌ Results differ between implementations!")
@@ -0,0 +1,231 @@
+"""
+Benchmark suite for the API hot paths.
+
+Runs each case against a database built by scripts.benchmark_data and reports
+latency percentiles and SQL statements per call. Inputs are drawn from a seeded
+RNG, so two runs on the same dataset see the same calls. Save a run with --json
+and pass it as --baseline to a later run to see the change per case.
+
+Cases: search_country, search_city, create_booking, user_bookings_ui,
+hotel_reviews, location_autocomplete.
+
+Usage:
+    python -m scripts.benchmark_data --database-url sqlite:///./benchmark.db
+    python -m scripts.benchmark_suite --database-url sqlite:///./benchmark.db --json before.json
+    python -m scripts.benchmark_suite --database-url sqlite:///./benchmark.db --baseline before.json
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config.settings import settings
+from app.models import City, Country, Hotel, Room, User
+from app.schemas.booking import BookingCreate
+from app.schemas.search import HotelSearchRequest
+from app.crud.booking import cancel_booking, create_booking, get_user_bookings_ui
+from app.crud.review import get_reviews_for_hotel
+from app.crud.location import search_locations
+from app.services.availability_index import availability_index
+from app.services.percentiles import percentile
+from app.services.search import perform_hotel_search
+
+
+@dataclass
+class CaseResult:
+    name: str
+    calls: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    statements_per_call: float
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+class BenchmarkContext:
+    """
+    Seeded input picker over the benchmark dataset.
+    """
+
+    def __init__(self, make_session: Callable[[], Session], seed: int):
+        self.rng = random.Random(seed)
+        db = make_session()
+        try:
+            self.max_user_id = db.query(func.max(User.id)).scalar()
+            self.max_hotel_id = db.query(func.max(Hotel.id)).scalar()
+            self.max_room_id = db.query(func.max(Room.id)).scalar()
+            self.country_names = [name for (name,) in db.query(Country.name).order_by(Country.id).all()]
+            self.city_destinations = [
+                f"{city}, {country}"
+                for city, country in db.query(City.name, Country.name).join(Country, City.country_id == Country.id)
+                .order_by(City.id).all()
+            ]
+        finally:
+            db.close()
+
+    def stay(self, max_days_ahead: int = 180):
+        check_in = date.today() + timedelta(days=self.rng.randint(1, max_days_ahead))
+        return check_in, check_in + timedelta(days=self.rng.randint(1, 5))
+
+    def search_request(self, destination: str) -> HotelSearchRequest:
+        check_in, check_out = self.stay()
+        return HotelSearchRequest(
+            destination=destination, check_in=check_in, check_out=check_out,
+            rooms=1, adults=self.rng.randint(1, 3),
+            sort_by=self.rng.choice([None, "price_asc", "price_desc", "reviews", "rating"]),
+        )
+
+
+def build_cases(ctx: BenchmarkContext) -> Dict[str, Callable[[Session], Optional[Callable[[Session], None]]]]:
+    """
+    name -> callable(db) running one call; it may return a cleanup callable(db)
+    that runs untimed afterwards (e.g. to undo a booking).
+    """
+    def search_country(db):
+        perform_hotel_search(db, ctx.search_request(ctx.rng.choice(ctx.country_names)))
+
+    def search_city(db):
+        perform_hotel_search(db, ctx.search_request(ctx.rng.choice(ctx.city_destinations)))
+
+    def booking(db):
+        check_in, check_out = ctx.stay(max_days_ahead=540)
+        booking_in = BookingCreate(
+            room_id=ctx.rng.randint(1, ctx.max_room_id), booking_date=date.today(),
+            check_in_date=check_in, check_out_date=check_out,
+        ).model_copy(update={"user_id": ctx.rng.randint(1, ctx.max_user_id)})
+        created = create_booking(db, booking_in)
+        if created is not None:
+            return lambda cleanup_db: cancel_booking(cleanup_db, created.id)
+
+    def user_bookings_ui(db):
+        get_user_bookings_ui(db, ctx.rng.randint(1, ctx.max_user_id))
+
+    def hotel_reviews(db):
+        get_reviews_for_hotel(db, ctx.rng.randint(1, ctx.max_hotel_id))
+
+    def location_autocomplete(db):
+        name = ctx.rng.choice(ctx.country_names + [d.split(",")[0] for d in ctx.city_destinations])
+        search_locations(db, name[:ctx.rng.randint(1, 3)])
+
+    return {
+        "search_country": search_country,
+        "search_city": search_city,
+        "create_booking": booking,
+        "user_bookings_ui": user_bookings_ui,
+        "hotel_reviews": hotel_reviews,
+        "location_autocomplete": location_autocomplete,
+    }
+
+
+def run_case(name: str, case, make_session, bench_engine, iterations: int, warmup: int) -> CaseResult:
+    counter = StatementCounter()
+    timings = []
+    statements = 0
+
+    for i in range(warmup + iterations):
+        db = make_session()
+        counter.count = 0
+        event.listen(bench_engine, "before_cursor_execute", counter)
+        try:
+            start = time.perf_counter()
+            cleanup = case(db)
+            elapsed = (time.perf_counter() - start) * 1000
+        finally:
+            event.remove(bench_engine, "before_cursor_execute", counter)
+        if i >= warmup:
+            timings.append(elapsed)
+            statements += counter.count
+        if cleanup is not None:
+            cleanup(db)
+        db.close()
+
+    timings.sort()
+    return CaseResult(
+        name=name,
+        calls=iterations,
+        p50_ms=round(statistics.median(timings), 3),
+        p90_ms=round(percentile(timings, 90), 3),
+        p99_ms=round(percentile(timings, 99), 3),
+        max_ms=round(timings[-1], 3),
+        statements_per_call=round(statements / iterations, 2),
+    )
+
+
+def print_report(results: List[CaseResult], baseline: Optional[Dict[str, dict]]) -> None:
+    print(f"{'case':<24}{'calls':>6}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'stmts':>8}  vs baseline")
+    for result in results:
+        line = (
+            f"{result.name:<24}{result.calls:>6}{result.p50_ms:>10.2f}{result.p90_ms:>10.2f}"
+            f"{result.p99_ms:>10.2f}{result.max_ms:>10.2f}{result.statements_per_call:>8.1f}"
+        )
+        before = (baseline or {}).get(result.name)
+        if before:
+            change = (result.p50_ms - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0.0
+            statements = result.statements_per_call - before["statements_per_call"]
+            flag = "⚠️" if change > 20 or statements > 0 else "  "
+            line += f"  {flag} p50 {change:+.0f}%, stmts {statements:+.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the API hot-path benchmark suite")
+    parser.add_argument("--database-url", default="sqlite:///./benchmark.db")
+    parser.add_argument("--cases", nargs="*", help="Subset of cases to run (default: all)")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--with-index", action="store_true", help="Load the in-memory availability index first")
+    parser.add_argument("--with-cache", action="store_true", help="Leave the search result cache enabled")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this file")
+    parser.add_argument("--baseline", help="Results file of a previous run to compare against")
+    args = parser.parse_args()
+
+    if args.database_url == settings.DATABASE_URL:
+        raise SystemExit("❌ Refusing to benchmark against the application database (bookings are created).")
+
+    bench_engine = create_engine(args.database_url)
+    make_session = sessionmaker(bind=bench_engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+    # Measure the queries themselves unless asked otherwise
+    settings.SEARCH_CACHE_ENABLED = args.with_cache
+    settings.AVAILABILITY_INDEX_ENABLED = args.with_index
+    if args.with_index:
+        db = make_session()
+        availability_index.load(db)
+        db.close()
+
+    ctx = BenchmarkContext(make_session, args.seed)
+    cases = build_cases(ctx)
+    selected = args.cases or list(cases)
+    unknown = set(selected) - set(cases)
+    if unknown:
+        raise SystemExit(f"❌ Unknown cases: {', '.join(sorted(unknown))}")
+
+    results = [run_case(name, cases[name], make_session, bench_engine, args.iterations, args.warmup) for name in selected]
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {result["name"]: result for result in json.load(f)["results"]}
+    print_report(results, baseline)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"database_url": bench_engine.url.render_as_string(hide_password=True),
+                       "results": [asdict(result) for result in results]}, f, indent=2)
+        print(f"💾 Results written to {args.json_path}")
@@ -0,0 +1,18 @@
+from sqlalchemy.orm import Session
+from app.config.database import SessionLocal
+from app.crud.room_availability import rebuild_blocks_from_nights
+
+# Rebuild room_blocks from the blocked nights in room_availability.
+# Run right before switching AVAILABILITY_STORAGE to "intervals"
+# (the migration converts the rows that existed when it ran).
+
+if __name__ == "__main__":
+    db: Session = SessionLocal()
+    try:
+        blocks = rebuild_blocks_from_nights(db)
+        print(f"✅ Wrote {blocks} room blocks.")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Failed to convert availability: {e}")
+    finally:
+        db.close()
@@ -6,6 +6,7 @@ import random
 from app.config.database import SessionLocal
 from app.models.booking import Booking
 from app.models.room_availability import RoomAvailability
+from app.models.room_block import RoomBlock
 from app.models.payment import Payment
 from app.models.cancellation import Cancellation
 from app.models.user import User
@@ -14,13 +15,14 @@ from app.models.hotel import Hotel
 from app.models.city import City
 from app.models.country import Country
 from app.schemas.booking import BookingStatusEnum
-from app.crud.room_availability import is_room_available_for_range
+from app.crud.room_availability import is_room_available_for_range, uses_interval_storage
 
 
 def reset_bookings(db: Session):
     db.query(Payment).delete()
     db.query(Cancellation).delete()
     db.query(RoomAvailability).delete()
+    db.query(RoomBlock).delete()
     db.query(Booking).delete()
     db.commit()
     print("🗑️ All existing bookings, payments, cancellations, and availability deleted.")
@@ -103,14 +105,17 @@ def populate_bookings(db: Session, min_completed=15, max_total=50):
                 created_completed += 1
 
             # Add room availability entries
-            delta = (check_out - check_in).days
-            for i in range(delta):
-                block_date = check_in + timedelta(days=i)
-                db.add(RoomAvailability(
-                    room_id=room_id,
-                    date=block_date,
-                    is_available=False
-                ))
+            if uses_interval_storage():
+                db.add(RoomBlock(room_id=room_id, start_date=check_in, end_date=check_out, booking_id=booking.id))
+            else:
+                delta = (check_out - check_in).days
+                for i in range(delta):
+                    block_date = check_in + timedelta(days=i)
+                    db.add(RoomAvailability(
+                        room_id=room_id,
+                        date=block_date,
+                        is_available=False
+                    ))
             db.commit()
 
         except IntegrityError:
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.config.database import SessionLocal
 from app.models.review import Review
 from app.models.booking import Booking
+from app.crud.hotel_rating_stats import rebuild_hotel_rating_stats
 
 # Sample review texts
 sample_texts = [
@@ -67,4 +68,5 @@ if __name__ == "__main__":
     db: Session = SessionLocal()
     reset_reviews(db)
     seed_reviews(db)
+    print(f"📊 Rating stats rebuilt for {rebuild_hotel_rating_stats(db)} hotels.")
     db.close()
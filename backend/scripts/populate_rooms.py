@@ -65,6 +65,7 @@ def create_rooms(db: Session):
                     CancellationPolicyEnum.non_refundable.value
                 ])
             )
+            room.refresh_amenity_mask()
             db.add(room)
             total_rooms += 1
 
@@ -0,0 +1,27 @@
+import os
+
+# Settings are read at import time; the tests bind their own engine, so these only have to parse
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config.database import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Session on a fresh SQLite database with the full schema.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
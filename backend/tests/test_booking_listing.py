@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.crud.booking import get_user_bookings_ui
+from app.models import Booking, City, Country, Hotel, HotelPhoto, Payment, Room, User
+
+
+def seed_bookings(db, count: int) -> int:
+    """
+    A user with `count` bookings, each in its own hotel with photos and a payment.
+    Returns the user id.
+    """
+    country = Country(name="Portugal")
+    city = City(name="Lisbon", country=country)
+    user = User(first_name="Ana", last_name="Silva", email="ana@example.com", password_hash="x")
+    db.add_all([country, city, user])
+    db.flush()
+
+    for i in range(count):
+        hotel = Hotel(name=f"Hotel {i}", address=f"Street {i}", city=city, owner_id=user.id)
+        room = Room(name="Double", room_type="Double", price_per_night=80.0, capacity=2, hotel=hotel)
+        db.add_all([
+            hotel, room,
+            HotelPhoto(hotel=hotel, image_url=f"/static/{i}-a.jpg", is_cover=False),
+            HotelPhoto(hotel=hotel, image_url=f"/static/{i}-b.jpg", is_cover=True),
+        ])
+        check_in = date(2030, 1, 1) + timedelta(days=3 * i)
+        booking = Booking(
+            user_id=user.id, room=room, booking_date=date(2029, 12, 1),
+            check_in_date=check_in, check_out_date=check_in + timedelta(days=2), status="confirmed"
+        )
+        db.add_all([booking, Payment(booking=booking, payment_date=date(2029, 12, 1), payment_method="Card", amount=160.0)])
+    db.commit()
+    return user.id
+
+
+def count_statements(db, fn):
+    statements = []
+    engine = db.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return result, len(statements)
+
+
+@pytest.mark.parametrize("count", [1, 25])
+def test_bookings_listing_runs_one_statement(db, count):
+    user_id = seed_bookings(db, count)
+    db.expunge_all()
+
+    bookings, statements = count_statements(db, lambda: get_user_bookings_ui(db, user_id))
+
+    assert len(bookings) == count
+    assert statements == 1
+    first = bookings[-1]
+    assert first.hotel_name == "Hotel 0"
+    assert first.city == "Lisbon" and first.country == "Portugal"
+    assert first.cover_image_url == "/static/0-b.jpg"
+    assert first.total_price == "$160.00"
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import sessionmaker
+
+import app.services.idempotency as idempotency
+from app.crud.booking import utc_now
+from app.models import Country, IdempotencyKey, User
+
+
+class CountryOut(BaseModel):
+    id: int
+    name: str
+
+
+class CountryIn(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def user_id(db, monkeypatch):
+    # Claims go through their own session, on the test database
+    monkeypatch.setattr(idempotency, "SessionLocal", sessionmaker(autoflush=False, expire_on_commit=False, bind=db.get_bind()))
+    user = User(first_name="Ines", last_name="Lopes", email="ines@example.com", password_hash="x")
+    db.add(user)
+    db.commit()
+    return user.id
+
+
+def run(db, user_id, handler, key="k1"):
+    return idempotency.run_idempotent(key, user_id, "POST /countries/", CountryIn(name="Chile"), db, handler, CountryOut, 201)
+
+
+def key_row(db):
+    db.expire_all()
+    return db.query(IdempotencyKey).one_or_none()
+
+
+def test_response_is_stored_with_the_request_and_replayed(db, user_id):
+    def handler():
+        country = Country(name="Chile")
+        db.add(country)
+        db.flush()
+        return country
+
+    first = run(db, user_id, handler)
+    replay = run(db, user_id, lambda: pytest.fail("handler ran twice"))
+
+    assert first.status_code == replay.status_code == 201
+    assert replay.body == first.body and replay.headers[idempotency.REPLAY_HEADER] == "true"
+    assert key_row(db).status_code == 201
+    assert db.query(Country).count() == 1
+
+
+def test_failed_request_writes_nothing_and_drops_the_claim(db, user_id):
+    def handler():
+        db.add(Country(name="Chile"))
+        db.flush()
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run(db, user_id, handler)
+
+    assert key_row(db) is None
+    assert db.query(Country).count() == 0
+
+
+def test_request_whose_claim_was_taken_over_rolls_back(db, user_id):
+    other = sessionmaker(bind=db.get_bind())()
+
+    def handler():
+        # A retry takes the key over while this request is still running
+        other.query(IdempotencyKey).update({IdempotencyKey.created_at: utc_now().replace(microsecond=0) + timedelta(seconds=1)})
+        other.commit()
+        country = Country(name="Chile")
+        db.add(country)
+        db.flush()
+        return country
+
+    with pytest.raises(HTTPException) as exc:
+        run(db, user_id, handler)
+    other.close()
+
+    assert exc.value.status_code == 409
+    assert db.query(Country).count() == 0
+    assert key_row(db).status_code is None  # Still owned by the retry
@@ -0,0 +1,98 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.config.settings import settings
+from app.crud.room_availability import (
+    get_unavailable_dates,
+    rebuild_blocks_from_nights,
+    release_room_nights,
+    release_stays_nights,
+)
+from app.models import Booking, City, Country, Hotel, Room, RoomAvailability, RoomBlock, User
+from app.services.inventory_events import PENDING_KEY
+
+FIRST_IN, FIRST_OUT, SECOND_OUT = date(2030, 3, 1), date(2030, 3, 4), date(2030, 3, 7)
+
+
+@pytest.fixture
+def intervals(monkeypatch):
+    monkeypatch.setattr(settings, "AVAILABILITY_STORAGE", "intervals")
+
+
+def seed_back_to_back(db):
+    """
+    A room with two back-to-back bookings whose nights are stored as room_availability rows.
+    Returns (room_id, first booking id, second booking id).
+    """
+    country = Country(name="Portugal")
+    city = City(name="Porto", country=country)
+    user = User(first_name="Rui", last_name="Costa", email="rui@example.com", password_hash="x")
+    db.add_all([country, city, user])
+    db.flush()
+    hotel = Hotel(name="Ribeira", address="Cais 1", city=city, owner_id=user.id)
+    room = Room(name="Double", room_type="Double", price_per_night=90.0, capacity=2, hotel=hotel)
+    first = Booking(user_id=user.id, room=room, booking_date=date(2030, 1, 1),
+                    check_in_date=FIRST_IN, check_out_date=FIRST_OUT, status="confirmed")
+    second = Booking(user_id=user.id, room=room, booking_date=date(2030, 1, 1),
+                     check_in_date=FIRST_OUT, check_out_date=SECOND_OUT, status="confirmed")
+    db.add_all([hotel, room, first, second])
+    db.flush()
+    day = FIRST_IN
+    while day < SECOND_OUT:
+        db.add(RoomAvailability(room_id=room.id, date=day, is_available=False))
+        day += timedelta(days=1)
+    db.commit()
+    return room.id, first.id, second.id
+
+
+def released(db):
+    return [(change.start, change.end) for change in db.info.get(PENDING_KEY, []) if change.kind == "released"]
+
+
+def test_rebuild_keeps_one_block_per_booking(db, intervals):
+    room_id, first_id, second_id = seed_back_to_back(db)
+
+    assert rebuild_blocks_from_nights(db) == 2
+    blocks = db.query(RoomBlock).order_by(RoomBlock.start_date).all()
+    assert [(b.start_date, b.end_date, b.booking_id) for b in blocks] == [
+        (FIRST_IN, FIRST_OUT, first_id),
+        (FIRST_OUT, SECOND_OUT, second_id),
+    ]
+
+
+def test_release_trims_a_block_shared_by_two_bookings(db, intervals):
+    room_id, _, _ = seed_back_to_back(db)
+    # A block merged across both bookings, as written by the earlier conversion
+    db.add(RoomBlock(room_id=room_id, start_date=FIRST_IN, end_date=SECOND_OUT))
+    db.commit()
+
+    release_room_nights(db, room_id, FIRST_IN, FIRST_OUT)
+    assert released(db) == [(FIRST_IN, FIRST_OUT)]
+    db.commit()
+
+    assert [night.date for night in get_unavailable_dates(db, room_id, FIRST_IN, SECOND_OUT)] == [
+        FIRST_OUT + timedelta(days=i) for i in range(3)
+    ]
+
+
+def test_release_splits_a_block_and_reports_only_freed_nights(db, intervals):
+    room_id, _, _ = seed_back_to_back(db)
+    db.add(RoomBlock(room_id=room_id, start_date=FIRST_IN + timedelta(days=1), end_date=FIRST_IN + timedelta(days=5)))
+    db.commit()
+
+    release_stays_nights(db, [(room_id, FIRST_IN, FIRST_OUT), (room_id, date(2030, 4, 1), date(2030, 4, 3))])
+    assert released(db) == [(FIRST_IN + timedelta(days=1), FIRST_OUT)]
+    db.commit()
+
+    blocks = db.query(RoomBlock).order_by(RoomBlock.start_date).all()
+    assert [(b.start_date, b.end_date) for b in blocks] == [(FIRST_OUT, FIRST_IN + timedelta(days=5))]
+
+
+def test_night_storage_reports_only_deleted_nights(db):
+    room_id, _, _ = seed_back_to_back(db)
+
+    release_room_nights(db, room_id, FIRST_OUT + timedelta(days=2), SECOND_OUT + timedelta(days=5))
+    assert released(db) == [(FIRST_OUT + timedelta(days=2), SECOND_OUT)]
+    db.commit()
+    assert db.query(RoomAvailability).count() == 5
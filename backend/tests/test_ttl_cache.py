@@ -0,0 +1,25 @@
+from app.services.ttl_cache import TtlLruCache
+
+
+def test_replica_read_after_a_matching_invalidation_is_not_stored():
+    cache = TtlLruCache(max_entries=10, ttl_seconds=60, lag_seconds=30)
+    cache.invalidate_where(lambda key, tag: tag == "hotel-1")
+
+    generation = cache.generation()
+    cache.put("a", "stale?", generation, tag="hotel-1", from_replica=True)
+    cache.put("b", "fresh", generation, tag="hotel-2", from_replica=True)
+    cache.put("c", "primary", generation, tag="hotel-1")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "fresh"
+    assert cache.get("c") == "primary"
+    assert cache.stats()["replica_skips"] == 1
+
+
+def test_replica_reads_are_stored_once_the_lag_window_has_passed():
+    cache = TtlLruCache(max_entries=10, ttl_seconds=60, lag_seconds=0)
+    cache.invalidate_keys(["a"])
+
+    cache.put("a", "value", cache.generation(), from_replica=True)
+
+    assert cache.get("a") == "value"